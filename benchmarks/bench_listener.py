@@ -0,0 +1,455 @@
+"""
+Replay and load benchmarks for the Solis TCP listener.
+
+Replays the frame corpus in ``benchmarks/corpus`` through ``SolisTCPProtocol``
+and ``SolisDataUpdateCoordinator`` (with a stubbed ``hass``), then opens many
+concurrent fake-logger connections against a real listener socket. The corpus
+is synthetic: frames built from the packet layouts, not captures from real
+loggers. Results are compared with ``baseline.json`` and the script exits
+non-zero on regression.
+
+Run it from an environment where Home Assistant is importable:
+
+    python benchmarks/bench_listener.py
+    python benchmarks/bench_listener.py --connections 500 --frames 20
+    python benchmarks/bench_listener.py --update-baseline
+
+Frames per second and latencies depend on the machine, so they are printed
+but not gated. The baseline holds counts (state writes per frame, bytes per
+connection) and costs in units of a fixed reference workload timed in the
+same run (``calibrate``), which carry over between machines far better.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import struct
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from custom_components.solis.const import (  # noqa: E402
+    CONF_COALESCE_WINDOW,
+    CONF_MAX_CONNECTIONS,
+    CONF_MAX_CONNECTIONS_PER_PEER,
+)
+from custom_components.solis import coordinator as coordinator_module  # noqa: E402
+from homeassistant.helpers import device_registry as dr  # noqa: E402
+from custom_components.solis.coordinator import (  # noqa: E402
+    SolisDataUpdateCoordinator,
+    SolisTCPProtocol,
+)
+from custom_components.solis.duplicates import DuplicateFilter  # noqa: E402
+from custom_components.solis.frame import LEGACY_END_BYTE, LEGACY_START_BYTE  # noqa: E402
+from custom_components.solis.layouts import GINLONG_103, FrameLayout  # noqa: E402
+from custom_components.solis.sensor import descriptions_for  # noqa: E402
+
+# the midnight rollover timer needs a real event bus; benchmarks never cross it
+coordinator_module.async_track_time_change = lambda *args, **kwargs: lambda: None
+
+CORPUS_DIR = HERE / "corpus"
+BASELINE_FILE = HERE / "baseline.json"
+
+
+# fixed pure-Python work (unpacking, slicing, dict building) that stands in
+# for the interpreter's speed on this machine
+_REFERENCE = struct.Struct(">HHhI")
+
+
+def calibrate(iterations: int = 20000, repeats: int = 5) -> float:
+    """Return reference operations per second, best of ``repeats`` runs."""
+    data = bytes(range(256)) * 2
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for i in range(iterations):
+            offset = i & 0xFF
+            a, b, c, d = _REFERENCE.unpack_from(data, offset)
+            record = {"a": a / 10, "b": b, "c": c, "d": d, "raw": data[offset : offset + 10]}
+            record.get("a")
+        best = min(best, time.perf_counter() - started)
+    return iterations / best
+
+
+def normalize(results: dict, reference: float) -> dict:
+    """Express time-based results in reference operations."""
+    return {
+        "replay_ref_ops_per_frame": reference / results["replay_frames_per_s"],
+        "decode_p50_ref_ops": results["decode_p50_us"] * reference / 1e6,
+        "decode_p95_ref_ops": results["decode_p95_us"] * reference / 1e6,
+        "decode_p99_ref_ops": results["decode_p99_us"] * reference / 1e6,
+        "load_ref_ops_per_frame": reference / results["load_frames_per_s"],
+    }
+
+
+# compared with the baseline; everything else is informational
+GATED_METRICS = (
+    "replay_ref_ops_per_frame",
+    "decode_p50_ref_ops",
+    "decode_p95_ref_ops",
+    "decode_p99_ref_ops",
+    "load_ref_ops_per_frame",
+    "state_writes_per_frame",
+    "bytes_per_connection",
+)
+
+
+def load_corpus(directory: Path = CORPUS_DIR) -> list[bytes]:
+    """Read every ``*.hex`` file: one frame per line, ``#`` starts a comment."""
+    frames = []
+    for path in sorted(directory.glob("*.hex")):
+        for line in path.read_text().splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                frames.append(bytes.fromhex(line))
+    return frames
+
+
+def build_frame(layout: FrameLayout, values: dict, control: int = 0x51B1) -> bytes:
+    """Encode ``values`` into a legacy frame using ``layout``."""
+    buf = bytearray(layout.size)
+    buf[0] = LEGACY_START_BYTE
+    buf[1] = layout.size - 14
+    struct.pack_into(">H", buf, 2, control)
+    for fld in layout.fields:
+        value = values[fld.name]
+        if fld.text:
+            value = value.encode("ascii").ljust(fld.size, b"\x00")
+        elif fld.divisor is not None:
+            value = int(round(value * fld.divisor))
+        struct.pack_into(">" + fld.code, buf, fld.offset, value)
+    buf[-2] = sum(buf[1:-2]) & 0xFF
+    buf[-1] = LEGACY_END_BYTE
+    return bytes(buf)
+
+
+def synthesize_corpus(serials: int = 4, frames_per_serial: int = 8, seed: int = 1) -> list[bytes]:
+    """Generate frames shaped like captured 103-byte samples.
+
+    The last few reports of every serial are identical standby frames, as
+    loggers send at night.
+    """
+    rnd = random.Random(seed)
+    frames = []
+    for n in range(serials):
+        energy = 10000.0 + n * 1000
+        values = {}
+        for i in range(frames_per_serial):
+            if i >= frames_per_serial - 3 and values:
+                # standby: the inverter repeats its last frame with no output
+                values.update(current_power_apo_t1_W=0.0)
+            else:
+                power = float(rnd.randint(200, 3500))
+                energy += power / 12000
+                values = {
+                    "serialno": f"110F{n:04d}22{n:06d}",
+                    "inv_t0": round(rnd.uniform(20, 45), 1),
+                    "dv1": round(rnd.uniform(250, 380), 1),
+                    "dv2": round(rnd.uniform(250, 380), 1),
+                    "av1": round(rnd.uniform(225, 245), 1),
+                    "a_fo1": round(rnd.uniform(49.9, 50.1), 2),
+                    "current_power_apo_t1_W": power,
+                    "et_ge0": round(energy, 1),
+                    "hr_ege_t1": 5000.0 + n * 100 + i,
+                    "inverter_status": 1,
+                }
+            frames.append(build_frame(GINLONG_103, values))
+    return frames
+
+
+class StubDeviceRegistry:
+    """Hands out device ids without a ``.storage`` backed registry."""
+
+    def __init__(self):
+        self.devices: dict[frozenset, SimpleNamespace] = {}
+
+    def async_get_or_create(self, *, identifiers, **kwargs):
+        key = frozenset(identifiers)
+        device = self.devices.get(key)
+        if device is None:
+            device = self.devices[key] = SimpleNamespace(id=f"device{len(self.devices)}", identifiers=identifiers)
+        return device
+
+
+class StubHass(SimpleNamespace):
+    """Just enough of ``HomeAssistant`` for the coordinator to run."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        super().__init__(loop=loop, data={dr.DATA_REGISTRY: StubDeviceRegistry()})
+
+    def async_create_task(self, target, *args, **kwargs):
+        return self.loop.create_task(target)
+
+    def async_create_background_task(self, target, *args, **kwargs):
+        return self.loop.create_task(target)
+
+    def async_add_executor_job(self, target, *args):
+        return self.loop.run_in_executor(None, target, *args)
+
+
+class NullTransport(asyncio.Transport):
+    """Transport that discards writes, for in-process replay."""
+
+    def __init__(self):
+        super().__init__()
+        self.written = 0
+        self.closed = False
+
+    def get_extra_info(self, name, default=None):
+        return ("127.0.0.1", 0) if name == "peername" else default
+
+    def write(self, data) -> None:
+        self.written += len(data)
+
+    def close(self) -> None:
+        self.closed = True
+
+    def abort(self) -> None:
+        self.closed = True
+
+    def is_closing(self) -> bool:
+        return self.closed
+
+    def pause_reading(self) -> None:
+        pass
+
+    def resume_reading(self) -> None:
+        pass
+
+
+class NullStore:
+    """Stands in for ``Store`` so benchmarks never touch ``.storage``."""
+
+    async def async_load(self):
+        return None
+
+    def async_delay_save(self, data_func, delay: float = 0) -> None:
+        pass
+
+    async def async_save(self, data) -> None:
+        pass
+
+
+def make_coordinator(hass: StubHass, options: dict | None = None) -> SolisDataUpdateCoordinator:
+    # samples are applied as they arrive, so each frame's full cost is
+    # measured and the counters below see it straight away
+    entry = SimpleNamespace(entry_id="bench", unique_id=None, options={CONF_COALESCE_WINDOW: 0, **(options or {})})
+    coordinator = SolisDataUpdateCoordinator(hass, entry, port=0)
+    coordinator._aggregate_store = NullStore()
+    coordinator._sample_store = NullStore()
+    # replays resend the corpus within seconds; keep the filter's cost but
+    # not its effect, so every pass is decoded
+    coordinator.duplicates = DuplicateFilter(window=0)
+    return coordinator
+
+
+def count_samples(coordinator: SolisDataUpdateCoordinator) -> list[int]:
+    """Wrap the coordinator's sample hook and return live counters.
+
+    ``counter[0]`` counts samples; ``counter[1]`` counts state writes of
+    stand-in entities subscribed the way the sensor platform subscribes.
+    """
+    counter = [0, 0]
+    handle = coordinator.async_handle_sample
+
+    def _entity():
+        def _write_state():
+            counter[1] += 1
+
+        return _write_state
+
+    def _counting(sample, *args):
+        serial = sample.get("serialno")
+        is_new = serial not in (coordinator.data or {})
+        result = handle(sample, *args)
+        # counted once handled: the listener logs and swallows errors, which
+        # would otherwise leave the benchmark timing nothing
+        counter[0] += 1
+        if is_new:
+            for description in descriptions_for(coordinator.data[serial]):
+                coordinator.async_add_key_listener(serial, description.data_keys, _entity())
+        return result
+
+    coordinator.async_handle_sample = _counting
+    return counter
+
+
+def percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def bench_replay(frames: list[bytes], rounds: int) -> dict:
+    hass = StubHass(asyncio.get_running_loop())
+    coordinator = make_coordinator(hass)
+    counter = count_samples(coordinator)
+    protocol = SolisTCPProtocol(coordinator)
+    protocol.connection_made(NullTransport())
+
+    clock = time.perf_counter_ns
+    latencies = []
+    started = clock()
+    for _ in range(rounds):
+        for frame in frames:
+            before = clock()
+            protocol.data_received(frame)
+            latencies.append(clock() - before)
+    elapsed = (clock() - started) / 1e9
+    decoded = counter[0]
+    if not decoded or not coordinator.data or not counter[1]:
+        raise SystemExit("no samples were stored or no entity was written; check the log for coordinator errors")
+    writes_per_frame = counter[1] / max(decoded, 1)
+
+    # the same stream cut at arbitrary points must decode to the same samples
+    counter[0] = 0
+    stream = b"".join(frames)
+    rnd = random.Random(0)
+    pos = 0
+    while pos < len(stream):
+        step = rnd.randint(1, 200)
+        protocol.data_received(stream[pos : pos + step])
+        pos += step
+    if counter[0] != decoded // rounds:
+        raise SystemExit(
+            f"reassembly mismatch: {counter[0]} samples from split stream, expected {decoded // rounds}"
+        )
+
+    latencies.sort()
+    return {
+        "replay_frames_per_s": len(latencies) / elapsed,
+        "decode_p50_us": percentile(latencies, 50) / 1000,
+        "decode_p95_us": percentile(latencies, 95) / 1000,
+        "decode_p99_us": percentile(latencies, 99) / 1000,
+        "state_writes_per_frame": writes_per_frame,
+    }
+
+
+async def bench_load(frames: list[bytes], connections: int, frames_per_connection: int) -> dict:
+    loop = asyncio.get_running_loop()
+    hass = StubHass(loop)
+    # every fake logger connects from 127.0.0.1
+    coordinator = make_coordinator(
+        hass,
+        {CONF_MAX_CONNECTIONS: connections, CONF_MAX_CONNECTIONS_PER_PEER: connections},
+    )
+    counter = count_samples(coordinator)
+    await coordinator.async_start()
+    port = coordinator.addresses[0][1]
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    # plain sockets keep client-side allocations out of the measurement
+    clients = []
+    for _ in range(connections):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        await loop.sock_connect(sock, ("127.0.0.1", port))
+        clients.append(sock)
+    await asyncio.sleep(0.2)
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / connections
+    tracemalloc.stop()
+
+    batches = [
+        [frames[(i + n) % len(frames)] for n in range(frames_per_connection)]
+        for i in range(connections)
+    ]
+    payloads = [b"".join(batch) for batch in batches]
+    # only inverter samples reach the coordinator; hello/heartbeat frames do not
+    expected = sum(frame[0] == LEGACY_START_BYTE for batch in batches for frame in batch)
+    started = time.perf_counter()
+    await asyncio.gather(*(loop.sock_sendall(sock, data) for sock, data in zip(clients, payloads)))
+    deadline = started + 30
+    while counter[0] < expected and time.perf_counter() < deadline:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - started
+
+    for sock in clients:
+        sock.close()
+    await coordinator.async_stop()
+    if counter[0] < expected:
+        raise SystemExit(f"load test only decoded {counter[0]} of {expected} frames")
+    return {
+        "load_frames_per_s": connections * frames_per_connection / elapsed,
+        "bytes_per_connection": per_connection,
+    }
+
+
+def compare(results: dict, baseline: dict) -> list[str]:
+    tolerance = baseline.get("tolerance", 0.25)
+    failures = []
+    for name, spec in baseline.get("metrics", {}).items():
+        if name not in results:
+            continue
+        value, reference = results[name], spec["value"]
+        if spec.get("higher_is_better", False):
+            regressed = value < reference * (1 - tolerance)
+        else:
+            regressed = value > reference * (1 + tolerance)
+        if regressed:
+            failures.append(f"{name}: {value:.2f} vs baseline {reference:.2f}")
+    return failures
+
+
+def write_baseline(results: dict, tolerance: float) -> None:
+    baseline = {
+        "tolerance": tolerance,
+        "metrics": {
+            name: {"value": round(results[name], 2), "higher_is_better": False} for name in GATED_METRICS
+        },
+    }
+    BASELINE_FILE.write_text(json.dumps(baseline, indent=2) + "\n")
+
+
+async def run(args: argparse.Namespace) -> int:
+    frames = load_corpus(args.corpus) if not args.synthesize else synthesize_corpus()
+    if not frames:
+        print(f"No frames found in {args.corpus}", file=sys.stderr)
+        return 2
+
+    reference = calibrate()
+    results = await bench_replay(frames, args.rounds)
+    results.update(await bench_load(frames, args.connections, args.frames))
+    results["reference_ops_per_s"] = reference
+    results.update(normalize(results, reference))
+    for name, value in results.items():
+        print(f"{name:>24}: {value:,.2f}")
+
+    if args.update_baseline:
+        write_baseline(results, args.tolerance)
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+    if not BASELINE_FILE.exists():
+        print("No baseline stored; run with --update-baseline first")
+        return 0
+    failures = compare(results, json.loads(BASELINE_FILE.read_text()))
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--synthesize", action="store_true", help="generate frames instead of reading the corpus")
+    parser.add_argument("--rounds", type=int, default=200, help="replay passes over the corpus")
+    parser.add_argument("--connections", type=int, default=200, help="concurrent fake loggers")
+    parser.add_argument("--frames", type=int, default=10, help="frames sent per fake logger")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression when updating the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Stand-in for the vendor cloud, for trying out the relay.
+
+Accepts relayed logger connections like the cloud's data port does and
+answers every V5 hello, heartbeat and data frame with the same response the
+listener builds, so the logger on the other end of the relay cannot tell
+the difference. Legacy inverter frames are counted but not answered. Point
+the integration's relay host and port at it:
+
+    python benchmarks/sim_cloud.py --port 10000
+    python benchmarks/sim_cloud.py --delay 2    # answer two seconds late
+
+Frames with a bad checksum get no reply. Counters are logged when a
+connection closes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from custom_components.solis.frame import (  # noqa: E402
+    LEGACY_START_BYTE,
+    build_ack,
+    frame_valid,
+    split_frames,
+)
+
+_LOGGER = logging.getLogger("sim_cloud")
+
+
+class CloudStats:
+    """Counters over every connection to one simulated cloud."""
+
+    __slots__ = ("connections", "frames", "samples", "replies", "rejected")
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.frames = 0
+        # legacy inverter frames
+        self.samples = 0
+        self.replies = 0
+        self.rejected = 0
+
+
+class SimulatedCloud(asyncio.Protocol):
+    def __init__(self, stats: CloudStats, delay: float = 0.0):
+        self.stats = stats
+        self.delay = delay
+        self.transport = None
+        self._buffer = bytearray()
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        self.stats.connections += 1
+        _LOGGER.info("Connection from %s", transport.get_extra_info("peername"))
+
+    def data_received(self, data: bytes) -> None:
+        stats = self.stats
+        self._buffer += data
+        frames, consumed = split_frames(self._buffer)
+        for offset, size in frames:
+            stats.frames += 1
+            if not frame_valid(self._buffer, offset, size):
+                stats.rejected += 1
+                continue
+            if self._buffer[offset] == LEGACY_START_BYTE:
+                stats.samples += 1
+                continue
+            reply = build_ack(self._buffer, offset)
+            if reply is None:
+                continue
+            stats.replies += 1
+            if self.delay:
+                asyncio.get_running_loop().call_later(self.delay, self._write, reply)
+            else:
+                self._write(reply)
+        del self._buffer[:consumed]
+
+    def _write(self, reply: bytes) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(reply)
+
+    def connection_lost(self, exc) -> None:
+        self.transport = None
+        stats = self.stats
+        _LOGGER.info(
+            "Connection closed: %d frames, %d samples, %d replies, %d rejected",
+            stats.frames,
+            stats.samples,
+            stats.replies,
+            stats.rejected,
+        )
+
+
+async def start(host: str, port: int, delay: float = 0.0) -> tuple[asyncio.AbstractServer, CloudStats]:
+    """Start a simulated cloud; port 0 picks a free one."""
+    stats = CloudStats()
+    server = await asyncio.get_running_loop().create_server(
+        lambda: SimulatedCloud(stats, delay), host=host, port=port
+    )
+    return server, stats
+
+
+async def run(args: argparse.Namespace) -> None:
+    server, _ = await start(args.host, args.port, args.delay)
+    _LOGGER.info("Simulated cloud listening on %s:%s", args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=10000)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds before each reply")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
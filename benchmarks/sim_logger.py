@@ -0,0 +1,172 @@
+"""
+Simulated Solarman V5 logger for trying out polling mode.
+
+Listens like a logger's local port and answers "read input registers"
+requests wrapped in V5 frames with synthetic Solis register values (power
+following the time of day, a growing energy counter). Point the
+integration's poll host at it, with the same logger serial:
+
+    python benchmarks/sim_logger.py --port 8899 --serial 1234567890
+    python benchmarks/sim_logger.py --drop 0.2    # leave 20% of requests unanswered
+
+Requests for another logger serial, with a bad checksum or for registers
+outside 3000-3099 get no reply, as with a real logger. Run it where Home
+Assistant is importable, like the benchmark.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import random
+import struct
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+from custom_components.solis.frame import (  # noqa: E402
+    CONTROL_REQUEST,
+    CONTROL_RESPONSE,
+    END_BYTE,
+    RESPONSE_PAYLOAD_SIZE,
+    START_BYTE,
+    V5_HEADER,
+    checksum,
+    control_code,
+    frame_valid,
+    split_frames,
+)
+from custom_components.solis.modbus import READ_INPUT_REGISTERS, crc16  # noqa: E402
+
+_LOGGER = logging.getLogger("sim_logger")
+
+FIRST_REGISTER = 3000
+REGISTER_COUNT = 100
+# offset of the Modbus message in a V5 request
+_REQUEST_MESSAGE = V5_HEADER.size + 15
+
+
+class Inverter:
+    """Synthetic register values of a single phase, two string inverter."""
+
+    def __init__(self, peak_power: float = 5000.0):
+        self.peak_power = peak_power
+        self.energy = 12345.0
+        self._last = time.time()
+
+    def registers(self) -> list[int]:
+        now = time.time()
+        # daylight from 06:00 to 20:00 local time
+        hour = time.localtime(now).tm_hour + time.localtime(now).tm_min / 60
+        daylight = max(0.0, math.sin((hour - 6) / 14 * math.pi))
+        power = int(self.peak_power * daylight * random.uniform(0.9, 1.0))
+        self.energy += power * (now - self._last) / 3600000
+        self._last = now
+
+        regs = [0] * REGISTER_COUNT
+
+        def put(register: int, value: int, words: int = 1) -> None:
+            for word in range(words):
+                regs[register - FIRST_REGISTER + word] = (value >> (16 * (words - 1 - word))) & 0xFFFF
+
+        put(3004, power, 2)
+        put(3006, int(power / 0.97), 2)
+        put(3008, int(self.energy), 2)
+        for string in range(2):
+            voltage = 320 + 20 * string if power else 0
+            put(3021 + 2 * string, voltage * 10)
+            put(3022 + 2 * string, int(power / 0.97 / 2 / voltage * 10) if voltage else 0)
+        put(3033, 2301)
+        put(3036, int(power / 230 * 10))
+        put(3041, int((25 + 15 * daylight) * 10))
+        put(3042, 5000)
+        put(3043, 3 if power else 0)
+        return regs
+
+
+class SimulatedLogger(asyncio.Protocol):
+    def __init__(self, serial: int, inverter: Inverter, drop: float):
+        self.serial = serial
+        self.inverter = inverter
+        self.drop = drop
+        self.transport = None
+        self._buffer = bytearray()
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        _LOGGER.info("Connection from %s", transport.get_extra_info("peername"))
+
+    def data_received(self, data: bytes) -> None:
+        self._buffer += data
+        frames, consumed = split_frames(self._buffer)
+        for offset, size in frames:
+            reply = self._reply(bytes(self._buffer[offset : offset + size]))
+            if reply is not None:
+                self.transport.write(reply)
+        del self._buffer[:consumed]
+
+    def _reply(self, frame: bytes):
+        if frame[0] != START_BYTE or control_code(frame, 0) != CONTROL_REQUEST:
+            return None
+        if not frame_valid(frame, 0, len(frame)):
+            return None
+        _, _, _, sequence, _, serial = V5_HEADER.unpack_from(frame)
+        if serial != self.serial or random.random() < self.drop:
+            return None
+        message = frame[_REQUEST_MESSAGE:-2]
+        slave, function, start, count = struct.unpack_from(">BBHH", message)
+        if function != READ_INPUT_REGISTERS or crc16(message[:-2]) != struct.unpack_from("<H", message, 6)[0]:
+            return None
+        first = start - FIRST_REGISTER
+        if first < 0 or first + count > REGISTER_COUNT:
+            return None
+        regs = self.inverter.registers()[first : first + count]
+        body = struct.pack(">BBB", slave, function, count * 2) + struct.pack(f">{count}H", *regs)
+        body += struct.pack("<H", crc16(body))
+
+        length = RESPONSE_PAYLOAD_SIZE + len(body)
+        reply = bytearray(V5_HEADER.size + length + 2)
+        V5_HEADER.pack_into(reply, 0, START_BYTE, length, CONTROL_RESPONSE, sequence, 0, self.serial)
+        struct.pack_into("<BBIII", reply, V5_HEADER.size, 0x02, 0x01, int(time.monotonic()), 0, 0)
+        reply[V5_HEADER.size + RESPONSE_PAYLOAD_SIZE : -2] = body
+        reply[-2] = checksum(memoryview(reply)[1:-2])
+        reply[-1] = END_BYTE
+        return bytes(reply)
+
+    def connection_lost(self, exc) -> None:
+        _LOGGER.info("Connection closed")
+
+
+async def run(args: argparse.Namespace) -> None:
+    loop = asyncio.get_running_loop()
+    inverter = Inverter()
+    server = await loop.create_server(
+        lambda: SimulatedLogger(args.serial, inverter, args.drop), host=args.host, port=args.port
+    )
+    _LOGGER.info("Simulated logger %s listening on %s:%s", args.serial, args.host, args.port)
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--serial", type=int, default=1234567890, help="logger serial")
+    parser.add_argument("--drop", type=float, default=0.0, help="share of requests left unanswered")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
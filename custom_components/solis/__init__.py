@@ -4,20 +4,25 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
-from homeassistant.const import Platform
-
 if TYPE_CHECKING:
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.core import HomeAssistant
 
+    from .coordinator import SolisDataUpdateCoordinator
+
 from .const import DOMAIN, DEFAULT_TCP_PORT
-from .coordinator import SolisDataUpdateCoordinator
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+# Home Assistant and the modules built on it are imported on setup only, so
+# the HA-free modules of this package, such as the collector started with
+# ``python -m custom_components.solis.collector``, import without it
+PLATFORMS: list[str] = ["sensor"]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the integration from a config entry."""
+    from .coordinator import SolisDataUpdateCoordinator
+    from .services import async_setup_services
+
     hass.data.setdefault(DOMAIN, {})
     # store a coordinator that listens for packets and holds the parsed data
     port = entry.options.get("port", DEFAULT_TCP_PORT)
@@ -31,10 +36,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await coordinator.async_start()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_setup_services(hass)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options, reloading the entry only if they need it."""
+    coordinator: SolisDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    if not await coordinator.async_apply_options(entry.options):
+        await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -43,5 +57,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         coordinator = data.get("coordinator")
         if coordinator:
             await coordinator.async_stop()
+        if not hass.data[DOMAIN]:
+            from .services import async_unload_services
+
+            async_unload_services(hass)
 
     return unload_ok
\ No newline at end of file
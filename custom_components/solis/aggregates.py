@@ -0,0 +1,152 @@
+"""Running energy and power aggregates per inverter."""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Optional
+
+# gaps longer than this (logger offline) are not counted as production time
+MAX_PRODUCTION_GAP = 900.0
+
+# keys merged into every sample
+ENERGY_TODAY = "energy_today_kWh"
+ENERGY_MONTH = "energy_month_kWh"
+ENERGY_YEAR = "energy_year_kWh"
+INTERVAL_ENERGY = "interval_energy_kWh"
+PEAK_POWER_TODAY = "peak_power_today_W"
+PRODUCTION_TIME_TODAY = "production_time_today_h"
+
+AGGREGATE_KEYS = (
+    ENERGY_TODAY,
+    ENERGY_MONTH,
+    ENERGY_YEAR,
+    INTERVAL_ENERGY,
+    PEAK_POWER_TODAY,
+    PRODUCTION_TIME_TODAY,
+)
+
+
+class EnergyAggregate:
+    """Incremental yield/peak/production-time counters for one inverter."""
+
+    __slots__ = (
+        "day",
+        "energy_today",
+        "energy_month",
+        "energy_year",
+        "interval_energy",
+        "peak_power_today",
+        "production_seconds_today",
+        "last_total",
+        "low_total",
+        "last_time",
+    )
+
+    def __init__(self) -> None:
+        self.day: Optional[date] = None
+        self.energy_today = 0.0
+        self.energy_month = 0.0
+        self.energy_year = 0.0
+        self.interval_energy = 0.0
+        self.peak_power_today = 0.0
+        self.production_seconds_today = 0.0
+        # lifetime counter and wall clock time of the previous sample
+        self.last_total: Optional[float] = None
+        self.last_time: Optional[float] = None
+        # a reading below last_total, waiting for the next one to confirm a reset
+        self.low_total: Optional[float] = None
+
+    def rollover(self, today: date) -> bool:
+        """Reset the counters whose period ended before ``today``.
+
+        Returns True if anything was reset.
+        """
+        previous = self.day
+        if previous == today:
+            return False
+        self.day = today
+        if previous is None:
+            return False
+        self.energy_today = 0.0
+        self.interval_energy = 0.0
+        self.peak_power_today = 0.0
+        self.production_seconds_today = 0.0
+        if (previous.year, previous.month) != (today.year, today.month):
+            self.energy_month = 0.0
+        if previous.year != today.year:
+            self.energy_year = 0.0
+        return True
+
+    def update(self, today: date, timestamp: float, total: Optional[float], power: Optional[float]) -> None:
+        """Fold one sample received at ``timestamp`` (local date ``today``) into the aggregates."""
+        if today != self.day:
+            self.rollover(today)
+
+        delta = 0.0
+        if total is not None:
+            last = self.last_total
+            if last is None or total >= last:
+                if last is not None:
+                    delta = total - last
+                self.last_total = total
+                self.low_total = None
+            elif self.low_total is not None and total >= self.low_total:
+                # a second low reading: the lifetime counter was reset
+                # (inverter swapped or reset); count from the first one
+                delta = total - self.low_total
+                self.last_total = total
+                self.low_total = None
+            else:
+                # a single low reading is more likely garbage than a reset,
+                # and counting it as one would add the whole lifetime total
+                # when the counter comes back; count nothing until confirmed
+                self.low_total = total
+        self.interval_energy = round(delta, 3)
+        self.energy_today += delta
+        self.energy_month += delta
+        self.energy_year += delta
+
+        if power is not None:
+            if power > self.peak_power_today:
+                self.peak_power_today = power
+            if power > 0 and self.last_time is not None:
+                self.production_seconds_today += min(max(timestamp - self.last_time, 0.0), MAX_PRODUCTION_GAP)
+        self.last_time = timestamp
+
+    def values(self) -> dict:
+        return {
+            ENERGY_TODAY: round(self.energy_today, 3),
+            ENERGY_MONTH: round(self.energy_month, 3),
+            ENERGY_YEAR: round(self.energy_year, 3),
+            INTERVAL_ENERGY: self.interval_energy,
+            PEAK_POWER_TODAY: self.peak_power_today,
+            PRODUCTION_TIME_TODAY: round(self.production_seconds_today / 3600, 2),
+        }
+
+    def as_dict(self) -> dict:
+        """Serialize for storage."""
+        return {
+            "day": self.day.isoformat() if self.day else None,
+            "energy_today": self.energy_today,
+            "energy_month": self.energy_month,
+            "energy_year": self.energy_year,
+            "peak_power_today": self.peak_power_today,
+            "production_seconds_today": self.production_seconds_today,
+            "last_total": self.last_total,
+            "low_total": self.low_total,
+            "last_time": self.last_time,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> EnergyAggregate:
+        aggregate = cls()
+        aggregate.day = date.fromisoformat(data["day"]) if data.get("day") else None
+        aggregate.energy_today = data.get("energy_today", 0.0)
+        aggregate.energy_month = data.get("energy_month", 0.0)
+        aggregate.energy_year = data.get("energy_year", 0.0)
+        aggregate.peak_power_today = data.get("peak_power_today", 0.0)
+        aggregate.production_seconds_today = data.get("production_seconds_today", 0.0)
+        aggregate.last_total = data.get("last_total")
+        aggregate.low_total = data.get("low_total")
+        aggregate.last_time = data.get("last_time")
+        return aggregate
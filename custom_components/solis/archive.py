@@ -0,0 +1,178 @@
+"""
+Append-only on-disk archive of raw logger frames.
+
+Segments (``<stamp>.seg``) hold ``<timestamp:f64><length:u32><peer length:u8>
+<peer><frame>`` records; each has an ``.idx`` of (timestamp, serial, offset).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from struct import Struct
+from typing import Awaitable, Callable, Iterator, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORD_HEADER = Struct("<dIB")
+INDEX_ENTRY = Struct("<d16sQ")
+
+SEGMENT_SUFFIX = ".seg"
+INDEX_SUFFIX = ".idx"
+
+# flush when this many bytes are pending, or after FLUSH_INTERVAL seconds
+FLUSH_BYTES = 64 * 1024
+FLUSH_INTERVAL = 5.0
+
+
+@dataclass(frozen=True)
+class ArchiveRecord:
+    timestamp: float
+    serial: str
+    peer: str
+    frame: bytes
+
+
+class FrameArchive:
+    """Batching writer for the frame archive."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        executor: Callable[..., Awaitable],
+        segment_size: int = 16 * 1024 * 1024,
+        max_size: int = 256 * 1024 * 1024,
+    ):
+        self.directory = Path(directory)
+        self._executor = executor
+        self.segment_size = segment_size
+        self.max_size = max_size
+        self._pending: list[tuple[float, str, str, bytes]] = []
+        self._pending_bytes = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # only touched from the executor
+        self._segment = None
+        self._index = None
+
+    def append(self, serial: Optional[str], peer: Optional[str], frame: bytes) -> None:
+        """Queue a raw frame for the next batch write."""
+        self._pending.append((time.time(), serial or "", peer or "", frame))
+        self._pending_bytes += len(frame) + RECORD_HEADER.size
+        if self._pending_bytes >= FLUSH_BYTES:
+            self._start_flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(FLUSH_INTERVAL, self._start_flush)
+
+    def _start_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None and not self._flush_task.done():
+            # a write is in flight; it picks up the remainder when done
+            return
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self) -> None:
+        while self._pending:
+            batch, self._pending, self._pending_bytes = self._pending, [], 0
+            try:
+                await self._executor(self._write_batch, batch)
+            except Exception:
+                _LOGGER.exception("Failed to write %d frames to the archive", len(batch))
+
+    async def async_close(self) -> None:
+        """Write everything still pending and close the segment files."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._flush_task is not None:
+            await self._flush_task
+        await self._flush()
+        await self._executor(self._close_segment)
+
+    def _write_batch(self, batch: list[tuple[float, str, str, bytes]]) -> None:
+        if self._segment is None:
+            self._open_segment()
+        records = bytearray()
+        index = bytearray()
+        offset = self._segment.tell()
+        for timestamp, serial, peer, frame in batch:
+            peer_bytes = peer.encode()[:255]
+            index += INDEX_ENTRY.pack(timestamp, serial.encode()[:16], offset + len(records))
+            records += RECORD_HEADER.pack(timestamp, len(frame), len(peer_bytes))
+            records += peer_bytes
+            records += frame
+        self._segment.write(records)
+        self._index.write(index)
+        self._segment.flush()
+        self._index.flush()
+        if self._segment.tell() >= self.segment_size:
+            self._close_segment()
+            self._enforce_max_size()
+
+    def _open_segment(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = time.strftime("%Y%m%dT%H%M%S", time.gmtime()) + f"-{time.time_ns() % 1_000_000_000:09d}"
+        self._segment = open(self.directory / (stem + SEGMENT_SUFFIX), "ab")
+        self._index = open(self.directory / (stem + INDEX_SUFFIX), "ab")
+
+    def _close_segment(self) -> None:
+        if self._segment is not None:
+            self._segment.close()
+            self._index.close()
+            self._segment = self._index = None
+
+    def _enforce_max_size(self) -> None:
+        segments = sorted(self.directory.glob("*" + SEGMENT_SUFFIX))
+        sizes = [path.stat().st_size for path in segments]
+        total = sum(sizes)
+        for path, size in zip(segments, sizes):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(INDEX_SUFFIX).unlink(missing_ok=True)
+            total -= size
+
+
+def iter_records(
+    directory: str | os.PathLike,
+    serial: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Iterator[ArchiveRecord]:
+    """Yield archived frames, oldest first, optionally filtered by serial/time.
+
+    Blocking; run it in an executor when called from the event loop.
+    """
+    wanted = serial.encode()[:16] if serial is not None else None
+    for segment_path in sorted(Path(directory).glob("*" + SEGMENT_SUFFIX)):
+        index_path = segment_path.with_suffix(INDEX_SUFFIX)
+        if not index_path.exists():
+            continue
+        index = index_path.read_bytes()
+        usable = len(index) - len(index) % INDEX_ENTRY.size
+        # segments are bounded (segment_size), so read each one in a single call
+        # instead of seeking per record
+        segment = segment_path.read_bytes()
+        for timestamp, entry_serial, offset in INDEX_ENTRY.iter_unpack(index[:usable]):
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                # entries are appended in time order
+                break
+            entry_serial = entry_serial.rstrip(b"\x00")
+            if wanted is not None and entry_serial != wanted:
+                continue
+            if offset + RECORD_HEADER.size > len(segment):
+                break
+            _, length, peer_length = RECORD_HEADER.unpack_from(segment, offset)
+            peer_start = offset + RECORD_HEADER.size
+            frame_start = peer_start + peer_length
+            peer = segment[peer_start:frame_start].decode(errors="replace")
+            frame = segment[frame_start : frame_start + length]
+            yield ArchiveRecord(timestamp, entry_serial.decode(errors="replace"), peer, frame)
@@ -0,0 +1,225 @@
+"""
+Bulk decoding of archived frames into hourly statistics, with NumPy.
+
+Blocking; call from an executor.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+
+from custom_components.solis.archive import iter_records
+from custom_components.solis.frame import control_code
+from custom_components.solis.layouts import FrameLayout, find_layout
+
+if TYPE_CHECKING:
+    import numpy as np
+
+ENERGY_FIELD = "et_ge0"
+POWER_FIELD = "current_power_apo_t1_W"
+SERIAL_FIELD = "serialno"
+
+
+@dataclass
+class HourlyStatistics:
+    """Hourly rows for one inverter; every array has one entry per hour."""
+
+    serial: str
+    # unix timestamp of the start of each hour
+    start: np.ndarray
+    # lifetime energy counter at the end of the hour
+    energy_state: np.ndarray
+    # energy produced since the first sample, counter resets excluded
+    energy_sum: np.ndarray
+    power_mean: np.ndarray
+    power_min: np.ndarray
+    power_max: np.ndarray
+
+
+def layout_dtype(layout: FrameLayout) -> np.dtype:
+    """Structured dtype with one big endian field per layout field."""
+    import numpy as np
+
+    formats = []
+    for fld in layout.fields:
+        if fld.text:
+            formats.append(f"S{fld.size}")
+        else:
+            formats.append(f">{'i' if fld.signed else 'u'}{fld.size}")
+    return np.dtype(
+        {
+            "names": [fld.name for fld in layout.fields],
+            "formats": formats,
+            "offsets": [fld.offset for fld in layout.fields],
+            "itemsize": layout.size,
+        }
+    )
+
+
+def decode_frames(layout: FrameLayout, frames: bytes, count: int) -> dict[str, np.ndarray]:
+    """Decode ``count`` back to back frames of ``layout`` into one array per field."""
+    import numpy as np
+
+    raw = np.frombuffer(frames, dtype=layout_dtype(layout), count=count)
+    values = {}
+    for fld in layout.fields:
+        column = raw[fld.name]
+        if fld.text:
+            values[fld.name] = np.char.strip(column, b"\x00 ")
+        elif fld.divisor is None:
+            values[fld.name] = column.astype(np.int64)
+        else:
+            values[fld.name] = column / fld.divisor
+    return values
+
+
+def iter_frames(
+    path: str | os.PathLike,
+    serial: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Iterator[tuple[float, bytes]]:
+    """Yield ``(timestamp, frame)`` from an archive directory or a trace file."""
+    path = Path(path)
+    if path.is_dir():
+        for record in iter_records(path, serial, start, end):
+            yield record.timestamp, record.frame
+        return
+    with open(path, encoding="utf-8") as trace_file:
+        for line in trace_file:
+            try:
+                record = json.loads(line)
+                timestamp = float(record["time"])
+                frame = bytes.fromhex(record["frame"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            if start is not None and timestamp < start:
+                continue
+            if end is not None and timestamp >= end:
+                continue
+            if serial is not None and record.get("serial") not in (serial, None):
+                continue
+            yield timestamp, frame
+
+
+def load_samples(frames: Iterator[tuple[float, bytes]]) -> dict[str, np.ndarray]:
+    """Decode frames in bulk; returns ``time``, serial, energy and power columns."""
+    import numpy as np
+
+    # group frames by (size, control code) so each group is a single
+    # contiguous buffer of one layout; None marks frames without the fields
+    groups: dict[tuple[int, Optional[int]], Optional[tuple[FrameLayout, bytearray, list[float]]]] = {}
+    for timestamp, frame in frames:
+        key = (len(frame), control_code(frame, 0))
+        try:
+            group = groups[key]
+        except KeyError:
+            layout = find_layout(*key)
+            if layout is None or not {SERIAL_FIELD, ENERGY_FIELD, POWER_FIELD} <= set(layout.field_names):
+                group = None
+            else:
+                group = (layout, bytearray(), [])
+            groups[key] = group
+        if group is not None:
+            group[1].extend(frame)
+            group[2].append(timestamp)
+
+    columns: dict[str, list[np.ndarray]] = {"time": [], SERIAL_FIELD: [], ENERGY_FIELD: [], POWER_FIELD: []}
+    for group in groups.values():
+        if group is None:
+            continue
+        layout, buffer, timestamps = group
+        values = decode_frames(layout, bytes(buffer), len(timestamps))
+        columns["time"].append(np.asarray(timestamps, dtype=np.float64))
+        for name in (SERIAL_FIELD, ENERGY_FIELD, POWER_FIELD):
+            columns[name].append(values[name])
+    if not columns["time"]:
+        return {
+            "time": np.empty(0),
+            SERIAL_FIELD: np.empty(0, dtype="S16"),
+            ENERGY_FIELD: np.empty(0),
+            POWER_FIELD: np.empty(0),
+        }
+    return {name: np.concatenate(parts) for name, parts in columns.items()}
+
+
+def energy_increase(energy: np.ndarray) -> np.ndarray:
+    """Energy produced up to each sample since the one before it.
+
+    Follows ``EnergyAggregate.update``: a single reading below the counter is
+    ignored as garbage, and only a second one confirms a reset, counted from
+    the first low reading.
+    """
+    import numpy as np
+
+    increase = np.diff(energy, prepend=energy[:1])
+    # drops are rare, so only they are walked one by one
+    drops = np.flatnonzero(increase < 0)
+    resolved = -1
+    for index in drops:
+        if index <= resolved:
+            continue
+        last = energy[index - 1]
+        low = energy[index]
+        increase[index] = 0.0
+        resolved = index + 1
+        while resolved < len(energy):
+            total = energy[resolved]
+            if total >= last:
+                increase[resolved] = total - last
+                break
+            if total >= low:
+                increase[resolved] = total - low
+                break
+            low = total
+            increase[resolved] = 0.0
+            resolved += 1
+    return increase
+
+
+def hourly_statistics(samples: dict[str, np.ndarray]) -> list[HourlyStatistics]:
+    """Reduce decoded samples to hourly rows per serial."""
+    import numpy as np
+
+    results = []
+    serials = samples[SERIAL_FIELD]
+    for serial in np.unique(serials):
+        mask = serials == serial
+        order = np.argsort(samples["time"][mask], kind="stable")
+        times = samples["time"][mask][order]
+        energy = samples[ENERGY_FIELD][mask][order].astype(np.float64)
+        power = samples[POWER_FIELD][mask][order].astype(np.float64)
+
+        hours = (times // 3600).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, hours[1:] != hours[:-1]])
+        ends = np.r_[starts[1:], len(hours)]
+
+        # per sample, so the first hour keeps the energy produced within it
+        increase = energy_increase(energy)
+
+        results.append(
+            HourlyStatistics(
+                serial=serial.decode("ascii", "replace") if isinstance(serial, bytes) else str(serial),
+                start=hours[starts] * 3600,
+                energy_state=energy[ends - 1],
+                energy_sum=np.cumsum(increase)[ends - 1],
+                power_mean=np.add.reduceat(power, starts) / (ends - starts),
+                power_min=np.minimum.reduceat(power, starts),
+                power_max=np.maximum.reduceat(power, starts),
+            )
+        )
+    return results
+
+
+def load_hourly_statistics(
+    path: str | os.PathLike,
+    serial: Optional[str] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> list[HourlyStatistics]:
+    """Decode every frame under ``path`` and return hourly rows per serial."""
+    return hourly_statistics(load_samples(iter_frames(path, serial, start, end)))
@@ -0,0 +1,283 @@
+"""
+Standalone collector: runs the logger listener outside Home Assistant.
+
+    python -m custom_components.solis.collector --port 8899 --workers 4 \
+        --forward 127.0.0.1:8898
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+from collections import Counter, deque
+from time import time
+from typing import Optional
+
+from custom_components.solis.const import (
+    DEFAULT_COLLECTOR_PORT,
+    DEFAULT_HANDSHAKE_TIMEOUT,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_BUFFER,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_CONNECTIONS_PER_PEER,
+    DEFAULT_RELAY_PORT,
+    DEFAULT_TCP_PORT,
+)
+from custom_components.solis.duplicates import DuplicateFilter
+from custom_components.solis.ingest import encode_batch
+from custom_components.solis.listener import ConnectionTracker, SolisTCPProtocol
+from custom_components.solis.record import Sample
+from custom_components.solis.relay import UpstreamRelay
+from custom_components.solis.stats import ListenerStats
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_BATCH_INTERVAL = 1.0
+DEFAULT_BATCH_SIZE = 500
+# samples kept while the integration is unreachable; the oldest are dropped
+DEFAULT_MAX_PENDING = 10000
+# counters and connection counts are reported at least this often
+REPORT_INTERVAL = 10.0
+# stop writing batches while this many bytes are waiting to be sent
+MAX_WRITE_BUFFER = 1024 * 1024
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+class Collector:
+    """Owner of the worker's logger connections; batches samples to the integration."""
+
+    def __init__(
+        self,
+        forward_host: str,
+        forward_port: int,
+        *,
+        max_connections: int,
+        max_connections_per_peer: int,
+        idle_timeout: float,
+        handshake_timeout: float,
+        max_buffer: int,
+        batch_interval: float = DEFAULT_BATCH_INTERVAL,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        relay: Optional[UpstreamRelay] = None,
+    ):
+        self.forward_host = forward_host
+        self.forward_port = forward_port
+        self.connections = ConnectionTracker(max_connections, max_connections_per_peer, idle_timeout, handshake_timeout)
+        self.max_buffer = max_buffer
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.stats = ListenerStats()
+        self.archive = None
+        self.tracer = None
+        self.relay = relay
+        self.duplicates = DuplicateFilter()
+        # samples dropped because the integration was unreachable or slow
+        self.dropped = 0
+        self._pending: deque[tuple[float, dict]] = deque(maxlen=max_pending)
+        # counters already reported, to send deltas
+        self._reported_frames = 0
+        self._reported_bytes = 0
+        self._reported_rejected = 0
+        self._reported_duplicates = 0
+        self._reported_failures: Counter[str] = Counter()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def async_register_connection(self, protocol: SolisTCPProtocol) -> bool:
+        return self.connections.add(protocol)
+
+    def async_unregister_connection(self, protocol: SolisTCPProtocol) -> None:
+        self.connections.discard(protocol)
+
+    def async_handle_sample(self, sample: Sample, received_ns: Optional[int] = None) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            self.dropped += 1
+        # batches are JSON; the integration rebuilds the Sample by field name
+        self._pending.append((time(), dict(sample)))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_interval, self.flush)
+
+    def flush(self) -> None:
+        """Send pending samples and counter deltas, if the integration is connected."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        writer = self._writer
+        if writer is None or writer.is_closing():
+            # kept (bounded) until the forward connection is back
+            return
+        if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            # the integration is not keeping up; retry later, dropping the
+            # oldest samples if the backlog overflows
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_interval, self.flush)
+            return
+        stats = self.stats
+        failures = stats.parse_failures - self._reported_failures
+        batch = {
+            "samples": list(self._pending),
+            "frames": stats.frames - self._reported_frames,
+            "bytes": stats.bytes - self._reported_bytes,
+            "rejected": stats.rejected - self._reported_rejected,
+            "duplicates": stats.duplicates - self._reported_duplicates,
+            "parse_failures": dict(failures),
+            "connections": len(self.connections),
+        }
+        self._pending.clear()
+        self._reported_frames = stats.frames
+        self._reported_bytes = stats.bytes
+        self._reported_rejected = stats.rejected
+        self._reported_duplicates = stats.duplicates
+        self._reported_failures.update(failures)
+        writer.write(encode_batch(batch))
+
+    async def _async_forward(self) -> None:
+        """Keep a connection to the integration's collector port open."""
+        delay = RECONNECT_DELAY
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.forward_host, self.forward_port)
+            except OSError as err:
+                _LOGGER.warning(
+                    "Cannot reach Home Assistant at %s:%s (%s); retrying in %.0fs",
+                    self.forward_host,
+                    self.forward_port,
+                    err,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+            _LOGGER.info("Forwarding samples to %s:%s", self.forward_host, self.forward_port)
+            delay = RECONNECT_DELAY
+            self._writer = writer
+            self.flush()
+            try:
+                # the integration never sends anything; EOF means it went away
+                await reader.read()
+            except OSError:
+                pass
+            finally:
+                self._writer = None
+                writer.close()
+            _LOGGER.warning("Connection to Home Assistant closed; reconnecting")
+
+    def _report(self) -> None:
+        self.connections.sweep(asyncio.get_running_loop().time())
+        self.flush()
+
+    async def async_run(self, host: str, port: int, reuse_port: bool, stop: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: SolisTCPProtocol(self), host=host, port=port, reuse_port=reuse_port)
+        _LOGGER.info("Listening for Solis TCP connections on %s:%s", host, port)
+        forward = loop.create_task(self._async_forward())
+        interval = min(REPORT_INTERVAL, self.connections.sweep_interval)
+
+        def _tick() -> None:
+            nonlocal tick
+            self._report()
+            tick = loop.call_later(interval, _tick)
+
+        tick = loop.call_later(interval, _tick)
+        try:
+            await stop.wait()
+        finally:
+            tick.cancel()
+            server.close()
+            self.connections.abort_all()
+            if self.relay is not None:
+                self.relay.close()
+            await server.wait_closed()
+            # hand over whatever is still pending before exiting
+            self.flush()
+            if self._writer is not None:
+                try:
+                    await asyncio.wait_for(self._writer.drain(), 5)
+                except (OSError, asyncio.TimeoutError):
+                    pass
+            forward.cancel()
+
+
+def _parse_address(value: str, default_port: int) -> tuple[str, int]:
+    host, separator, port = value.rpartition(":")
+    if not separator:
+        return value, default_port
+    return host or "127.0.0.1", int(port)
+
+
+def _worker(options: dict) -> None:
+    logging.basicConfig(
+        level=options["log_level"], format="%(asctime)s %(process)d %(levelname)s %(name)s: %(message)s"
+    )
+    forward_host, forward_port = _parse_address(options["forward"], DEFAULT_COLLECTOR_PORT)
+    relay = UpstreamRelay(*_parse_address(options["relay"], DEFAULT_RELAY_PORT)) if options["relay"] else None
+    collector = Collector(
+        forward_host,
+        forward_port,
+        max_connections=options["max_connections"],
+        max_connections_per_peer=options["max_connections_per_peer"],
+        idle_timeout=options["idle_timeout"],
+        handshake_timeout=options["handshake_timeout"],
+        max_buffer=options["max_buffer"],
+        batch_interval=options["batch_interval"],
+        batch_size=options["batch_size"],
+        relay=relay,
+    )
+
+    async def _run() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await collector.async_run(options["host"], options["port"], options["workers"] > 1, stop)
+
+    asyncio.run(_run())
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="0.0.0.0", help="address loggers connect to")
+    parser.add_argument("--port", type=int, default=DEFAULT_TCP_PORT, help="port loggers connect to")
+    parser.add_argument("--workers", type=int, default=1, help="listener processes sharing the port")
+    parser.add_argument(
+        "--forward",
+        default=f"127.0.0.1:{DEFAULT_COLLECTOR_PORT}",
+        help="host:port of the integration's collector port",
+    )
+    parser.add_argument("--relay", default="", help=f"host[:port] of the vendor cloud (port {DEFAULT_RELAY_PORT})")
+    parser.add_argument("--batch-interval", type=float, default=DEFAULT_BATCH_INTERVAL, help="seconds")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="samples")
+    parser.add_argument("--max-connections", type=int, default=DEFAULT_MAX_CONNECTIONS, help="per worker")
+    parser.add_argument("--max-connections-per-peer", type=int, default=DEFAULT_MAX_CONNECTIONS_PER_PEER)
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    parser.add_argument("--handshake-timeout", type=float, default=DEFAULT_HANDSHAKE_TIMEOUT)
+    parser.add_argument("--max-buffer", type=int, default=DEFAULT_MAX_BUFFER)
+    parser.add_argument("--log-level", default="INFO")
+    options = vars(parser.parse_args(argv))
+
+    if options["workers"] <= 1:
+        _worker(options)
+        return 0
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_worker, args=(options,), daemon=True) for _ in range(options["workers"])]
+    for process in workers:
+        process.start()
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            process.join()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
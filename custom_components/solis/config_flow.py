@@ -7,7 +7,54 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_PORT
 from homeassistant.core import callback
 
-from .const import DOMAIN, DEFAULT_TCP_PORT
+from .const import (
+    CONF_ARCHIVE,
+    CONF_ARCHIVE_MAX_SIZE,
+    CONF_BIND_ADDRESS,
+    CONF_COALESCE_WINDOW,
+    CONF_COLLECTOR,
+    CONF_COLLECTOR_PORT,
+    CONF_EXTRA_PORTS,
+    CONF_HANDSHAKE_TIMEOUT,
+    CONF_IDLE_TIMEOUT,
+    CONF_MAX_BUFFER,
+    CONF_MAX_CONNECTIONS,
+    CONF_MAX_CONNECTIONS_PER_PEER,
+    CONF_OFFLINE_AFTER,
+    CONF_POLL_HOST,
+    CONF_POLL_INTERVAL,
+    CONF_POLL_LOGGER_SERIAL,
+    CONF_POLL_PORT,
+    CONF_POLL_SERIAL,
+    CONF_RELAY_HOST,
+    CONF_RELAY_PORT,
+    CONF_TRACE_SAMPLE_RATE,
+    CONF_TRACE_SERIALS,
+    DEFAULT_ARCHIVE_MAX_SIZE,
+    DEFAULT_BIND_ADDRESS,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COLLECTOR_PORT,
+    DEFAULT_HANDSHAKE_TIMEOUT,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_BUFFER,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_CONNECTIONS_PER_PEER,
+    DEFAULT_OFFLINE_AFTER,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_POLL_PORT,
+    DEFAULT_RELAY_PORT,
+    DOMAIN,
+    DEFAULT_TCP_PORT,
+)
+
+def _port_list(value: str) -> str:
+    """Validate a comma separated list of TCP ports."""
+    ports = [port.strip() for port in value.split(",") if port.strip()]
+    for port in ports:
+        if not port.isdigit() or not 1 <= int(port) <= 65535:
+            raise vol.Invalid(f"Invalid port: {port}")
+    return ", ".join(ports)
+
 
 STEP_USER_SCHEMA = vol.Schema(
     {
@@ -42,13 +89,76 @@ class SolisOptionsFlowHandler(config_entries.OptionsFlow):
         self._config_entry = config_entry
 
     async def async_step_init(self, user_input=None):
-        current = self._config_entry.options.get(CONF_PORT, DEFAULT_TCP_PORT)
+        options = self._config_entry.options
         if user_input is None:
             return self.async_show_form(
                 step_id="init",
                 data_schema=vol.Schema(
-                    {vol.Required(CONF_PORT, default=current): vol.All(int, vol.Range(min=1, max=65535))}
+                    {
+                        vol.Required(
+                            CONF_PORT, default=options.get(CONF_PORT, DEFAULT_TCP_PORT)
+                        ): vol.All(int, vol.Range(min=1, max=65535)),
+                        vol.Optional(
+                            CONF_EXTRA_PORTS, default=options.get(CONF_EXTRA_PORTS, "")
+                        ): vol.All(str, _port_list),
+                        vol.Optional(
+                            CONF_BIND_ADDRESS, default=options.get(CONF_BIND_ADDRESS, DEFAULT_BIND_ADDRESS)
+                        ): str,
+                        vol.Required(
+                            CONF_MAX_CONNECTIONS,
+                            default=options.get(CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS),
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Required(
+                            CONF_MAX_CONNECTIONS_PER_PEER,
+                            default=options.get(CONF_MAX_CONNECTIONS_PER_PEER, DEFAULT_MAX_CONNECTIONS_PER_PEER),
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Required(
+                            CONF_IDLE_TIMEOUT, default=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+                        ): vol.All(int, vol.Range(min=30)),
+                        vol.Required(
+                            CONF_HANDSHAKE_TIMEOUT,
+                            default=options.get(CONF_HANDSHAKE_TIMEOUT, DEFAULT_HANDSHAKE_TIMEOUT),
+                        ): vol.All(int, vol.Range(min=5)),
+                        vol.Required(
+                            CONF_MAX_BUFFER, default=options.get(CONF_MAX_BUFFER, DEFAULT_MAX_BUFFER)
+                        ): vol.All(int, vol.Range(min=512, max=1048576)),
+                        vol.Required(CONF_ARCHIVE, default=options.get(CONF_ARCHIVE, False)): bool,
+                        vol.Required(
+                            CONF_ARCHIVE_MAX_SIZE,
+                            default=options.get(CONF_ARCHIVE_MAX_SIZE, DEFAULT_ARCHIVE_MAX_SIZE),
+                        ): vol.All(int, vol.Range(min=1)),
+                        vol.Required(
+                            CONF_TRACE_SAMPLE_RATE, default=options.get(CONF_TRACE_SAMPLE_RATE, 0)
+                        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=1)),
+                        vol.Optional(CONF_TRACE_SERIALS, default=options.get(CONF_TRACE_SERIALS, "")): str,
+                        vol.Optional(CONF_RELAY_HOST, default=options.get(CONF_RELAY_HOST, "")): str,
+                        vol.Required(
+                            CONF_RELAY_PORT, default=options.get(CONF_RELAY_PORT, DEFAULT_RELAY_PORT)
+                        ): vol.All(int, vol.Range(min=1, max=65535)),
+                        vol.Required(CONF_COLLECTOR, default=options.get(CONF_COLLECTOR, False)): bool,
+                        vol.Required(
+                            CONF_COLLECTOR_PORT,
+                            default=options.get(CONF_COLLECTOR_PORT, DEFAULT_COLLECTOR_PORT),
+                        ): vol.All(int, vol.Range(min=1, max=65535)),
+                        vol.Optional(CONF_POLL_HOST, default=options.get(CONF_POLL_HOST, "")): str,
+                        vol.Required(
+                            CONF_POLL_PORT, default=options.get(CONF_POLL_PORT, DEFAULT_POLL_PORT)
+                        ): vol.All(int, vol.Range(min=1, max=65535)),
+                        vol.Required(
+                            CONF_POLL_LOGGER_SERIAL, default=options.get(CONF_POLL_LOGGER_SERIAL, 0)
+                        ): vol.All(int, vol.Range(min=0, max=0xFFFFFFFF)),
+                        vol.Optional(CONF_POLL_SERIAL, default=options.get(CONF_POLL_SERIAL, "")): str,
+                        vol.Required(
+                            CONF_POLL_INTERVAL, default=options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+                        ): vol.All(int, vol.Range(min=2, max=3600)),
+                        vol.Required(
+                            CONF_OFFLINE_AFTER, default=options.get(CONF_OFFLINE_AFTER, DEFAULT_OFFLINE_AFTER)
+                        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                        vol.Required(
+                            CONF_COALESCE_WINDOW, default=options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW)
+                        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
+                    }
                 ),
             )
 
-        return self.async_create_entry(title="", data={CONF_PORT: int(user_input[CONF_PORT])})
\ No newline at end of file
+        return self.async_create_entry(title="", data={**options, **user_input})
\ No newline at end of file
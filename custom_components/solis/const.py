@@ -1,2 +1,87 @@
 DOMAIN = "solis"
-DEFAULT_TCP_PORT = 8899
\ No newline at end of file
+DEFAULT_TCP_PORT = 8899
+
+# comma separated addresses to listen on, and ports besides the main one
+CONF_BIND_ADDRESS = "bind_address"
+CONF_EXTRA_PORTS = "extra_ports"
+DEFAULT_BIND_ADDRESS = "0.0.0.0"
+# seconds a replaced listener's connections are kept before being closed
+LISTENER_DRAIN_TIMEOUT = 600
+
+# listener connection limits
+CONF_MAX_CONNECTIONS = "max_connections"
+CONF_MAX_CONNECTIONS_PER_PEER = "max_connections_per_peer"
+CONF_IDLE_TIMEOUT = "idle_timeout"
+CONF_HANDSHAKE_TIMEOUT = "handshake_timeout"
+CONF_MAX_BUFFER = "max_buffer"
+
+DEFAULT_MAX_CONNECTIONS = 256
+DEFAULT_MAX_CONNECTIONS_PER_PEER = 4
+# seconds; loggers report every 5 minutes and send heartbeats in between
+DEFAULT_IDLE_TIMEOUT = 900
+DEFAULT_HANDSHAKE_TIMEOUT = 60
+# bytes held for a partial frame before the connection is dropped
+DEFAULT_MAX_BUFFER = 8192
+
+# raw frame archive
+CONF_ARCHIVE = "archive"
+CONF_ARCHIVE_MAX_SIZE = "archive_max_size"
+# megabytes kept on disk before the oldest segments are deleted
+DEFAULT_ARCHIVE_MAX_SIZE = 256
+# created under the Home Assistant config directory, one folder per entry
+ARCHIVE_DIR = "solis_archive"
+
+# sampled packet tracing; a sample rate of 0 disables it
+CONF_TRACE_SAMPLE_RATE = "trace_sample_rate"
+# comma separated serials to trace; empty traces every serial
+CONF_TRACE_SERIALS = "trace_serials"
+TRACE_FILE = "solis_trace_{entry_id}.jsonl"
+
+# running energy aggregates, persisted so they survive restarts
+AGGREGATES_STORAGE_VERSION = 1
+AGGREGATES_STORAGE_KEY = DOMAIN + ".{entry_id}.aggregates"
+# seconds between writes of the aggregates while frames keep arriving
+AGGREGATES_SAVE_DELAY = 60
+
+# last sample of every inverter, restored on startup
+SAMPLES_STORAGE_VERSION = 1
+SAMPLES_STORAGE_KEY = DOMAIN + ".{entry_id}.samples"
+SAMPLES_SAVE_DELAY = 60
+
+# samples can come from a separate collector process (see collector.py)
+# instead of the built-in listener; it forwards them to this local port
+CONF_COLLECTOR = "collector"
+CONF_COLLECTOR_PORT = "collector_port"
+DEFAULT_COLLECTOR_PORT = 8898
+
+# relay of raw frames to the vendor cloud; an empty host disables it
+CONF_RELAY_HOST = "relay_host"
+CONF_RELAY_PORT = "relay_port"
+DEFAULT_RELAY_PORT = 10000
+
+# active polling of a logger's local port (see poller.py); an empty host
+# disables it. V5 loggers only answer requests carrying their own serial
+CONF_POLL_HOST = "poll_host"
+CONF_POLL_PORT = "poll_port"
+CONF_POLL_LOGGER_SERIAL = "poll_logger_serial"
+# inverter serial the polled samples are filed under, to share entities
+# with pushed frames; defaults to the logger serial
+CONF_POLL_SERIAL = "poll_serial"
+CONF_POLL_INTERVAL = "poll_interval"
+DEFAULT_POLL_PORT = 8899
+# seconds between register reads
+DEFAULT_POLL_INTERVAL = 10
+
+# an inverter is offline after this many of its learned report intervals
+# pass without a sample (see staleness.py); 0 disables the check
+CONF_OFFLINE_AFTER = "offline_after"
+DEFAULT_OFFLINE_AFTER = 3
+# fired on the event bus with the serial when an inverter goes offline or
+# reports again
+EVENT_INVERTER_OFFLINE = DOMAIN + "_inverter_offline"
+EVENT_INVERTER_ONLINE = DOMAIN + "_inverter_online"
+
+# seconds samples are held so a burst of reports is applied in one go (see
+# scheduler.py); 0 applies every sample as it arrives
+CONF_COALESCE_WINDOW = "coalesce_window"
+DEFAULT_COALESCE_WINDOW = 0.5
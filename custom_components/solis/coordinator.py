@@ -8,217 +8,785 @@ and https://github.com/Rapsssito/local-solis-ginglong-inverter
 from __future__ import annotations
 
 import asyncio
-import binascii
 import logging
-import datetime
-from functools import reduce
-from struct import pack
-from typing import Optional
-
-from homeassistant.core import HomeAssistant
+from time import perf_counter_ns, time
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+from homeassistant.const import CONF_PORT
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
-
-from custom_components.solis.const import DEFAULT_TCP_PORT
-
-START_BYTE = 0xA5
-END_BYTE = 0x15
+from homeassistant.util import dt as dt_util
+
+from custom_components.solis.const import (
+    AGGREGATES_SAVE_DELAY,
+    AGGREGATES_STORAGE_KEY,
+    AGGREGATES_STORAGE_VERSION,
+    ARCHIVE_DIR,
+    CONF_ARCHIVE,
+    CONF_ARCHIVE_MAX_SIZE,
+    CONF_BIND_ADDRESS,
+    CONF_COALESCE_WINDOW,
+    CONF_COLLECTOR,
+    CONF_COLLECTOR_PORT,
+    CONF_EXTRA_PORTS,
+    CONF_HANDSHAKE_TIMEOUT,
+    CONF_IDLE_TIMEOUT,
+    CONF_MAX_BUFFER,
+    CONF_MAX_CONNECTIONS,
+    CONF_MAX_CONNECTIONS_PER_PEER,
+    CONF_OFFLINE_AFTER,
+    CONF_RELAY_HOST,
+    CONF_POLL_HOST,
+    CONF_POLL_INTERVAL,
+    CONF_POLL_LOGGER_SERIAL,
+    CONF_POLL_PORT,
+    CONF_POLL_SERIAL,
+    CONF_RELAY_PORT,
+    CONF_TRACE_SAMPLE_RATE,
+    CONF_TRACE_SERIALS,
+    DEFAULT_ARCHIVE_MAX_SIZE,
+    DEFAULT_BIND_ADDRESS,
+    DEFAULT_COALESCE_WINDOW,
+    DEFAULT_COLLECTOR_PORT,
+    DEFAULT_HANDSHAKE_TIMEOUT,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MAX_BUFFER,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_CONNECTIONS_PER_PEER,
+    DEFAULT_OFFLINE_AFTER,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_POLL_PORT,
+    DEFAULT_RELAY_PORT,
+    DEFAULT_TCP_PORT,
+    DOMAIN,
+    EVENT_INVERTER_OFFLINE,
+    EVENT_INVERTER_ONLINE,
+    LISTENER_DRAIN_TIMEOUT,
+    SAMPLES_SAVE_DELAY,
+    SAMPLES_STORAGE_KEY,
+    SAMPLES_STORAGE_VERSION,
+    TRACE_FILE,
+)
+from custom_components.solis.aggregates import EnergyAggregate
+from custom_components.solis.archive import FrameArchive
+from custom_components.solis.duplicates import DuplicateFilter
+from custom_components.solis.ingest import CollectorIngestProtocol
+from custom_components.solis.listener import ConnectionTracker, SolisTCPProtocol
+from custom_components.solis.poller import InverterPoller
+from custom_components.solis.record import Sample, field_index
+from custom_components.solis.relay import UpstreamRelay
+from custom_components.solis.scheduler import IngestScheduler
+from custom_components.solis.staleness import StalenessTracker
+from custom_components.solis.stats import ListenerStats
+from custom_components.solis.tracing import PacketTracer
 
 _LOGGER = logging.getLogger(__name__)
 
+# options async_apply_options changes without a reload
+LIVE_OPTIONS = frozenset(
+    {
+        CONF_PORT,
+        CONF_BIND_ADDRESS,
+        CONF_EXTRA_PORTS,
+        CONF_MAX_CONNECTIONS,
+        CONF_MAX_CONNECTIONS_PER_PEER,
+        CONF_IDLE_TIMEOUT,
+        CONF_HANDSHAKE_TIMEOUT,
+        CONF_MAX_BUFFER,
+        CONF_OFFLINE_AFTER,
+        CONF_COALESCE_WINDOW,
+    }
+)
+
+# sample fields read for every frame
+_SERIAL = field_index("serialno")
+_ENERGY = field_index("et_ge0")
+_POWER = field_index("current_power_apo_t1_W")
 
-def _checksum_byte(buffer: bytes) -> int:
-    return reduce(lambda lrc, x: (lrc + x) & 255, buffer) & 255
 
-class SolisTCPProtocol(asyncio.Protocol):
-    """Protocol to handle a single TCP connection and forward received data to coordinator."""
+class SolisDataUpdateCoordinator(DataUpdateCoordinator):
+    """Coordinator that owns the TCP server and current parsed data.
 
-    def __init__(self, coordinator: "SolisDataUpdateCoordinator"):
-        self.coordinator = coordinator
-        self.transport: Optional[asyncio.Transport] = None
-        self._buffer = bytearray()
+    ``data`` maps each inverter serial to its latest ``Sample``, so a
+    single listener can serve any number of loggers. Samples are diffed
+    against the previous one for the same serial and only listeners of the
+    keys that changed are called (see ``async_add_key_listener``).
+    """
 
-    def connection_made(self, transport: asyncio.Transport) -> None:
-        self.transport = transport
-        peer = transport.get_extra_info("peername")
-        _LOGGER.debug("TCP connection from %s", peer)
+    def __init__(self, hass: HomeAssistant, entry, port: int = DEFAULT_TCP_PORT):
+        super().__init__(hass, _LOGGER, name="solis_client", update_interval=None)
+        self._entry = entry
+        # keep backward-compatible default constant name — this is the TCP listen port now
+        self.port = port
+        # collector ingest server, in collector mode
+        self._ingest_server: Optional[asyncio.base_events.Server] = None
+        # logger listeners by (bind address, port); not ``_listeners``, which
+        # DataUpdateCoordinator keeps its entity listeners in
+        self._servers: dict[tuple[str, int], asyncio.base_events.Server] = {}
+        # port -> loop time at which connections of a replaced listener close
+        self._draining: dict[int, float] = {}
+        self._key_listeners: dict[tuple[str, str], list[CALLBACK_TYPE]] = {}
+
+        options = entry.options
+        # options in effect, to tell which ones a change touches
+        self._options = dict(options)
+        self.connections = ConnectionTracker(
+            max_connections=options.get(CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS),
+            max_connections_per_peer=options.get(CONF_MAX_CONNECTIONS_PER_PEER, DEFAULT_MAX_CONNECTIONS_PER_PEER),
+            idle_timeout=options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT),
+            handshake_timeout=options.get(CONF_HANDSHAKE_TIMEOUT, DEFAULT_HANDSHAKE_TIMEOUT),
+        )
+        self.max_buffer = options.get(CONF_MAX_BUFFER, DEFAULT_MAX_BUFFER)
+        # with an external collector only its batches are received, on a
+        # loopback port, and the logger port is left to the collector
+        self.collector_mode = options.get(CONF_COLLECTOR, False)
+        self.collector_port = options.get(CONF_COLLECTOR_PORT, DEFAULT_COLLECTOR_PORT)
+        # collector connection -> logger connections it reported
+        self._collectors: dict[CollectorIngestProtocol, int] = {}
+        self._diagnostics_listeners: list[CALLBACK_TYPE] = []
+        self.stats = ListenerStats()
+
+        self.tracer: Optional[PacketTracer] = None
+        sample_rate = options.get(CONF_TRACE_SAMPLE_RATE, 0)
+        if sample_rate > 0:
+            serials = [serial.strip() for serial in options.get(CONF_TRACE_SERIALS, "").split(",") if serial.strip()]
+            self.tracer = PacketTracer(
+                hass.config.path(TRACE_FILE.format(entry_id=entry.entry_id)),
+                hass.async_add_executor_job,
+                sample_rate=sample_rate,
+                serials=serials,
+            )
+        self._sweep_handle: Optional[asyncio.TimerHandle] = None
+
+        self.archive: Optional[FrameArchive] = None
+        if options.get(CONF_ARCHIVE, False):
+            self.archive = FrameArchive(
+                hass.config.path(ARCHIVE_DIR, entry.entry_id),
+                hass.async_add_executor_job,
+                max_size=options.get(CONF_ARCHIVE_MAX_SIZE, DEFAULT_ARCHIVE_MAX_SIZE) * 1024 * 1024,
+            )
 
-    def data_received(self, data: bytes) -> None:
-        # Append incoming bytes and try to decode/parse. Use ignore to avoid exceptions on bad bytes.
-        try:
-            hexdata = binascii.hexlify(data).decode()
-        except Exception:
-            _LOGGER.exception("Failed to decode TCP packet")
-            return
+        self.relay: Optional[UpstreamRelay] = None
+        relay_host = options.get(CONF_RELAY_HOST, "").strip()
+        if relay_host:
+            self.relay = UpstreamRelay(relay_host, options.get(CONF_RELAY_PORT, DEFAULT_RELAY_PORT))
+        # reads registers from a logger's local port, next to the listener
+        self.poller: Optional[InverterPoller] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        poll_host = options.get(CONF_POLL_HOST, "").strip()
+        logger_serial = options.get(CONF_POLL_LOGGER_SERIAL, 0)
+        if poll_host and logger_serial:
+            self.poller = InverterPoller(
+                self,
+                poll_host,
+                options.get(CONF_POLL_PORT, DEFAULT_POLL_PORT),
+                logger_serial,
+                options.get(CONF_POLL_SERIAL, "").strip() or str(logger_serial),
+                options.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
+            )
+        elif poll_host:
+            _LOGGER.warning("Not polling %s: the logger serial is required", poll_host)
+
+        # retransmitted frames are acknowledged but not decoded again
+        self.duplicates: Optional[DuplicateFilter] = DuplicateFilter()
+
+        # running energy/power aggregates per serial, restored on start
+        self.aggregates: dict[str, EnergyAggregate] = {}
+        # local date, advanced by the midnight rollover instead of per frame
+        self._today = dt_util.now().date()
+        self._aggregate_store = Store(
+            hass, AGGREGATES_STORAGE_VERSION, AGGREGATES_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+        self._unsub_rollover: Optional[CALLBACK_TYPE] = None
 
+        # last sample of every serial, so entities have a state right after a
+        # restart instead of waiting for the next push
+        self._sample_store = Store(
+            hass, SAMPLES_STORAGE_VERSION, SAMPLES_STORAGE_KEY.format(entry_id=entry.entry_id)
+        )
+        # serial -> wall clock time of its latest sample
+        self.sample_times: dict[str, float] = {}
+        # serials whose sample was restored from storage and not refreshed yet
+        self.restored_serials: set[str] = set()
+        # serial -> device registry id, registered once per serial
+        self.device_ids: dict[str, str] = {}
+        self._pending_saves: set[Store] = set()
+
+        # serials that stopped reporting, on one timer for the whole fleet
+        self.staleness: Optional[StalenessTracker] = None
+        offline_after = options.get(CONF_OFFLINE_AFTER, DEFAULT_OFFLINE_AFTER)
+        if offline_after > 0:
+            self.staleness = StalenessTracker(factor=offline_after)
+        self._stale_handle: Optional[asyncio.TimerHandle] = None
+
+        # holds samples briefly so a fleet's reports are written together
+        self.scheduler: Optional[IngestScheduler] = None
+        self._async_set_coalesce_window(options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW))
 
-        _LOGGER.debug("Received TCP text: %s", hexdata)
-        # if data[0] != 0x68:
-        #     _LOGGER.debug("Not what we were expecting. sending mock")
-        #     try:
-        #         response = self.coordinator._mock_server_response({}, data)
-        #         if self.transport:
-        #             self.transport.write(response)
-        #     except Exception:
-        #         _LOGGER.exception("Failed to build/send mock response")
-        # else:    
-        parsed = {}
+    async def _async_update_data(self):
+        """Return the last known data. No periodic polling; coordinator is push-driven."""
+        # DataUpdateCoordinator expects this method when async_request_refresh() is used.
+        return self.data if self.data is not None else {}
 
+    @callback
+    def async_handle_sample(
+        self, sample: Sample, received_ns: Optional[int] = None, received_at: Optional[float] = None
+    ) -> None:
+        """Account a decoded sample and store it under its serial.
+
+        ``received_ns`` is the ``perf_counter_ns()`` arrival time of the frame,
+        used to measure the delay until entity states are written. Aggregates
+        see every sample; storing it and notifying listeners waits for the
+        coalescing window, if one is set. ``received_at`` is the unix time the
+        frame arrived when that was earlier than now (collector batches); it
+        is what aggregates, sample times and staleness are accounted at.
+
+        While polling, pushed and polled samples of a serial carry different
+        fields, so each is merged into the latest one instead of replacing
+        it; otherwise every sample alternately blanks the other's fields.
+        """
+        serial = sample.value(_SERIAL)
+        if not serial:
+            self.stats.parse_failures["missing_serial"] += 1
+            _LOGGER.debug("Dropping sample without serial number")
+            return
+        if self.poller is not None:
+            previous = self.scheduler.get(serial) if self.scheduler is not None else None
+            if previous is None and self.data:
+                previous = self.data.get(serial)
+            if previous is not None:
+                sample = previous.merge(sample)
+        self.stats.samples += 1
+        now = time()
+        loop_now = self.hass.loop.time()
+        if received_at is not None and received_at < now:
+            loop_now -= now - received_at
+            now = received_at
+        aggregate = self.aggregates.get(serial)
+        if aggregate is None:
+            aggregate = self.aggregates[serial] = EnergyAggregate()
+        aggregate.update(self._today, now, sample.value(_ENERGY), sample.value(_POWER))
+        sample = sample.replace(aggregate.values())
+        self.sample_times[serial] = now
+        self.restored_serials.discard(serial)
+        staleness = self.staleness
+        if staleness is not None:
+            if staleness.seen(serial, loop_now):
+                self._async_set_online(serial, True)
+            self._async_arm_stale_timer()
+        if self.scheduler is not None:
+            self.scheduler.submit(serial, sample, received_ns)
+        else:
+            self._async_apply_sample(serial, sample, received_ns)
+
+    @callback
+    def _async_apply_sample(self, serial: str, sample: Sample, received_ns: Optional[int]) -> None:
+        self._async_schedule_save(self._aggregate_store, self._aggregates_to_store, AGGREGATES_SAVE_DELAY)
+        self._async_schedule_save(self._sample_store, self._samples_to_store, SAMPLES_SAVE_DELAY)
+        if self._async_store_sample(serial, sample) and received_ns is not None:
+            self.stats.ingest_ns.record(perf_counter_ns() - received_ns)
+
+    @callback
+    def _async_store_sample(self, serial: str, sample: Sample) -> bool:
+        """Replace the sample of ``serial``; return True if any key changed."""
+        if self.data is None:
+            self.data = {}
+        previous = self.data.get(serial)
+        self.data[serial] = sample
+        if previous is None:
+            _LOGGER.info("Discovered Solis inverter %s", serial)
+            self._async_register_device(serial, sample)
+            async_dispatcher_send(self.hass, self.signal_new_inverter, serial)
+            changed = list(sample)
+        else:
+            changed, added = sample.diff(previous)
+            if added:
+                # e.g. a firmware update or a second frame type; the sensor
+                # platform creates entities for the new fields
+                async_dispatcher_send(self.hass, self.signal_new_keys, serial)
+        if not changed:
+            return False
+        self._async_notify_keys(serial, changed)
+        return True
+
+    @callback
+    def _async_rollover_aggregates(self, now) -> None:
+        """Reset daily/monthly/yearly aggregates at local midnight.
+
+        Inverters are usually silent at night, so this keeps "today" sensors
+        from showing yesterday's values until the first frame of the day.
+        """
+        self._today = dt_util.as_local(now).date()
+        if self.scheduler is not None:
+            # queued samples carry the aggregates of the day before
+            self.scheduler.flush()
+        for serial, aggregate in self.aggregates.items():
+            if aggregate.rollover(self._today) and self.data and serial in self.data:
+                self._async_store_sample(serial, self.data[serial].replace(aggregate.values()))
+        self._async_schedule_save(self._aggregate_store, self._aggregates_to_store, AGGREGATES_SAVE_DELAY)
+
+    @callback
+    def _async_schedule_save(self, store: Store, data_func: Callable[[], dict], delay: float) -> None:
+        # async_delay_save restarts its timer on every call, which would
+        # postpone the write forever while frames keep arriving
+        if store in self._pending_saves:
+            return
+        self._pending_saves.add(store)
+
+        @callback
+        def _data_to_save() -> dict:
+            self._pending_saves.discard(store)
+            return data_func()
+
+        store.async_delay_save(_data_to_save, delay)
+
+    @callback
+    def _aggregates_to_store(self) -> dict:
+        return {serial: aggregate.as_dict() for serial, aggregate in self.aggregates.items()}
+
+    @callback
+    def _samples_to_store(self) -> dict:
+        return {
+            serial: {
+                "received": self.sample_times.get(serial),
+                "interval": self.staleness.interval(serial) if self.staleness is not None else None,
+                "sample": dict(sample),
+            }
+            for serial, sample in (self.data or {}).items()
+        }
+
+    async def _async_restore_aggregates(self) -> None:
         try:
-            # this is the packet size. if you have a different version
-            # feel free to extend here
-            if len(hexdata) == 206:
-                serial = str(binascii.unhexlify(hexdata[30:62]), "ascii").strip()
-                inv_t0 = float(int(hexdata[62:66], 16)) / 10
-                dv1 = int(hexdata[66:70], 16) / 10
-                dv2 = int(hexdata[70:74], 16) / 10
-                
-                # DYNAMIC ANCHORS (To prevent data sliding)
-                m_pos = hexdata.find("13", 100) # Frequency Marker
-                f_pos = hexdata.find("ffff")    # Footer Marker
-                
-                # a_fo1 = float(int(hexdata[114:118], 16)) / 100
-                # aPo_t1 = float(int(hexdata[118:122], 16))
-                # et_ge0 = float(int(hexdata[142:150], 16))/10
-                # hr_ege_t1 = float((int(hexdata[154:156],16) << 8) | int(hexdata[156:158],16))
-                # EXTRACT AC DATA (Using Frequency Anchor)
-                if m_pos != -1:
-                    if m_pos % 2 != 0: m_pos -= 1
-                    # AC Voltage (12 chars before 13xx)
-                    av1 = int(hexdata[m_pos-12:m_pos-8], 16) / 10
-                    # Frequency
-                    a_fo1 = float(int(hexdata[m_pos:m_pos+4], 16)) / 100
-                    # Current Power
-                    aPo_t1 = float(int(hexdata[m_pos+4:m_pos+8], 16))
-                else:
-                    av1 = a_fo1 = aPo_t1 = 0.0
-
-                # EXTRACT PRODUCTION DATA (Using Footer Anchor)
-                if f_pos != -1:
-                    # Total Energy (28 chars before ffff)
-                    et_ge0 = float(int(hexdata[f_pos-28:f_pos-20], 16)) / 10
-                    # Total Hours (20 chars before ffff)
-                    hr_ege_t1 = float(int(hexdata[f_pos-20:f_pos-12], 16))
-                    # Inverter Status (12 chars before ffff)
-                    inv_st1 = int(hexdata[f_pos-12:f_pos-8], 16)
-                else:
-                    et_ge0 = hr_ege_t1 = inv_st1 = 0.0
-
-                # CALCULATE ESTIMATED DC VALUES (For HA Dashboards)
-                # Assumes ~97% efficiency to guess DC side metrics
-                total_dc_power = aPo_t1 / 0.97
-                v_total = dv1 + dv2
-                if v_total > 0:
-                    dp1 = round((dv1 / v_total) * total_dc_power, 2)
-                    dp2 = round((dv2 / v_total) * total_dc_power, 2)
-                    dc1 = round(dp1 / dv1, 2) if dv1 > 0 else 0.0
-                    dc2 = round(dp2 / dv2, 2) if dv2 > 0 else 0.0
-                else:
-                    dp1 = dp2 = dc1 = dc2 = 0.0
-
-                
-                parsed["serialno"] = serial
-                parsed["inv_t0"] = inv_t0
-                parsed["dv1"] = dv1
-                parsed["dv2"] = dv2
-                parsed["av1"] = av1
-                parsed["a_fo1"] = a_fo1
-                parsed["current_power_apo_t1_W"] = aPo_t1
-                parsed["et_ge0"] = et_ge0
-                parsed["hr_ege_t1"] = hr_ege_t1
-                parsed["inverter_status"] = inv_st1
-                parsed["dc1_current"] = dc1
-                parsed["dc2_current"] = dc2
-                parsed["dp1_power"] = dp1
-                parsed["dp2_power"] = dp2
-
-                # serial_start = 30
-                # serial_len = 32
-
-                # pos = serial_start + serial_len + 4
-                                
-            else:
-                _LOGGER.debug("Unexpected packet size: %d", len(hexdata))
-                return
+            stored = await self._aggregate_store.async_load()
         except Exception:
-            _LOGGER.debug("Failed to parse hex payload", exc_info=True)
+            _LOGGER.exception("Failed to load stored energy aggregates")
+            return
+        for serial, data in (stored or {}).items():
+            try:
+                self.aggregates[serial] = EnergyAggregate.from_dict(data)
+            except (TypeError, ValueError, KeyError):
+                _LOGGER.warning("Ignoring invalid stored aggregates for %s", serial)
 
-        # update coordinator data so entities receive the new parsed payload
+    async def _async_restore_samples(self) -> None:
+        """Rehydrate ``data`` with the last stored sample of every serial."""
         try:
-            _LOGGER.debug("Setting updated data on coordinator: %s", parsed)
-            result = self.coordinator.async_set_updated_data(parsed)
-            # if the coordinator method returned a coroutine, schedule it
-            if asyncio.iscoroutine(result):
-                asyncio.create_task(result)
+            stored = await self._sample_store.async_load()
         except Exception:
-            _LOGGER.exception("Failed to set updated data on coordinator")
-
-    def connection_lost(self, exc: Optional[Exception]) -> None:
-        if exc:
-            _LOGGER.debug("TCP connection lost with error: %s", exc)
+            _LOGGER.exception("Failed to load stored samples")
+            return
+        if not stored:
+            return
+        data = {}
+        for serial, cached in stored.items():
+            stored_sample = cached.get("sample") if isinstance(cached, dict) else None
+            if not stored_sample or not isinstance(stored_sample, dict):
+                continue
+            sample = Sample.from_mapping(stored_sample)
+            aggregate = self.aggregates.get(serial)
+            if aggregate is not None:
+                # the cached values may be from before a day/month boundary
+                aggregate.rollover(self._today)
+                sample = sample.replace(aggregate.values())
+            data[serial] = sample
+            if cached.get("received") is not None:
+                self.sample_times[serial] = cached["received"]
+            self.restored_serials.add(serial)
+            self._async_register_device(serial, sample)
+            if self.staleness is not None:
+                # a restored inverter gets the usual time to report again
+                interval = cached.get("interval")
+                self.staleness.restore(
+                    serial, self.hass.loop.time(), interval if isinstance(interval, (int, float)) else None
+                )
+        self.data = data
+        _LOGGER.debug("Restored last samples of %d inverters", len(data))
+
+    @callback
+    def _async_register_device(self, serial: str, sample: Sample) -> None:
+        """Create or update the device of ``serial`` once and cache its id.
+
+        Entities only reference the device by identifier, so adding them
+        does not write the device registry again. The id is passed along
+        with the online/offline events for device triggers.
+        """
+        if serial in self.device_ids:
+            return
+        device = dr.async_get(self.hass).async_get_or_create(
+            config_entry_id=self._entry.entry_id,
+            identifiers={(DOMAIN, serial)},
+            name=sample.get("device_name") or sample.get("name") or f"Solis {serial}",
+            manufacturer="Solis",
+            model=sample.get("model"),
+        )
+        self.device_ids[serial] = device.id
+
+    @callback
+    def _async_arm_stale_timer(self) -> None:
+        # one timer for all serials, moved only when the earliest deadline does
+        deadline = self.staleness.next_deadline
+        handle = self._stale_handle
+        if deadline is None or (handle is not None and handle.when() <= deadline):
+            return
+        if handle is not None:
+            handle.cancel()
+        self._stale_handle = self.hass.loop.call_at(deadline, self._async_check_stale)
+
+    @callback
+    def _async_check_stale(self) -> None:
+        self._stale_handle = None
+        for serial in self.staleness.expire(self.hass.loop.time()):
+            self._async_set_online(serial, False)
+        self._async_arm_stale_timer()
+
+    @callback
+    def _async_set_online(self, serial: str, online: bool) -> None:
+        interval = self.staleness.interval(serial)
+        last_seen = self.sample_times.get(serial)
+        if online:
+            _LOGGER.info("Solis inverter %s is reporting again", serial)
         else:
-            _LOGGER.debug("TCP connection closed")
+            _LOGGER.info("Solis inverter %s stopped reporting", serial)
+        self.hass.bus.async_fire(
+            EVENT_INVERTER_ONLINE if online else EVENT_INVERTER_OFFLINE,
+            {
+                "serial": serial,
+                "device_id": self.device_ids.get(serial),
+                "last_seen": dt_util.utc_from_timestamp(last_seen).isoformat() if last_seen is not None else None,
+                "expected_interval": round(interval) if interval is not None else None,
+            },
+        )
+        # every entity of the serial changes availability
+        sample = (self.data or {}).get(serial)
+        if sample is not None:
+            self._async_notify_keys(serial, sample)
+
+    @callback
+    def is_online(self, serial: str) -> bool:
+        """Whether ``serial`` reported within its expected interval."""
+        return self.staleness is None or self.staleness.online(serial)
+
+    @callback
+    def _async_notify_keys(self, serial: str, keys: Iterable[str]) -> None:
+        # an entity reading several keys is only called once per sample
+        callbacks: dict[CALLBACK_TYPE, None] = {}
+        for key in keys:
+            for update_callback in self._key_listeners.get((serial, key), ()):
+                callbacks[update_callback] = None
+        for update_callback in callbacks:
+            update_callback()
+
+    @callback
+    def async_add_key_listener(
+        self, serial: str, keys: Iterable[str], update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call ``update_callback`` when any of ``keys`` changes for ``serial``.
+
+        Returns a function that removes the listener.
+        """
+        registered = [(serial, key) for key in keys]
+        for registration in registered:
+            self._key_listeners.setdefault(registration, []).append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            for registration in registered:
+                listeners = self._key_listeners.get(registration)
+                if listeners and update_callback in listeners:
+                    listeners.remove(update_callback)
+                    if not listeners:
+                        del self._key_listeners[registration]
+
+        return remove_listener
+
+    @property
+    def connection_count(self) -> int:
+        """Number of logger connections currently open."""
+        return len(self.connections) + sum(self._collectors.values())
+
+    @callback
+    def async_register_connection(self, protocol: SolisTCPProtocol) -> bool:
+        """Admit a new connection, or return False if a limit is reached."""
+        if not self.connections.add(protocol):
+            return False
+        self._async_notify_diagnostics()
+        return True
+
+    @callback
+    def async_unregister_connection(self, protocol: SolisTCPProtocol) -> None:
+        self.connections.discard(protocol)
+        self._async_notify_diagnostics()
+
+    @callback
+    def async_register_collector(self, protocol: CollectorIngestProtocol) -> None:
+        self._collectors[protocol] = 0
+
+    @callback
+    def async_handle_batch(self, protocol: CollectorIngestProtocol, batch: dict) -> None:
+        """Apply a batch of samples and counters forwarded by a collector worker."""
+        stats = self.stats
+        stats.frames += batch.get("frames", 0)
+        stats.bytes += batch.get("bytes", 0)
+        stats.rejected += batch.get("rejected", 0)
+        stats.duplicates += batch.get("duplicates", 0)
+        stats.parse_failures.update(batch.get("parse_failures") or {})
+        connections = batch.get("connections", 0)
+        if self._collectors.get(protocol) != connections:
+            self._collectors[protocol] = connections
+            self._async_notify_diagnostics()
+        now, now_ns = time(), perf_counter_ns()
+        for received, sample in batch.get("samples") or ():
+            # arrival at the collector, on this process's clock
+            self.async_handle_sample(
+                Sample.from_mapping(sample), now_ns - int((now - received) * 1e9), received
+            )
 
+    @callback
+    def async_unregister_collector(self, protocol: CollectorIngestProtocol) -> None:
+        if self._collectors.pop(protocol, None):
+            self._async_notify_diagnostics()
 
-class SolisDataUpdateCoordinator(DataUpdateCoordinator):
-    """Coordinator that owns the TCP server and current parsed data."""
+    @callback
+    def async_add_diagnostics_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call ``update_callback`` when listener diagnostics change."""
+        self._diagnostics_listeners.append(update_callback)
 
-    def __init__(self, hass: HomeAssistant, entry, port: int = DEFAULT_TCP_PORT):
-        super().__init__(hass, _LOGGER, name="solis_client", update_interval=None)
-        self._entry = entry
-        # keep backward-compatible default constant name — this is the TCP listen port now
-        self.port = port
-        self._server: Optional[asyncio.base_events.Server] = None
+        @callback
+        def remove_listener() -> None:
+            if update_callback in self._diagnostics_listeners:
+                self._diagnostics_listeners.remove(update_callback)
 
-    async def _async_update_data(self):
-        """Return the last known data. No periodic polling; coordinator is push-driven."""
-        # DataUpdateCoordinator expects this method when async_request_refresh() is used.
-        return self.data if self.data is not None else {}
+        return remove_listener
+
+    @callback
+    def _async_notify_diagnostics(self) -> None:
+        for update_callback in list(self._diagnostics_listeners):
+            update_callback()
+
+    @property
+    def signal_new_inverter(self) -> str:
+        """Dispatcher signal fired with the serial of each newly seen inverter."""
+        return f"{DOMAIN}_{self._entry.entry_id}_new_inverter"
+
+    @property
+    def signal_new_keys(self) -> str:
+        """Dispatcher signal fired with a serial whose samples gained new keys."""
+        return f"{DOMAIN}_{self._entry.entry_id}_new_keys"
 
     async def async_start(self) -> None:
         """Start listening on TCP port."""
-        loop = asyncio.get_running_loop()
-        try:
-            server = await loop.create_server(
-                lambda: SolisTCPProtocol(self),
-                host="0.0.0.0",
-                port=self.port,
+        await self._async_restore_aggregates()
+        await self._async_restore_samples()
+        if self.staleness is not None:
+            self._async_arm_stale_timer()
+        self._unsub_rollover = async_track_time_change(
+            self.hass, self._async_rollover_aggregates, hour=0, minute=0, second=0
+        )
+        if self.poller is not None:
+            self._poll_task = self.hass.async_create_background_task(
+                self.poller.async_run(), "solis logger poller"
             )
-            self._server = server
-            _LOGGER.info("Listening for Solis TCP connections on port %s", self.port)
-        except Exception:
-            _LOGGER.exception("Failed to open TCP listener on port %s", self.port)
-            raise
-
-    async def async_stop(self) -> None:
-        """Stop listening / close server."""
-        if self._server:
-            self._server.close()
+        loop = asyncio.get_running_loop()
+        if self.collector_mode:
             try:
-                await self._server.wait_closed()
+                self._ingest_server = await loop.create_server(
+                    lambda: CollectorIngestProtocol(self),
+                    host="127.0.0.1",
+                    port=self.collector_port,
+                )
             except Exception:
-                _LOGGER.exception("Error while waiting for TCP server to close")
-            self._server = None
-            _LOGGER.info("Stopped Solis TCP listener")
-            
-    def _mock_server_response(self, header: Optional[dict] = None, request_payload: bytes = b"") -> bytes:
-        """Build a mock response for unexpected incoming packets.
+                _LOGGER.exception("Failed to open collector port %s", self.collector_port)
+                raise
+            _LOGGER.info("Waiting for Solis collector batches on port %s", self.collector_port)
+            return
+        failed = await self._async_listen(self._listen_addresses(self._options, self.port))
+        if failed:
+            for server in self._servers.values():
+                server.close()
+            self._servers.clear()
+            raise failed[0]
+        self._schedule_sweep()
+        if self.tracer is not None:
+            self.tracer.start(
+                lambda target: self.hass.async_create_background_task(target, "solis packet trace writer")
+            )
 
-        This is defensive: missing header fields are supplied with sensible defaults.
+    @callback
+    def _async_set_coalesce_window(self, window: float) -> None:
+        if window <= 0:
+            if self.scheduler is not None:
+                self.scheduler.flush()
+                self.scheduler = None
+        elif self.scheduler is None:
+            self.scheduler = IngestScheduler(self.hass.loop, window, self._async_apply_sample, self.stats)
+        else:
+            self.scheduler.window = window
+
+    @staticmethod
+    def _listen_addresses(options: Mapping[str, Any], port: int) -> list[tuple[str, int]]:
+        hosts = [host.strip() for host in options.get(CONF_BIND_ADDRESS, "").split(",") if host.strip()]
+        ports = [port]
+        for extra in options.get(CONF_EXTRA_PORTS, "").split(","):
+            extra = extra.strip()
+            if extra.isdigit() and int(extra) not in ports:
+                ports.append(int(extra))
+        return [(host, port) for host in hosts or [DEFAULT_BIND_ADDRESS] for port in ports]
+
+    async def _async_listen(self, addresses: list[tuple[str, int]]) -> list[OSError]:
+        """Listen on ``addresses`` and drain the listeners not among them.
+
+        New listeners are opened before old ones are closed, so loggers can
+        connect throughout. Returns the errors of listeners that could not
+        be opened; the listeners they were to replace are kept then.
         """
-        header = header or {}
-        unix_time = int(datetime.datetime.now(tz=datetime.UTC).timestamp())
-
-        first_byte = request_payload[0] if request_payload else 0x00
-        payload = pack("<BBIBBBB", first_byte, 0x01, unix_time, 0xAA, 0xAA, 0x00, 0x00)
-
-        msg_type = int(header.get("msg_type", 0x30))
-        req_idx = int(header.get("req_idx", 0))
-        serialno = int(header.get("serialno", 0))
-
-        resp_type = (msg_type - 0x30) & 0xFF
-        header_bytes = pack(
-            "<BHBBBBI", START_BYTE, len(payload), 0x10, resp_type, req_idx, req_idx, serialno
+        loop = self.hass.loop
+        removed = [address for address in self._servers if address not in addresses]
+        failed = []
+        for address in addresses:
+            if address in self._servers:
+                continue
+            for old in removed:
+                if old[1] == address[1] and old in self._servers:
+                    # the port only frees up for another bind address once
+                    # the old listener is closed
+                    self._async_drain(old)
+            host, port = address
+            try:
+                self._servers[address] = await loop.create_server(
+                    lambda: SolisTCPProtocol(self), host=host, port=port
+                )
+            except OSError as err:
+                _LOGGER.error("Failed to open TCP listener on %s:%s: %s", host, port, err)
+                failed.append(err)
+                continue
+            _LOGGER.info("Listening for Solis TCP connections on %s:%s", host, port)
+        if not failed:
+            for old in removed:
+                if old in self._servers:
+                    self._async_drain(old)
+        return failed
+
+    @callback
+    def _async_drain(self, address: tuple[str, int]) -> None:
+        # stop accepting; open connections keep delivering until they close
+        # or the drain timeout passes (see _sweep_connections)
+        self._servers.pop(address).close()
+        self._draining[address[1]] = self.hass.loop.time() + LISTENER_DRAIN_TIMEOUT
+        _LOGGER.info("Stopped accepting Solis TCP connections on %s:%s", *address)
+
+    @property
+    def addresses(self) -> list[tuple[str, int]]:
+        """The bound addresses of the logger listeners."""
+        return [socket.getsockname()[:2] for server in self._servers.values() for socket in server.sockets]
+
+    async def async_apply_options(self, options: Mapping[str, Any]) -> bool:
+        """Apply changed options in place, if they allow it.
+
+        Listener addresses, connection limits, the offline threshold and the
+        coalescing window change without dropping connections, samples or entities. Returns
+        False if another option changed or a new listener could not be opened,
+        and the entry has to be reloaded.
+        """
+        changed = {key for key in {*options, *self._options} if options.get(key) != self._options.get(key)}
+        if not changed <= LIVE_OPTIONS:
+            return False
+        offline_after = options.get(CONF_OFFLINE_AFTER, DEFAULT_OFFLINE_AFTER)
+        if CONF_OFFLINE_AFTER in changed and (self.staleness is None or offline_after <= 0):
+            # turning the check on or off changes entity availability
+            return False
+        port = options.get(CONF_PORT, DEFAULT_TCP_PORT)
+        if self._sweep_handle is not None:
+            failed = await self._async_listen(self._listen_addresses(options, port))
+            if failed:
+                # as when starting: the reload reports the error instead of
+                # carrying on with options that are not in effect
+                _LOGGER.warning("Reloading to apply the listener options: %s", failed[0])
+                return False
+        # only now that the listeners are in place
+        self._options = dict(options)
+        self.port = port
+        if self.staleness is not None:
+            self.staleness.factor = offline_after
+        self._async_set_coalesce_window(options.get(CONF_COALESCE_WINDOW, DEFAULT_COALESCE_WINDOW))
+
+        connections = self.connections
+        connections.max_connections = options.get(CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS)
+        connections.max_connections_per_peer = options.get(
+            CONF_MAX_CONNECTIONS_PER_PEER, DEFAULT_MAX_CONNECTIONS_PER_PEER
         )
-        message = header_bytes + payload
-        message += pack("BB", _checksum_byte(message[1:]), END_BYTE)
-        return message
\ No newline at end of file
+        connections.idle_timeout = options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+        connections.handshake_timeout = options.get(CONF_HANDSHAKE_TIMEOUT, DEFAULT_HANDSHAKE_TIMEOUT)
+        self.max_buffer = options.get(CONF_MAX_BUFFER, DEFAULT_MAX_BUFFER)
+        if self._sweep_handle is not None:
+            # the timeouts set the sweep interval
+            self._sweep_handle.cancel()
+            self._schedule_sweep()
+        _LOGGER.debug("Applied changed options %s", sorted(changed))
+        self._async_notify_diagnostics()
+        return True
+
+    def _schedule_sweep(self) -> None:
+        self._sweep_handle = self.hass.loop.call_later(self.connections.sweep_interval, self._sweep_connections)
+
+    @callback
+    def _sweep_connections(self) -> None:
+        now = self.hass.loop.time()
+        self.connections.sweep(now)
+        if self._draining:
+            expired = {port for port, deadline in self._draining.items() if deadline <= now}
+            for port in expired:
+                del self._draining[port]
+            # unless the port was opened again on another address
+            expired.difference_update(port for _, port in self._servers)
+            if expired:
+                self.connections.abort_on_ports(expired)
+        self._schedule_sweep()
+
+    async def async_stop(self) -> None:
+        """Stop listening / close server."""
+        if self._sweep_handle is not None:
+            self._sweep_handle.cancel()
+            self._sweep_handle = None
+        if self._stale_handle is not None:
+            self._stale_handle.cancel()
+            self._stale_handle = None
+        if self._unsub_rollover is not None:
+            self._unsub_rollover()
+            self._unsub_rollover = None
+        servers = list(self._servers.values())
+        if self._ingest_server is not None:
+            servers.append(self._ingest_server)
+        if servers:
+            for server in servers:
+                server.close()
+            # drop logger connections too, otherwise wait_closed() waits for them
+            self.connections.abort_all()
+            for protocol in list(self._collectors):
+                if protocol.transport is not None:
+                    protocol.transport.abort()
+            for server in servers:
+                try:
+                    await server.wait_closed()
+                except Exception:
+                    _LOGGER.exception("Error while waiting for TCP server to close")
+            self._servers.clear()
+            self._draining.clear()
+            self._ingest_server = None
+            _LOGGER.info("Stopped Solis TCP listener")
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+        if self.scheduler is not None:
+            # so the samples saved below are the latest
+            self.scheduler.flush()
+        if self.relay is not None:
+            self.relay.close()
+        if self.archive is not None:
+            await self.archive.async_close()
+        if self.tracer is not None:
+            await self.tracer.async_stop()
+        await self._aggregate_store.async_save(self._aggregates_to_store())
+        await self._sample_store.async_save(self._samples_to_store())
@@ -0,0 +1,72 @@
+"""Diagnostics support for Solis Client."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_BIND_ADDRESS,
+    CONF_POLL_HOST,
+    CONF_POLL_LOGGER_SERIAL,
+    CONF_POLL_SERIAL,
+    CONF_RELAY_HOST,
+    CONF_TRACE_SERIALS,
+    DOMAIN,
+)
+from .coordinator import SolisDataUpdateCoordinator
+
+# serial numbers and network addresses, wherever they appear
+TO_REDACT = {
+    "serialno",
+    CONF_BIND_ADDRESS,
+    CONF_POLL_HOST,
+    CONF_POLL_LOGGER_SERIAL,
+    CONF_POLL_SERIAL,
+    CONF_RELAY_HOST,
+    CONF_TRACE_SERIALS,
+    "listening",
+    "upstream",
+    "logger",
+}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return listener counters and the latest sample of every inverter."""
+    coordinator: SolisDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+    diagnostics = {
+        "options": dict(entry.options),
+        "listener": {
+            "port": coordinator.port,
+            "listening": [f"{host}:{port}" for host, port in coordinator.addresses],
+            "collector_port": coordinator.collector_port if coordinator.collector_mode else None,
+            "connections": coordinator.connection_count,
+            "inverters": len(coordinator.data or {}),
+            # seconds samples may wait before they are applied
+            "coalesce_window": coordinator.scheduler.window if coordinator.scheduler is not None else 0,
+        },
+        "stats": coordinator.stats.as_dict(),
+        "relay": coordinator.relay.as_dict() if coordinator.relay is not None else None,
+        "poller": coordinator.poller.as_dict() if coordinator.poller is not None else None,
+        "samples": [
+            {
+                "received": _isoformat(coordinator.sample_times.get(serial)),
+                "restored": serial in coordinator.restored_serials,
+                "online": coordinator.is_online(serial),
+                "expected_interval": (
+                    coordinator.staleness.interval(serial) if coordinator.staleness is not None else None
+                ),
+                "sample": dict(sample),
+            }
+            for serial, sample in (coordinator.data or {}).items()
+        ],
+    }
+    return async_redact_data(diagnostics, TO_REDACT)
+
+
+def _isoformat(timestamp: float | None) -> str | None:
+    return dt_util.utc_from_timestamp(timestamp).isoformat() if timestamp is not None else None
@@ -0,0 +1,45 @@
+"""LRU of recently seen frames, so retransmissions are acked but not decoded again."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Optional
+from zlib import crc32
+
+from custom_components.solis.frame import START_BYTE, logger_serial
+
+DEFAULT_SIZE = 4096
+DEFAULT_WINDOW = 60.0
+
+# offset of the request sequence number in a V5 header
+_V5_SEQUENCE = 5
+
+
+class DuplicateFilter:
+    """Bounded LRU of recently seen frames."""
+
+    __slots__ = ("size", "window", "_seen")
+
+    def __init__(self, size: int = DEFAULT_SIZE, window: float = DEFAULT_WINDOW):
+        self.size = size
+        self.window = window
+        self._seen: OrderedDict[tuple[Optional[int], Optional[int], int], float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def seen(self, buffer, offset: int, size: int, now: float) -> bool:
+        """Record the frame at ``offset`` and return whether it is a repeat."""
+        if buffer[offset] == START_BYTE:
+            key = (logger_serial(buffer, offset), buffer[offset + _V5_SEQUENCE], crc32(buffer[offset : offset + size]))
+        else:
+            key = (None, None, crc32(buffer[offset : offset + size]))
+        seen = self._seen
+        last = seen.get(key)
+        seen[key] = now
+        if last is not None:
+            seen.move_to_end(key)
+            return now - last < self.window
+        if len(seen) > self.size:
+            seen.popitem(last=False)
+        return False
@@ -0,0 +1,206 @@
+"""
+Framing for Solis/Ginlong logger streams.
+
+Ginlong "legacy" frames: ``0x68 <len:u8> ... <checksum> 0x16`` (``len`` + 14 bytes).
+Solarman V5 frames: ``0xA5 <len:u16 le> ... <checksum> 0x15`` (``len`` + 13 bytes).
+"""
+
+from __future__ import annotations
+
+import time
+from struct import Struct
+from typing import Optional
+from zlib import adler32
+
+START_BYTE = 0xA5
+END_BYTE = 0x15
+
+LEGACY_START_BYTE = 0x68
+LEGACY_END_BYTE = 0x16
+
+# frame overhead that is not counted by the length field
+V5_OVERHEAD = 13
+LEGACY_OVERHEAD = 14
+
+_V5_LENGTH = Struct("<H")
+_V5_CONTROL = Struct("<H")
+_LEGACY_CONTROL = Struct(">H")
+# bytes summed per Adler-32 call: 256 * 255 stays below its modulus
+_CHECKSUM_CHUNK = 256
+
+# start, payload length, control code, sequence (request, response), logger serial
+V5_HEADER = Struct("<BHHBBI")
+
+# V5 control codes sent by the logger; the server answers with code - 0x3000
+CONTROL_HELLO = 0x4110
+CONTROL_DATA = 0x4210
+CONTROL_INFO = 0x4310
+CONTROL_HEARTBEAT = 0x4710
+CONTROL_REPORT = 0x4810
+ACKED_CONTROL_CODES = (CONTROL_HELLO, CONTROL_DATA, CONTROL_INFO, CONTROL_HEARTBEAT, CONTROL_REPORT)
+
+# requests sent to a logger's local port (wrapping a Modbus RTU message)
+# and the logger's replies
+CONTROL_REQUEST = 0x4510
+CONTROL_RESPONSE = 0x1510
+# frame type, sensor type, total working time, power on time, offset time
+_REQUEST_PAYLOAD = Struct("<BHIII")
+# frame type, status, total working time, power on time, offset time
+RESPONSE_PAYLOAD_SIZE = 14
+_FRAME_TYPE_INVERTER = 0x02
+
+# frame type, status, unix time, then a fixed trailer
+_ACK_PAYLOAD = Struct("<BBI4s")
+_ACK_TRAILER = b"\xaa\xaa\x00\x00"
+ACK_SIZE = V5_HEADER.size + _ACK_PAYLOAD.size + 2
+
+# the largest frame a logger plausibly sends: the V5 length field allows
+# 64 KiB, but data frames and Modbus replies stay within a few hundred bytes
+MAX_FRAME_SIZE = 1024 + V5_OVERHEAD
+
+
+def frame_size(buffer, offset: int) -> Optional[int]:
+    """Return the full size of the frame starting at ``offset``.
+
+    Returns ``None`` when not enough bytes have arrived to read the length
+    field yet, and ``0`` when ``offset`` does not point at a start byte.
+    """
+    start = buffer[offset]
+    if start == LEGACY_START_BYTE:
+        if len(buffer) - offset < 2:
+            return None
+        return buffer[offset + 1] + LEGACY_OVERHEAD
+    if start == START_BYTE:
+        if len(buffer) - offset < 3:
+            return None
+        return _V5_LENGTH.unpack_from(buffer, offset + 1)[0] + V5_OVERHEAD
+    return 0
+
+
+def checksum(buffer) -> int:
+    """Sum of ``buffer`` modulo 256, as used by both frame families."""
+    # the low half of an Adler-32 started at 0 is the plain byte sum (mod
+    # 65521), which zlib computes far faster than sum(); chunks are small
+    # enough that the sum never wraps
+    total = 0
+    for start in range(0, len(buffer), _CHECKSUM_CHUNK):
+        total += adler32(buffer[start : start + _CHECKSUM_CHUNK], 0) & 0xFFFF
+    return total & 0xFF
+
+
+def frame_valid(buffer, offset: int, size: int) -> bool:
+    """Check the checksum of the complete frame at ``offset``.
+
+    Covers everything between the start byte and the checksum; the end byte
+    is already checked by ``split_frames``.
+    """
+    return checksum(buffer[offset + 1 : offset + size - 2]) == buffer[offset + size - 2]
+
+
+def _ack_template(control: int) -> bytes:
+    template = bytearray(ACK_SIZE)
+    V5_HEADER.pack_into(template, 0, START_BYTE, _ACK_PAYLOAD.size, control - 0x3000, 0, 0, 0)
+    _ACK_PAYLOAD.pack_into(template, V5_HEADER.size, 0, 0x01, 0, _ACK_TRAILER)
+    template[-1] = END_BYTE
+    return bytes(template)
+
+
+# one pre-built response per acknowledged control code; only the sequence,
+# serial, frame type, time and checksum are filled in per frame
+_ACK_TEMPLATES = {control: _ack_template(control) for control in ACKED_CONTROL_CODES}
+_ACK_SEQUENCE = Struct("<BBI")
+_ACK_TIME = Struct("<I")
+_ACK_TIME_OFFSET = V5_HEADER.size + 2
+
+
+def build_ack(buffer, offset: int, now: Optional[float] = None) -> Optional[bytes]:
+    """Return the server response for the V5 frame at ``offset``.
+
+    Returns ``None`` for frames that are not V5 or need no acknowledgement.
+    """
+    if buffer[offset] != START_BYTE:
+        return None
+    _, length, control, sequence, _, serial = V5_HEADER.unpack_from(buffer, offset)
+    template = _ACK_TEMPLATES.get(control)
+    if template is None:
+        return None
+    response = bytearray(template)
+    # echo the logger's sequence number and serial
+    _ACK_SEQUENCE.pack_into(response, 5, sequence, sequence, serial)
+    response[V5_HEADER.size] = buffer[offset + V5_HEADER.size] if length else 0
+    _ACK_TIME.pack_into(response, _ACK_TIME_OFFSET, int(time.time() if now is None else now))
+    response[-2] = checksum(memoryview(response)[1:-2])
+    return bytes(response)
+
+
+def logger_serial(buffer, offset: int) -> Optional[int]:
+    """Return the logger serial from a V5 header, or ``None`` for legacy frames."""
+    if buffer[offset] != START_BYTE:
+        return None
+    return V5_HEADER.unpack_from(buffer, offset)[5]
+
+
+def control_code(buffer, offset: int) -> int:
+    """Return the control code of the complete frame starting at ``offset``."""
+    if buffer[offset] == LEGACY_START_BYTE:
+        return _LEGACY_CONTROL.unpack_from(buffer, offset + 2)[0]
+    return _V5_CONTROL.unpack_from(buffer, offset + 3)[0]
+
+
+def end_byte_for(start: int) -> int:
+    return LEGACY_END_BYTE if start == LEGACY_START_BYTE else END_BYTE
+
+
+def split_frames(buffer: bytearray) -> tuple[list[tuple[int, int]], int]:
+    """Locate complete frames in ``buffer``.
+
+    Returns a list of ``(offset, size)`` pairs and the number of leading bytes
+    that can be discarded (complete frames plus any garbage skipped while
+    resynchronising). Bytes of a trailing partial frame are kept.
+    """
+    frames: list[tuple[int, int]] = []
+    offset = 0
+    end = len(buffer)
+    while offset < end:
+        size = frame_size(buffer, offset)
+        if size is None:
+            break
+        if size == 0:
+            # not a start byte: skip ahead to the next candidate
+            legacy = buffer.find(LEGACY_START_BYTE, offset + 1)
+            v5 = buffer.find(START_BYTE, offset + 1)
+            candidates = [pos for pos in (legacy, v5) if pos != -1]
+            offset = min(candidates) if candidates else end
+            continue
+        if size > MAX_FRAME_SIZE:
+            # a stray start byte followed by a huge length would stall the
+            # stream until that many bytes arrived; resync straight away
+            offset += 1
+            continue
+        if offset + size > end:
+            break
+        if buffer[offset + size - 1] != end_byte_for(buffer[offset]):
+            # length field pointed at the wrong place; the start byte was
+            # probably payload data. Resync one byte further.
+            offset += 1
+            continue
+        frames.append((offset, size))
+        offset += size
+    return frames, offset
+
+
+def build_request(logger: int, sequence: int, message: bytes) -> bytes:
+    """Wrap a Modbus RTU ``message`` in a V5 request for logger ``logger``."""
+    length = _REQUEST_PAYLOAD.size + len(message)
+    request = bytearray(V5_HEADER.size + length + 2)
+    V5_HEADER.pack_into(request, 0, START_BYTE, length, CONTROL_REQUEST, sequence & 0xFF, 0, logger)
+    _REQUEST_PAYLOAD.pack_into(request, V5_HEADER.size, _FRAME_TYPE_INVERTER, 0, 0, 0, 0)
+    request[V5_HEADER.size + _REQUEST_PAYLOAD.size : -2] = message
+    request[-2] = checksum(memoryview(request)[1:-2])
+    request[-1] = END_BYTE
+    return bytes(request)
+
+
+def response_message(buffer, offset: int, size: int):
+    """Return the Modbus RTU message inside the V5 response at ``offset``."""
+    return buffer[offset + V5_HEADER.size + RESPONSE_PAYLOAD_SIZE : offset + size - 2]
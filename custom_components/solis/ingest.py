@@ -0,0 +1,82 @@
+"""
+Batches forwarded by the standalone collector.
+
+A batch is a length-prefixed JSON object::
+
+    {"samples": [[received, sample], ...], "frames": 3, "bytes": 309,
+     "rejected": 0, "duplicates": 1, "parse_failures": {"decode_error": 1},
+     "connections": 2}
+
+``received`` is a unix timestamp; counters are deltas since the worker's
+previous batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from struct import Struct
+from typing import Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+BATCH_HEADER = Struct("!I")
+# larger batches are treated as a protocol error by the receiving side
+MAX_BATCH_SIZE = 16 * 1024 * 1024
+
+
+def encode_batch(batch: dict) -> bytes:
+    payload = json.dumps(batch, separators=(",", ":")).encode()
+    return BATCH_HEADER.pack(len(payload)) + payload
+
+
+class CollectorIngestProtocol(asyncio.Protocol):
+    """Receives batches from one collector worker (runs inside the integration).
+
+    The coordinator provides ``async_register_collector(protocol)``,
+    ``async_handle_batch(protocol, batch)`` and
+    ``async_unregister_collector(protocol)``.
+    """
+
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+        self.transport: Optional[asyncio.Transport] = None
+        self._buffer = bytearray()
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        _LOGGER.info("Collector connected from %s", transport.get_extra_info("peername"))
+        self.coordinator.async_register_collector(self)
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+        buffer += data
+        offset = 0
+        while len(buffer) - offset >= BATCH_HEADER.size:
+            (length,) = BATCH_HEADER.unpack_from(buffer, offset)
+            if length > MAX_BATCH_SIZE:
+                _LOGGER.warning("Closing collector connection: %d byte batch", length)
+                buffer.clear()
+                self.transport.abort()
+                return
+            end = offset + BATCH_HEADER.size + length
+            if len(buffer) < end:
+                break
+            try:
+                batch = json.loads(buffer[offset + BATCH_HEADER.size : end])
+            except ValueError:
+                _LOGGER.warning("Dropping malformed batch from collector")
+            else:
+                try:
+                    self.coordinator.async_handle_batch(self, batch)
+                except Exception:
+                    _LOGGER.exception("Failed to apply batch from collector")
+            offset = end
+        if offset:
+            del buffer[:offset]
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        _LOGGER.info("Collector disconnected")
+        self.transport = None
+        self.coordinator.async_unregister_collector(self)
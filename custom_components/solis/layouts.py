@@ -0,0 +1,233 @@
+"""
+Declarative packet layouts for the frames different firmwares send.
+
+Each layout lists its fields (offset, width, scaling, signedness, unit) and is
+compiled once at import into a single ``struct.Struct`` plus a small table of
+per-field conversions and sample indices (see ``record.py``), so decoding a
+frame is one ``unpack_from`` call filling a ``Sample``.
+
+To support another firmware, describe its frame with ``FrameLayout`` and pass
+it to ``register_layout``; the protocol picks it up by frame size and control
+code without any change to the receive path, and its fields get sensors
+(generic ones, from the unit, where ``sensor.py`` has no description).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from struct import Struct
+from typing import Callable, Optional
+
+from custom_components.solis.record import Sample, field_index, new_values
+
+_INT_CODES = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+@dataclass(frozen=True)
+class Field:
+    """One value inside a frame."""
+
+    name: str
+    offset: int
+    size: int = 2
+    # raw value is divided by this; ``None`` keeps the raw integer
+    divisor: Optional[float] = None
+    signed: bool = False
+    unit: Optional[str] = None
+    # fixed-width ASCII text instead of a big endian integer
+    text: bool = False
+
+    @property
+    def code(self) -> str:
+        if self.text:
+            return f"{self.size}s"
+        code = _INT_CODES[self.size]
+        return code.lower() if self.signed else code
+
+
+@dataclass
+class FrameLayout:
+    """A frame shape, keyed by its total size and (optionally) control code."""
+
+    name: str
+    size: int
+    fields: tuple[Field, ...]
+    # ``None`` matches any control code for this size
+    control: Optional[int] = None
+    # hook to add values computed from the decoded ones; it gets the list of
+    # sample values and reads/writes it by field index
+    derive: Optional[Callable[[list], None]] = None
+    _struct: Struct = field(init=False, repr=False)
+    _names: tuple[str, ...] = field(init=False, repr=False)
+    _indices: tuple[int, ...] = field(init=False, repr=False)
+    _convert: tuple = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        ordered = sorted(self.fields, key=lambda f: f.offset)
+        fmt = [">"]
+        pos = 0
+        for fld in ordered:
+            if fld.offset < pos:
+                raise ValueError(f"{self.name}: field {fld.name} overlaps the previous field")
+            if fld.offset > pos:
+                fmt.append(f"{fld.offset - pos}x")
+            fmt.append(fld.code)
+            pos = fld.offset + fld.size
+        if pos > self.size:
+            raise ValueError(f"{self.name}: fields run past the {self.size}-byte frame")
+        self._struct = Struct("".join(fmt))
+        self._names = tuple(f.name for f in ordered)
+        self._indices = tuple(field_index(f.name) for f in ordered)
+        self._convert = tuple("text" if f.text else f.divisor for f in ordered)
+
+    @property
+    def field_names(self) -> tuple[str, ...]:
+        return self._names
+
+    def decode(self, buffer, offset: int = 0) -> Sample:
+        """Decode the frame at ``offset`` of ``buffer`` into a ``Sample``."""
+        values = new_values()
+        for index, convert, raw in zip(
+            self._indices, self._convert, self._struct.unpack_from(buffer, offset)
+        ):
+            if convert is None:
+                values[index] = raw
+            elif convert == "text":
+                values[index] = raw.decode("ascii", "replace").strip("\x00 ")
+            else:
+                values[index] = raw / convert
+        if self.derive is not None:
+            self.derive(values)
+        return Sample(tuple(values))
+
+
+LAYOUTS: dict[tuple[int, Optional[int]], FrameLayout] = {}
+# field name -> definition, across every registered layout
+FIELDS: dict[str, Field] = {}
+
+
+def register_layout(layout: FrameLayout) -> FrameLayout:
+    key = (layout.size, layout.control)
+    if key in LAYOUTS:
+        raise ValueError(f"A layout is already registered for {key}")
+    LAYOUTS[key] = layout
+    for fld in layout.fields:
+        # the first layout to declare a name describes it
+        FIELDS.setdefault(fld.name, fld)
+    return layout
+
+
+def field_for(name: str) -> Optional[Field]:
+    """Return the metadata of a decoded field, if a layout declares it."""
+    return FIELDS.get(name)
+
+
+def find_layout(size: int, control: Optional[int]) -> Optional[FrameLayout]:
+    """Return the layout for a frame, preferring an exact control code match."""
+    return LAYOUTS.get((size, control)) or LAYOUTS.get((size, None))
+
+
+_POWER = field_index("current_power_apo_t1_W")
+# voltage, current and power of PV strings 1-4
+_DV = tuple(field_index(f"dv{string}") for string in range(1, 5))
+_DC = tuple(field_index(f"dc{string}_current") for string in range(1, 5))
+_DP = tuple(field_index(f"dp{string}_power") for string in range(1, 5))
+
+
+def estimate_dc_values(values: list) -> None:
+    """Split AC power over the PV strings to estimate DC power and current."""
+    # Assumes ~97% efficiency to guess DC side metrics
+    dv1 = values[_DV[0]]
+    dv2 = values[_DV[1]]
+    total_dc_power = values[_POWER] / 0.97
+    v_total = dv1 + dv2
+    if v_total > 0:
+        dp1 = round((dv1 / v_total) * total_dc_power, 2)
+        dp2 = round((dv2 / v_total) * total_dc_power, 2)
+        dc1 = round(dp1 / dv1, 2) if dv1 > 0 else 0.0
+        dc2 = round(dp2 / dv2, 2) if dv2 > 0 else 0.0
+    else:
+        dp1 = dp2 = dc1 = dc2 = 0.0
+    values[_DC[0]] = dc1
+    values[_DC[1]] = dc2
+    values[_DP[0]] = dp1
+    values[_DP[1]] = dp2
+
+
+# single phase, two MPPT string inverter (103-byte Ginlong frame)
+GINLONG_103 = register_layout(
+    FrameLayout(
+        name="ginlong_103",
+        size=103,
+        fields=(
+            Field("serialno", 15, 16, text=True),
+            Field("inv_t0", 31, divisor=10, signed=True, unit="°C"),
+            Field("dv1", 33, divisor=10, unit="V"),
+            Field("dv2", 35, divisor=10, unit="V"),
+            Field("av1", 51, divisor=10, unit="V"),
+            Field("a_fo1", 57, divisor=100, unit="Hz"),
+            Field("current_power_apo_t1_W", 59, divisor=1.0, unit="W"),
+            Field("et_ge0", 71, 4, divisor=10, unit="kWh"),
+            Field("hr_ege_t1", 75, 4, divisor=1.0, unit="h"),
+            Field("inverter_status", 79),
+        ),
+        derive=estimate_dc_values,
+    )
+)
+
+
+def derive_dc_power(values: list) -> None:
+    """Compute PV string power from the measured voltage and current."""
+    for dv, dc, dp in zip(_DV, _DC, _DP):
+        values[dp] = round(values[dv] * values[dc], 2)
+
+
+_STATUS = field_index("inverter_status")
+_STATUS_CODE = field_index("inverter_status_code")
+# Solis status codes from here on are faults; below are operating states
+# (0 waiting, 3 generating, ...)
+SOLIS_FAULT_CODES = 0x1000
+
+
+def derive_input_registers(values: list) -> None:
+    """Derive string power, and the pushed frames' 0/1 status from the status code."""
+    derive_dc_power(values)
+    code = values[_STATUS_CODE]
+    # other codes are left as they are, which the status sensor shows as a fault
+    values[_STATUS] = 1 if code < SOLIS_FAULT_CODES else code
+
+
+# input registers 3004-3043 of Solis string inverters, read by poller.py.
+# Offsets are (register - 3004) * 2 into the register data. Not registered
+# with register_layout: it describes Modbus replies, not pushed frames, and
+# reuses the pushed field names so both feed the same entities
+SOLIS_INPUT_REGISTERS_START = 3004
+SOLIS_INPUT_REGISTERS = FrameLayout(
+    name="solis_input_3004",
+    size=80,
+    fields=(
+        Field("current_power_apo_t1_W", 0, 4, divisor=1.0, unit="W"),
+        # 3008-3009 hold the lifetime energy in whole kWh only. Decoded as
+        # et_ge0 it would move the 0.1 kWh pushed counter back and forth, so
+        # lifetime energy and the aggregates come from pushed frames alone
+        Field("dv1", 34, divisor=10, unit="V"),
+        Field("dc1_current", 36, divisor=10, unit="A"),
+        Field("dv2", 38, divisor=10, unit="V"),
+        Field("dc2_current", 40, divisor=10, unit="A"),
+        Field("dv3", 42, divisor=10, unit="V"),
+        Field("dc3_current", 44, divisor=10, unit="A"),
+        Field("dv4", 46, divisor=10, unit="V"),
+        Field("dc4_current", 48, divisor=10, unit="A"),
+        Field("av1", 58, divisor=10, unit="V"),
+        Field("av2", 60, divisor=10, unit="V"),
+        Field("av3", 62, divisor=10, unit="V"),
+        Field("ac1", 64, divisor=10, unit="A"),
+        Field("ac2", 66, divisor=10, unit="A"),
+        Field("ac3", 68, divisor=10, unit="A"),
+        Field("inv_t0", 74, divisor=10, signed=True, unit="°C"),
+        Field("a_fo1", 76, divisor=100, unit="Hz"),
+        # a Solis status code, not the pushed frames' 0/1; see derive_input_registers
+        Field("inverter_status_code", 78),
+    ),
+    derive=derive_input_registers,
+)
@@ -0,0 +1,271 @@
+"""
+Logger-facing TCP protocol and connection bookkeeping.
+
+The owner (coordinator or collector) provides ``stats``, ``archive``,
+``tracer``, ``relay``, ``duplicates``, ``max_buffer``,
+``async_register_connection``, ``async_unregister_connection`` and
+``async_handle_sample``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import perf_counter_ns
+from typing import Optional
+
+from custom_components.solis.frame import build_ack, control_code, frame_valid, logger_serial, split_frames
+from custom_components.solis.layouts import find_layout
+from custom_components.solis.relay import RelayChannel
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SolisTCPProtocol(asyncio.Protocol):
+    """Protocol to handle a single TCP connection and forward received data to coordinator."""
+
+    # one instance per logger connection, so keep it small
+    __slots__ = (
+        "coordinator",
+        "transport",
+        "peer",
+        "relay",
+        "_buffer",
+        "_loop",
+        "connected_at",
+        "last_activity",
+        "handshaken",
+    )
+
+    def __init__(self, coordinator):
+        self.coordinator = coordinator
+        self.transport: Optional[asyncio.Transport] = None
+        self.peer: Optional[str] = None
+        self.relay: Optional[RelayChannel] = None
+        self._buffer = bytearray()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connected_at = 0.0
+        self.last_activity = 0.0
+        self.handshaken = False
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+        peername = transport.get_extra_info("peername")
+        self.peer = peername[0] if peername else None
+        _LOGGER.debug("TCP connection from %s", peername)
+        if not self.coordinator.async_register_connection(self):
+            _LOGGER.debug("Rejecting connection from %s: connection limit reached", peername)
+            self.transport = None
+            transport.abort()
+            return
+        self._loop = asyncio.get_running_loop()
+        self.connected_at = self.last_activity = self._loop.time()
+        if self.coordinator.relay is not None:
+            self.relay = self.coordinator.relay.open(self._relay_response)
+
+    def check_timeout(self, now: float, handshake_timeout: float, idle_timeout: float) -> None:
+        """Close the connection if it missed the handshake or went idle."""
+        if self.transport is None or self.transport.is_closing():
+            return
+        if not self.handshaken:
+            if now - self.connected_at >= handshake_timeout:
+                _LOGGER.debug("Closing %s: no valid frame within handshake timeout", self.peer)
+                self.transport.abort()
+        elif now - self.last_activity >= idle_timeout:
+            _LOGGER.debug("Closing idle connection from %s", self.peer)
+            self.transport.abort()
+
+    def data_received(self, data: bytes) -> None:
+        if self.transport is None:
+            return
+        received_ns = perf_counter_ns()
+        self.last_activity = self._loop.time()
+        stats = self.coordinator.stats
+        stats.bytes += len(data)
+        # collect bytes until complete frames are available; segments may split
+        # or merge frames, so never assume one recv == one frame
+        self._buffer += data
+        frames, consumed = split_frames(self._buffer)
+        if frames:
+            self.handshaken = True
+            with memoryview(self._buffer) as view:
+                for offset, size in frames:
+                    self._handle_frame(view, offset, size, received_ns)
+        if consumed:
+            del self._buffer[:consumed]
+        if len(self._buffer) > self.coordinator.max_buffer:
+            # no frame boundary within the limit: junk or a hostile peer
+            _LOGGER.debug("Closing %s: %d buffered bytes without a frame", self.peer, len(self._buffer))
+            stats.parse_failures["buffer_overflow"] += 1
+            self._buffer.clear()
+            self.transport.abort()
+
+    def pause_writing(self) -> None:
+        # the logger is not reading our acks; stop reading until it catches up
+        if self.transport is not None:
+            self.transport.pause_reading()
+
+    def resume_writing(self) -> None:
+        if self.transport is not None:
+            self.transport.resume_reading()
+
+    def _handle_frame(self, view: memoryview, offset: int, size: int, received_ns: int) -> None:
+        stats = self.coordinator.stats
+        stats.frames += 1
+        relay = self.relay
+        valid = frame_valid(view, offset, size)
+        # acknowledge hello/heartbeat/data frames so the logger does not
+        # retransmit or reconnect. while relayed, the cloud's own responses
+        # are passed back instead; until the cloud is connected the frames
+        # are acked here and the relay drops the cloud's later replies
+        response = build_ack(view, offset) if valid else None
+        local = response is not None and (relay is None or not relay.connected)
+        if relay is not None:
+            # never waits; a slow or unreachable cloud only fills its queue
+            relay.send(bytes(view[offset : offset + size]), local)
+        if not valid:
+            # never ack or decode a corrupt frame; the logger will resend it
+            stats.rejected += 1
+            _LOGGER.debug("Dropping frame with a bad checksum from %s", self.peer)
+            return
+        if local and self.transport is not None:
+            self.transport.write(response)
+        duplicates = self.coordinator.duplicates
+        if duplicates is not None and duplicates.seen(view, offset, size, self.last_activity):
+            # a retransmission: acknowledged above, nothing new to decode
+            stats.duplicates += 1
+            return
+
+        # frame shapes are declared in layouts.py. if you have a different
+        # version feel free to register its layout there
+        layout = find_layout(size, control_code(view, offset))
+        parsed = None
+        if layout is None:
+            # acknowledged V5 control frames carry no sample
+            if response is None:
+                _LOGGER.debug("Unexpected packet size: %d", size)
+                stats.parse_failures["unknown_layout"] += 1
+                stats.unexpected_sizes[size] += 1
+        else:
+            started = perf_counter_ns()
+            try:
+                parsed = layout.decode(view, offset)
+            except Exception:
+                stats.parse_failures["decode_error"] += 1
+                _LOGGER.debug("Failed to parse %s frame", layout.name, exc_info=True)
+            stats.decode_ns.record(perf_counter_ns() - started)
+
+        archive = self.coordinator.archive
+        tracer = self.coordinator.tracer
+        if archive is not None or tracer is not None:
+            if parsed is not None:
+                serial = parsed.get("serialno")
+            else:
+                logger = logger_serial(view, offset)
+                serial = str(logger) if logger is not None else None
+            frame = None
+            if archive is not None:
+                # keep undecodable frames too, so they can be re-decoded later
+                frame = bytes(view[offset : offset + size])
+                archive.append(serial, self.peer, frame)
+            if tracer is not None and tracer.wants(serial):
+                if frame is None:
+                    frame = bytes(view[offset : offset + size])
+                tracer.record(self.peer, serial, frame, parsed)
+
+        if parsed is None:
+            return
+
+        # hand the sample to the coordinator, which routes it by serial
+        try:
+            self.coordinator.async_handle_sample(parsed, received_ns)
+        except Exception:
+            _LOGGER.exception("Failed to set updated data on coordinator")
+
+    def _relay_response(self, data: bytes) -> None:
+        if self.transport is not None:
+            self.transport.write(data)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self.relay is not None:
+            self.relay.close()
+            self.relay = None
+        if self.transport is not None:
+            self.transport = None
+            self.coordinator.async_unregister_connection(self)
+        if exc:
+            _LOGGER.debug("TCP connection lost with error: %s", exc)
+        else:
+            _LOGGER.debug("TCP connection closed")
+
+
+class ConnectionTracker:
+    """Admission limits and handshake/idle timeouts for logger connections."""
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_connections_per_peer: int,
+        idle_timeout: float,
+        handshake_timeout: float,
+    ):
+        self.max_connections = max_connections
+        self.max_connections_per_peer = max_connections_per_peer
+        self.idle_timeout = idle_timeout
+        self.handshake_timeout = handshake_timeout
+        self.connections: set[SolisTCPProtocol] = set()
+        self._per_peer: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def add(self, protocol: SolisTCPProtocol) -> bool:
+        """Admit a new connection, or return False if a limit is reached."""
+        if len(self.connections) >= self.max_connections:
+            return False
+        peer = protocol.peer
+        if peer is not None:
+            count = self._per_peer.get(peer, 0)
+            if count >= self.max_connections_per_peer:
+                return False
+            self._per_peer[peer] = count + 1
+        self.connections.add(protocol)
+        return True
+
+    def discard(self, protocol: SolisTCPProtocol) -> None:
+        if protocol not in self.connections:
+            return
+        self.connections.discard(protocol)
+        peer = protocol.peer
+        if peer is not None:
+            count = self._per_peer.get(peer, 0) - 1
+            if count > 0:
+                self._per_peer[peer] = count
+            else:
+                self._per_peer.pop(peer, None)
+
+    @property
+    def sweep_interval(self) -> float:
+        # a single periodic sweep enforces the timeouts of every connection,
+        # instead of one timer per connection
+        return max(1.0, min(self.handshake_timeout, self.idle_timeout) / 4)
+
+    def sweep(self, now: float) -> None:
+        for protocol in list(self.connections):
+            protocol.check_timeout(now, self.handshake_timeout, self.idle_timeout)
+
+    def abort_all(self) -> None:
+        for protocol in list(self.connections):
+            if protocol.transport is not None:
+                protocol.transport.abort()
+
+    def abort_on_ports(self, ports: set[int]) -> None:
+        """Abort the connections accepted on any of the local ``ports``."""
+        for protocol in list(self.connections):
+            transport = protocol.transport
+            if transport is None:
+                continue
+            sockname = transport.get_extra_info("sockname")
+            if sockname and sockname[1] in ports:
+                _LOGGER.debug("Closing %s: its listener on port %s was replaced", protocol.peer, sockname[1])
+                transport.abort()
@@ -0,0 +1,65 @@
+"""Modbus RTU "read input registers" messages carried inside V5 frames."""
+
+from __future__ import annotations
+
+from struct import Struct
+
+READ_INPUT_REGISTERS = 0x04
+# slave address of the inverter behind the logger
+DEFAULT_SLAVE = 1
+
+_READ_REQUEST = Struct(">BBHH")
+_CRC = Struct("<H")
+
+
+class ModbusError(Exception):
+    """A malformed reply, or an exception reported by the inverter."""
+
+
+def _crc_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+_CRC_TABLE = _crc_table()
+
+
+def crc16(data) -> int:
+    """Modbus CRC-16 of ``data``."""
+    crc = 0xFFFF
+    table = _CRC_TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def read_input_registers(slave: int, start: int, count: int) -> bytes:
+    """Return the RTU request reading ``count`` registers from ``start``."""
+    request = _READ_REQUEST.pack(slave, READ_INPUT_REGISTERS, start, count)
+    return request + _CRC.pack(crc16(request))
+
+
+def parse_read_response(frame, slave: int, count: int) -> bytes:
+    """Return the register data of a read reply, checking address and CRC."""
+    if len(frame) < 5:
+        raise ModbusError("no reply from the inverter")
+    if frame[0] != slave:
+        raise ModbusError(f"reply from slave {frame[0]}, expected {slave}")
+    if frame[1] == READ_INPUT_REGISTERS | 0x80:
+        if crc16(frame[:3]) != _CRC.unpack_from(frame, 3)[0]:
+            raise ModbusError("bad CRC in exception reply")
+        raise ModbusError(f"inverter exception code {frame[2]}")
+    if frame[1] != READ_INPUT_REGISTERS:
+        raise ModbusError(f"unexpected function {frame[1]}")
+    size = frame[2]
+    # some loggers pad the reply; only the declared bytes and CRC count
+    if size != count * 2 or len(frame) < size + 5:
+        raise ModbusError(f"reply carries {size} bytes, expected {count * 2}")
+    if crc16(frame[: size + 3]) != _CRC.unpack_from(frame, size + 3)[0]:
+        raise ModbusError("bad CRC")
+    return bytes(frame[3 : size + 3])
@@ -0,0 +1,192 @@
+"""Reads an inverter's input registers through its logger's local port."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from time import perf_counter_ns
+
+from custom_components.solis.frame import (
+    CONTROL_RESPONSE,
+    V5_HEADER,
+    build_request,
+    control_code,
+    frame_valid,
+    response_message,
+    split_frames,
+)
+from custom_components.solis.layouts import SOLIS_INPUT_REGISTERS, SOLIS_INPUT_REGISTERS_START, FrameLayout
+from custom_components.solis.modbus import DEFAULT_SLAVE, ModbusError, parse_read_response, read_input_registers
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECT_TIMEOUT = 10.0
+RESPONSE_TIMEOUT = 5.0
+# consecutive unanswered requests before the connection is re-opened
+MAX_MISSED = 3
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 60.0
+_READ_SIZE = 4096
+# offset of the sequence number the logger echoes in its V5 header
+_V5_SEQUENCE = 5
+
+
+class PollerStats:
+    """Counters of one poller."""
+
+    __slots__ = ("requests", "responses", "timeouts", "errors", "connects", "connect_failures")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.responses = 0
+        self.timeouts = 0
+        # replies without usable register data (e.g. inverter asleep)
+        self.errors = 0
+        self.connects = 0
+        self.connect_failures = 0
+
+
+class InverterPoller:
+    """Reads one inverter's registers through its logger, at a fixed interval."""
+
+    def __init__(
+        self,
+        owner,
+        host: str,
+        port: int,
+        logger_serial: int,
+        serial: str,
+        interval: float,
+        *,
+        slave: int = DEFAULT_SLAVE,
+        layout: FrameLayout = SOLIS_INPUT_REGISTERS,
+        start: int = SOLIS_INPUT_REGISTERS_START,
+    ):
+        self.owner = owner
+        self.host = host
+        self.port = port
+        self.logger_serial = logger_serial
+        self.serial = serial
+        self.interval = interval
+        self.slave = slave
+        self.layout = layout
+        self.start = start
+        self.count = layout.size // 2
+        self.stats = PollerStats()
+        self.connected = False
+        self._request = read_input_registers(slave, start, self.count)
+        self._sequence = 0
+
+    async def async_run(self) -> None:
+        """Poll until cancelled."""
+        delay = RECONNECT_DELAY
+        stats = self.stats
+        while True:
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), CONNECT_TIMEOUT
+                )
+            except (OSError, asyncio.TimeoutError) as err:
+                stats.connect_failures += 1
+                _LOGGER.debug("Cannot reach logger at %s:%s (%s); retrying in %.0fs", self.host, self.port, err, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+            stats.connects += 1
+            self.connected = True
+            _LOGGER.debug("Polling logger %s at %s:%s", self.logger_serial, self.host, self.port)
+            try:
+                if await self._async_poll(reader, writer):
+                    # the connection worked; start over with a short delay
+                    delay = RECONNECT_DELAY
+            except (OSError, asyncio.IncompleteReadError) as err:
+                _LOGGER.debug("Connection to logger at %s:%s lost: %s", self.host, self.port, err)
+            finally:
+                self.connected = False
+                writer.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+    async def _async_poll(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
+        """Poll over one connection; return whether any reply arrived."""
+        loop = asyncio.get_running_loop()
+        stats = self.stats
+        buffer = bytearray()
+        answered = False
+        missed = 0
+        next_poll = loop.time()
+        while missed < MAX_MISSED:
+            self._sequence = sequence = (self._sequence + 1) & 0xFF
+            writer.write(build_request(self.logger_serial, sequence, self._request))
+            stats.requests += 1
+            try:
+                await asyncio.wait_for(self._async_read_reply(reader, buffer, sequence), RESPONSE_TIMEOUT)
+            except asyncio.TimeoutError:
+                stats.timeouts += 1
+                missed += 1
+            else:
+                answered = True
+                missed = 0
+            # fixed rate; a slow reply does not push later polls back
+            next_poll += self.interval
+            now = loop.time()
+            if next_poll < now:
+                next_poll = now
+            await asyncio.sleep(next_poll - now)
+        _LOGGER.debug("Logger at %s:%s stopped answering; reconnecting", self.host, self.port)
+        return answered
+
+    async def _async_read_reply(self, reader: asyncio.StreamReader, buffer: bytearray, sequence: int) -> None:
+        """Read until the reply to ``sequence`` arrives, and hand over its sample."""
+        while True:
+            data = await reader.read(_READ_SIZE)
+            if not data:
+                raise asyncio.IncompleteReadError(bytes(buffer), None)
+            received_ns = perf_counter_ns()
+            buffer += data
+            frames, consumed = split_frames(buffer)
+            replied = False
+            for offset, size in frames:
+                if (
+                    size < V5_HEADER.size + 2
+                    or control_code(buffer, offset) != CONTROL_RESPONSE
+                    or buffer[offset + _V5_SEQUENCE] != sequence
+                    or not frame_valid(buffer, offset, size)
+                ):
+                    # stale replies to timed out requests, or other traffic
+                    continue
+                replied = True
+                self._handle_reply(response_message(buffer, offset, size), received_ns)
+            del buffer[:consumed]
+            if replied:
+                return
+
+    def _handle_reply(self, message, received_ns: int) -> None:
+        stats = self.stats
+        try:
+            registers = parse_read_response(message, self.slave, self.count)
+        except ModbusError as err:
+            # the logger answers for the inverter, which may be asleep
+            stats.errors += 1
+            _LOGGER.debug("No register data from %s: %s", self.serial, err)
+            return
+        stats.responses += 1
+        sample = self.layout.decode(registers).replace({"serialno": self.serial})
+        try:
+            self.owner.async_handle_sample(sample, received_ns)
+        except Exception:
+            _LOGGER.exception("Failed to set updated data on coordinator")
+
+    def as_dict(self) -> dict:
+        stats = self.stats
+        return {
+            "logger": f"{self.host}:{self.port}",
+            "interval": self.interval,
+            "connected": self.connected,
+            "requests": stats.requests,
+            "responses": stats.responses,
+            "timeouts": stats.timeouts,
+            "errors": stats.errors,
+            "connects": stats.connects,
+            "connect_failures": stats.connect_failures,
+        }
@@ -0,0 +1,127 @@
+"""Decoded samples: immutable tuples indexed through one shared field registry."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from itertools import compress
+from operator import ne
+from typing import Any, Iterator
+
+
+class _Missing:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+# placeholder for fields a sample does not carry
+MISSING: Any = _Missing()
+
+# index -> name; only ever appended to, so bound indices stay valid
+FIELD_NAMES: list[str] = []
+_FIELD_INDEX: dict[str, int] = {}
+
+
+def field_index(name: str) -> int:
+    """Return the index of ``name``, registering it on first use."""
+    index = _FIELD_INDEX.get(name)
+    if index is None:
+        index = _FIELD_INDEX[name] = len(FIELD_NAMES)
+        FIELD_NAMES.append(name)
+    return index
+
+
+def new_values() -> list:
+    """A list with one ``MISSING`` slot per registered field, to fill in."""
+    return [MISSING] * len(FIELD_NAMES)
+
+
+class Sample(Mapping):
+    """Immutable record of one inverter's decoded values."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: tuple):
+        self.values = values
+
+    @classmethod
+    def from_mapping(cls, mapping: Mapping[str, Any]) -> Sample:
+        return cls(()).replace(mapping)
+
+    def value(self, index: int) -> Any:
+        """Return the value at a bound field index, or ``None`` if missing."""
+        values = self.values
+        if index < len(values):
+            value = values[index]
+            if value is not MISSING:
+                return value
+        return None
+
+    def replace(self, changes: Mapping[str, Any]) -> Sample:
+        """Return a copy with the fields in ``changes`` set."""
+        indices = list(map(_FIELD_INDEX.get, changes))
+        if None in indices:
+            # register new names before sizing the copy
+            indices = [field_index(name) for name in changes]
+        values = list(self.values)
+        if len(values) < len(FIELD_NAMES):
+            values.extend([MISSING] * (len(FIELD_NAMES) - len(values)))
+        for index, value in zip(indices, changes.values()):
+            values[index] = value
+        return Sample(tuple(values))
+
+    def merge(self, other: Sample) -> Sample:
+        """Return a copy with the fields ``other`` carries taken from it."""
+        values = list(self.values)
+        if len(values) < len(other.values):
+            values.extend([MISSING] * (len(other.values) - len(values)))
+        for index, value in enumerate(other.values):
+            if value is not MISSING:
+                values[index] = value
+        return Sample(tuple(values))
+
+    def diff(self, previous: Sample) -> tuple[list[str], bool]:
+        """Return the names of fields that differ from ``previous``, and
+        whether this sample carries fields ``previous`` did not."""
+        new = self.values
+        old = previous.values
+        if new == old:
+            return [], False
+        if len(new) != len(old):
+            width = max(len(new), len(old))
+            new = new + (MISSING,) * (width - len(new))
+            old = old + (MISSING,) * (width - len(old))
+        # compared in C; no Python code runs per field
+        differs = list(map(ne, new, old))
+        return list(compress(FIELD_NAMES, differs)), MISSING in compress(old, differs)
+
+    def __getitem__(self, name: str) -> Any:
+        index = _FIELD_INDEX.get(name)
+        if index is not None and index < len(self.values):
+            value = self.values[index]
+            if value is not MISSING:
+                return value
+        raise KeyError(name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        index = _FIELD_INDEX.get(name)
+        if index is not None and index < len(self.values):
+            value = self.values[index]
+            if value is not MISSING:
+                return value
+        return default
+
+    def __contains__(self, name: object) -> bool:
+        index = _FIELD_INDEX.get(name)  # type: ignore[arg-type]
+        return index is not None and index < len(self.values) and self.values[index] is not MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        names = FIELD_NAMES
+        return (names[index] for index, value in enumerate(self.values) if value is not MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for value in self.values if value is not MISSING)
+
+    def __repr__(self) -> str:
+        return f"Sample({dict(self)!r})"
@@ -0,0 +1,217 @@
+"""Relay of raw logger frames to the vendor cloud, one upstream connection per logger."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, deque
+from typing import Callable, Optional
+
+from custom_components.solis.frame import START_BYTE, control_code, split_frames
+
+_LOGGER = logging.getLogger(__name__)
+
+# frames held per logger while the upstream is down or slow
+DEFAULT_QUEUE_SIZE = 64
+CONNECT_TIMEOUT = 10.0
+RETRY_DELAY = 1.0
+MAX_RETRY_DELAY = 300.0
+
+
+class RelayStats:
+    """Counters shared by every channel of one relay."""
+
+    __slots__ = ("forwarded", "responses", "dropped", "suppressed", "connect_failures")
+
+    def __init__(self) -> None:
+        self.forwarded = 0
+        self.responses = 0
+        self.dropped = 0
+        # upstream replies to frames already acknowledged locally
+        self.suppressed = 0
+        self.connect_failures = 0
+
+
+class UpstreamRelay:
+    """Pool of upstream connections, one per logger connection."""
+
+    def __init__(self, host: str, port: int, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.stats = RelayStats()
+        self._channels: set[RelayChannel] = set()
+
+    def open(self, respond: Callable[[bytes], None]) -> RelayChannel:
+        """Create the channel of a new logger connection.
+
+        ``respond`` is called with the bytes the upstream sends back.
+        """
+        channel = RelayChannel(self, respond)
+        self._channels.add(channel)
+        return channel
+
+    @property
+    def connected(self) -> int:
+        """Number of upstream connections currently open."""
+        return sum(1 for channel in self._channels if channel.connected)
+
+    def close(self) -> None:
+        for channel in list(self._channels):
+            channel.close()
+
+    def as_dict(self) -> dict:
+        stats = self.stats
+        return {
+            "upstream": f"{self.host}:{self.port}",
+            "channels": len(self._channels),
+            "connected": self.connected,
+            "forwarded": stats.forwarded,
+            "responses": stats.responses,
+            "dropped": stats.dropped,
+            "suppressed": stats.suppressed,
+            "connect_failures": stats.connect_failures,
+        }
+
+
+class RelayChannel(asyncio.Protocol):
+    """Upstream side of one relayed logger connection."""
+
+    def __init__(self, relay: UpstreamRelay, respond: Callable[[bytes], None]):
+        self._relay = relay
+        self._respond = respond
+        # (frame, control code of its locally sent reply or None)
+        self._queue: deque[tuple[bytes, Optional[int]]] = deque()
+        # replies still to drop, per control code; the upstream answers in order
+        self._suppress: Counter[int] = Counter()
+        self._responses = bytearray()
+        self.transport: Optional[asyncio.Transport] = None
+        self._connecting: Optional[asyncio.Task] = None
+        self._retry: Optional[asyncio.TimerHandle] = None
+        self._delay = RETRY_DELAY
+        self._paused = False
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self.transport is not None and not self.transport.is_closing()
+
+    def send(self, frame: bytes, acked: bool = False) -> None:
+        """Forward a raw frame, or queue it if the upstream is not ready.
+
+        ``acked`` tells that the logger already got a reply to ``frame``, so
+        the upstream's reply to it is not passed on.
+        """
+        if self._closed:
+            return
+        reply = control_code(frame, 0) - 0x3000 if acked else None
+        if self.connected and not self._paused and not self._queue:
+            self._write(frame, reply)
+            return
+        if len(self._queue) >= self._relay.queue_size:
+            self._queue.popleft()
+            self._relay.stats.dropped += 1
+        self._queue.append((frame, reply))
+        self._ensure_connection()
+
+    def _write(self, frame: bytes, reply: Optional[int]) -> None:
+        self.transport.write(frame)
+        self._relay.stats.forwarded += 1
+        if reply is not None:
+            self._suppress[reply] += 1
+
+    def _ensure_connection(self) -> None:
+        if self.transport is None and self._connecting is None and self._retry is None:
+            self._connecting = asyncio.get_running_loop().create_task(self._connect())
+
+    async def _connect(self) -> None:
+        loop = asyncio.get_running_loop()
+        relay = self._relay
+        try:
+            await asyncio.wait_for(
+                loop.create_connection(lambda: self, relay.host, relay.port), CONNECT_TIMEOUT
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            relay.stats.connect_failures += 1
+            _LOGGER.debug("Relay to %s:%s failed (%s); retrying in %.0fs", relay.host, relay.port, err, self._delay)
+            self._schedule_retry()
+        finally:
+            self._connecting = None
+
+    def _schedule_retry(self) -> None:
+        if self._closed or self._retry is not None:
+            return
+        self._retry = asyncio.get_running_loop().call_later(self._delay, self._retry_connect)
+        self._delay = min(self._delay * 2, MAX_RETRY_DELAY)
+
+    def _retry_connect(self) -> None:
+        self._retry = None
+        self._ensure_connection()
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        if self._closed:
+            transport.close()
+            return
+        self.transport = transport
+        self._delay = RETRY_DELAY
+        self._drain()
+
+    def _drain(self) -> None:
+        while self._queue and not self._paused and self.connected:
+            self._write(*self._queue.popleft())
+
+    def data_received(self, data: bytes) -> None:
+        stats = self._relay.stats
+        stats.responses += 1
+        if not self._suppress and not self._responses:
+            self._respond(data)
+            return
+        # split the replies into frames until every duplicate was dropped
+        buffer = self._responses
+        buffer += data
+        frames, consumed = split_frames(buffer)
+        suppress = self._suppress
+        for offset, size in frames:
+            if buffer[offset] == START_BYTE:
+                control = control_code(buffer, offset)
+                if suppress[control] > 0:
+                    suppress[control] -= 1
+                    if not suppress[control]:
+                        del suppress[control]
+                    stats.suppressed += 1
+                    continue
+            self._respond(bytes(buffer[offset : offset + size]))
+        del buffer[:consumed]
+
+    def pause_writing(self) -> None:
+        # the upstream is slow; queue (and eventually drop) instead of buffering
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        self._drain()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.transport = None
+        self._paused = False
+        # unanswered frames are not resent; a new connection replies afresh
+        self._suppress.clear()
+        self._responses.clear()
+        if not self._closed:
+            _LOGGER.debug("Relay connection to %s:%s lost: %s", self._relay.host, self._relay.port, exc)
+            self._schedule_retry()
+
+    def close(self) -> None:
+        """Close the upstream connection for good (the logger disconnected)."""
+        self._closed = True
+        self._queue.clear()
+        self._suppress.clear()
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+        if self._connecting is not None:
+            self._connecting.cancel()
+            self._connecting = None
+        if self.transport is not None:
+            self.transport.close()
+        self._relay._channels.discard(self)
@@ -0,0 +1,64 @@
+"""Holds samples for a short window so a fleet's reports are written together."""
+
+from __future__ import annotations
+
+import asyncio
+from time import perf_counter_ns
+from typing import Callable, Optional
+
+from custom_components.solis.record import Sample
+from custom_components.solis.stats import ListenerStats
+
+
+class IngestScheduler:
+    """Latest sample per serial, applied together once the window closes."""
+
+    __slots__ = ("loop", "window", "apply", "stats", "_pending", "_handle")
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        window: float,
+        apply: Callable[[str, Sample, Optional[int]], None],
+        stats: ListenerStats,
+    ):
+        self.loop = loop
+        self.window = window
+        self.apply = apply
+        self.stats = stats
+        # serial -> (sample, received_ns, queued_ns)
+        self._pending: dict[str, tuple[Sample, Optional[int], int]] = {}
+        self._handle: Optional[asyncio.TimerHandle] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def get(self, serial: str) -> Optional[Sample]:
+        """Return the queued sample of ``serial``, if any."""
+        queued = self._pending.get(serial)
+        return queued[0] if queued is not None else None
+
+    def submit(self, serial: str, sample: Sample, received_ns: Optional[int]) -> None:
+        """Queue ``sample``, replacing a queued one of the same serial."""
+        pending = self._pending
+        if serial in pending:
+            self.stats.coalesced += 1
+        pending[serial] = (sample, received_ns, perf_counter_ns())
+        if self._handle is None:
+            self._handle = self.loop.call_later(self.window, self.flush)
+
+    def flush(self) -> None:
+        """Apply every queued sample now."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = {}
+        now = perf_counter_ns()
+        record = self.stats.coalesce_ns.record
+        apply = self.apply
+        for serial, (sample, received_ns, queued_ns) in pending.items():
+            record(now - queued_ns)
+            apply(serial, sample, received_ns)
@@ -3,27 +3,49 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable
+from datetime import timedelta
+from typing import Any, Callable, Optional
 
 from homeassistant.components.sensor import (
     SensorEntity,
     SensorEntityDescription,
     SensorDeviceClass,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity import DeviceInfo
 
+from .aggregates import (
+    ENERGY_MONTH,
+    ENERGY_TODAY,
+    ENERGY_YEAR,
+    INTERVAL_ENERGY,
+    PEAK_POWER_TODAY,
+    PRODUCTION_TIME_TODAY,
+)
 from .const import DOMAIN
 from .coordinator import SolisDataUpdateCoordinator
+from .layouts import field_for
+from .record import Sample, field_index
+
+# polling interval of the listener counter sensors
+SCAN_INTERVAL = timedelta(seconds=60)
+
 
 @dataclass
 class SolisSensorEntityDescription(SensorEntityDescription):
-    value_fn: Callable[[dict], Any] = lambda data: None
+    # computes the state from the sample; without one the entity reads its
+    # single data key directly, by field index
+    value_fn: Optional[Callable[[Sample], Any]] = None
+    # sample keys read by value_fn; the entity only updates when one changes
+    data_keys: tuple[str, ...] = ()
     # function that returns a dict of attributes for this sensor from the coordinator data
-    attributes_fn: Callable[[dict], dict] = lambda data: {}
+    attributes_fn: Callable[[Sample], dict] = lambda data: {}
 
 STATUS_MAPPING = {
     0: "STANDBY",
@@ -37,7 +59,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement="W",
         icon="mdi:solar-power",
-        value_fn=lambda d: d.get("current_power_apo_t1_W")
+        data_keys=("current_power_apo_t1_W",),
     ),
     SolisSensorEntityDescription(
         key="solis_client_dc_voltage_pv1",
@@ -45,7 +67,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement="V",
         icon="mdi:flash",
-        value_fn=lambda d: d.get("dv1")
+        data_keys=("dv1",),
     ),
     SolisSensorEntityDescription(
         key="solis_client_dc_voltage_pv2",
@@ -53,7 +75,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement="V",
         icon="mdi:flash",
-        value_fn=lambda d: d.get("dv2")
+        data_keys=("dv2",),
     ),
     SolisSensorEntityDescription(
         key="solis_client_ac_output_frequency_r",
@@ -61,7 +83,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.FREQUENCY,
         native_unit_of_measurement="Hz",
         icon="mdi:sine-wave",
-        value_fn=lambda d: d.get("a_fo1")
+        data_keys=("a_fo1",),
     )
     ,
     SolisSensorEntityDescription(
@@ -70,9 +92,7 @@ ENTITIES = [
         native_unit_of_measurement="h",
         state_class="total_increasing",
         icon="mdi:history",
-        value_fn=lambda d: (
-            d.get("hr_ege_t1")
-        ),
+        data_keys=("hr_ege_t1",),
         # attributes_fn=lambda d: {"raw": d.get("hr_ege_t1_raw") or d.get("total_production_hour_hr_ege_t1_raw")},
     ),
     SolisSensorEntityDescription(
@@ -82,9 +102,7 @@ ENTITIES = [
         state_class="total_increasing",
         native_unit_of_measurement="kWh",
         icon="mdi:counter",
-        value_fn=lambda d: (
-            d.get("et_ge0")
-        )
+        data_keys=("et_ge0",),
     ),
     SolisSensorEntityDescription(
         key="solis_client_temperature_inverter",
@@ -92,9 +110,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement="°C",
         icon="mdi:thermometer",
-        value_fn=lambda d: (
-            d.get("inv_t0")
-        ),
+        data_keys=("inv_t0",),
         # attributes_fn=lambda d: {"raw": d.get("inv_t0_raw")},
     ),
     SolisSensorEntityDescription(
@@ -103,9 +119,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement="V",
         icon="mdi:flash",
-        value_fn=lambda d: (
-            d.get("av1")
-        ),
+        data_keys=("av1",),
         # attributes_fn=lambda d: {"raw": d.get("av1_raw") or d.get("AV1_raw")},
     ),
     SolisSensorEntityDescription(
@@ -113,6 +127,7 @@ ENTITIES = [
         name="Inverter Status",
         device_class=SensorDeviceClass.ENUM,
         options=["ACTIVE", "STANDBY"],
+        data_keys=("inverter_status", "current_power_apo_t1_W"),
         value_fn=lambda d: (
             # 1. Check if the raw inverter_status is something other than 0 or 1
             "FAULT" if d.get("inverter_status") not in [0, 1, None] else (
@@ -127,7 +142,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.CURRENT,
         native_unit_of_measurement="A",
         icon="mdi:current-dc",
-        value_fn=lambda d: (d.get("dc1_current") ),
+        data_keys=("dc1_current",),
         # attributes_fn=lambda d: {"raw": d.get("dc1_raw") or d.get("DC1_raw")},
     ),
     SolisSensorEntityDescription(
@@ -136,7 +151,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.CURRENT,
         native_unit_of_measurement="A",
         icon="mdi:current-dc",
-        value_fn=lambda d: (d.get("dc2_current")),
+        data_keys=("dc2_current",),
         # attributes_fn=lambda d: {"raw": d.get("dc2_raw") or d.get("DC2_raw")},
     ),
     SolisSensorEntityDescription(
@@ -145,7 +160,7 @@ ENTITIES = [
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement="W",
         icon="mdi:flash",
-        value_fn=lambda d: (d.get("dp1_power")),
+        data_keys=("dp1_power",),
         # attributes_fn=lambda d: {"raw": d.get("dp1_raw") or d.get("DP1_raw")},
     ),
     SolisSensorEntityDescription(
@@ -154,28 +169,366 @@ ENTITIES = [
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement="W",
         icon="mdi:flash",
-        value_fn=lambda d: (d.get("dp2_power")),
+        data_keys=("dp2_power",),
         # attributes_fn=lambda d: {"raw": d.get("dp2_raw") or d.get("DP2_raw")},
     ),
+    # only created for inverters whose frames carry these fields
+    SolisSensorEntityDescription(
+        key="solis_client_dc_voltage_pv3",
+        name="DC Voltage PV3",
+        device_class=SensorDeviceClass.VOLTAGE,
+        native_unit_of_measurement="V",
+        icon="mdi:flash",
+        data_keys=("dv3",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_dc_voltage_pv4",
+        name="DC Voltage PV4",
+        device_class=SensorDeviceClass.VOLTAGE,
+        native_unit_of_measurement="V",
+        icon="mdi:flash",
+        data_keys=("dv4",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_dc_current_pv3",
+        name="DC Current PV3",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement="A",
+        icon="mdi:current-dc",
+        data_keys=("dc3_current",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_dc_current_pv4",
+        name="DC Current PV4",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement="A",
+        icon="mdi:current-dc",
+        data_keys=("dc4_current",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_dc_power_pv3",
+        name="DC Power PV3",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement="W",
+        icon="mdi:flash",
+        data_keys=("dp3_power",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_dc_power_pv4",
+        name="DC Power PV4",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement="W",
+        icon="mdi:flash",
+        data_keys=("dp4_power",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_ac_voltage_s",
+        name="AC Voltage S",
+        device_class=SensorDeviceClass.VOLTAGE,
+        native_unit_of_measurement="V",
+        icon="mdi:flash",
+        data_keys=("av2",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_ac_voltage_t",
+        name="AC Voltage T",
+        device_class=SensorDeviceClass.VOLTAGE,
+        native_unit_of_measurement="V",
+        icon="mdi:flash",
+        data_keys=("av3",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_ac_current_r",
+        name="AC Current R",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement="A",
+        icon="mdi:current-ac",
+        data_keys=("ac1",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_ac_current_s",
+        name="AC Current S",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement="A",
+        icon="mdi:current-ac",
+        data_keys=("ac2",),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_ac_current_t",
+        name="AC Current T",
+        device_class=SensorDeviceClass.CURRENT,
+        native_unit_of_measurement="A",
+        icon="mdi:current-ac",
+        data_keys=("ac3",),
+    ),
+    # running aggregates maintained by the coordinator (see aggregates.py)
+    SolisSensorEntityDescription(
+        key="solis_client_energy_today",
+        name="Energy today",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="kWh",
+        icon="mdi:solar-power-variant",
+        data_keys=(ENERGY_TODAY,),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_energy_this_month",
+        name="Energy this month",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="kWh",
+        icon="mdi:calendar-month",
+        data_keys=(ENERGY_MONTH,),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_energy_this_year",
+        name="Energy this year",
+        device_class=SensorDeviceClass.ENERGY,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="kWh",
+        icon="mdi:calendar",
+        data_keys=(ENERGY_YEAR,),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_interval_energy",
+        name="Energy last interval",
+        native_unit_of_measurement="kWh",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lightning-bolt",
+        entity_registry_enabled_default=False,
+        data_keys=(INTERVAL_ENERGY,),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_peak_power_today",
+        name="Peak power today",
+        device_class=SensorDeviceClass.POWER,
+        native_unit_of_measurement="W",
+        icon="mdi:chart-bell-curve",
+        data_keys=(PEAK_POWER_TODAY,),
+    ),
+    SolisSensorEntityDescription(
+        key="solis_client_production_time_today",
+        name="Production time today",
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        native_unit_of_measurement="h",
+        icon="mdi:timer-sun",
+        data_keys=(PRODUCTION_TIME_TODAY,),
+    ),
+]
+
+
+# sample keys some description above already shows
+DESCRIBED_KEYS = frozenset(key for description in ENTITIES for key in description.data_keys)
+
+# device class and state class for fields no description covers, by unit
+UNIT_CLASSES = {
+    "V": (SensorDeviceClass.VOLTAGE, SensorStateClass.MEASUREMENT),
+    "A": (SensorDeviceClass.CURRENT, SensorStateClass.MEASUREMENT),
+    "W": (SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT),
+    "Hz": (SensorDeviceClass.FREQUENCY, SensorStateClass.MEASUREMENT),
+    "°C": (SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT),
+    "kWh": (SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING),
+}
+
+_GENERIC_DESCRIPTIONS: dict[str, SolisSensorEntityDescription] = {}
+
+
+def generic_description(name: str) -> SolisSensorEntityDescription | None:
+    """Describe a decoded field from its layout metadata, if it has any."""
+    description = _GENERIC_DESCRIPTIONS.get(name)
+    if description is None:
+        fld = field_for(name)
+        if fld is None or fld.text:
+            return None
+        device_class, state_class = UNIT_CLASSES.get(fld.unit, (None, SensorStateClass.MEASUREMENT))
+        description = _GENERIC_DESCRIPTIONS[name] = SolisSensorEntityDescription(
+            key=f"solis_client_{name}",
+            name=name.replace("_", " ").capitalize(),
+            device_class=device_class,
+            state_class=state_class,
+            native_unit_of_measurement=fld.unit,
+            data_keys=(name,),
+        )
+    return description
+
+
+def descriptions_for(sample: Sample) -> list[SolisSensorEntityDescription]:
+    """Descriptions for the keys present in ``sample``."""
+    descriptions = [
+        description
+        for description in ENTITIES
+        if all(key in sample for key in description.data_keys)
+    ]
+    for key in sample:
+        if key not in DESCRIBED_KEYS:
+            description = generic_description(key)
+            if description is not None:
+                descriptions.append(description)
+    return descriptions
+
+
+@dataclass
+class SolisListenerSensorEntityDescription(SensorEntityDescription):
+    # reads a diagnostic value straight from the coordinator
+    value_fn: Callable[[SolisDataUpdateCoordinator], Any] = lambda coordinator: None
+    # counters change on every frame, so they are polled instead of pushed
+    polled: bool = False
+
+
+LISTENER_ENTITIES = [
+    SolisListenerSensorEntityDescription(
+        key="solis_client_active_connections",
+        name="Active connections",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        icon="mdi:lan-connect",
+        value_fn=lambda coordinator: coordinator.connection_count,
+    ),
+    SolisListenerSensorEntityDescription(
+        key="solis_client_frames_received",
+        name="Frames received",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:counter",
+        polled=True,
+        value_fn=lambda coordinator: coordinator.stats.frames,
+    ),
+    SolisListenerSensorEntityDescription(
+        key="solis_client_parse_failures",
+        name="Parse failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:alert-circle-outline",
+        polled=True,
+        value_fn=lambda coordinator: coordinator.stats.parse_failure_count,
+    ),
+    SolisListenerSensorEntityDescription(
+        key="solis_client_rejected_frames",
+        name="Rejected frames",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:close-circle-outline",
+        polled=True,
+        value_fn=lambda coordinator: coordinator.stats.rejected,
+    ),
+    SolisListenerSensorEntityDescription(
+        key="solis_client_duplicate_frames",
+        name="Duplicate frames",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:content-copy",
+        polled=True,
+        value_fn=lambda coordinator: coordinator.stats.duplicates,
+    ),
+    SolisListenerSensorEntityDescription(
+        key="solis_client_decode_time_p95",
+        name="Decode time p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement="µs",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-outline",
+        polled=True,
+        value_fn=lambda coordinator: round(coordinator.stats.decode_ns.percentile(95) / 1000, 1),
+    ),
+    SolisListenerSensorEntityDescription(
+        key="solis_client_ingest_latency_p95",
+        name="Ingest latency p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement="ms",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        icon="mdi:timer-sand",
+        polled=True,
+        value_fn=lambda coordinator: round(coordinator.stats.ingest_ns.percentile(95) / 1e6, 2),
+    ),
 ]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     coordinator: SolisDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
-    async_add_entities([SolisCoordinatorSensor(coordinator, entry, desc) for desc in ENTITIES], True)
+    async_add_entities([SolisListenerSensor(coordinator, entry, desc) for desc in LISTENER_ENTITIES])
+
+    # serial -> description keys that already have an entity
+    created: dict[str, set[str]] = {}
 
+    @callback
+    def _async_add_sensors(serials: list[str]) -> None:
+        # every serial gets its own device, with entities only for the fields
+        # its frames actually carry; the set grows when new fields show up
+        entities = []
+        for serial in serials:
+            existing = created.setdefault(serial, set())
+            for desc in descriptions_for((coordinator.data or {}).get(serial) or {}):
+                if desc.key not in existing:
+                    existing.add(desc.key)
+                    entities.append(SolisCoordinatorSensor(coordinator, entry, serial, desc))
+        if entities:
+            async_add_entities(entities)
 
-class SolisCoordinatorSensor(CoordinatorEntity, SensorEntity):
-    def __init__(self, coordinator: SolisDataUpdateCoordinator, entry: ConfigEntry, description: SolisSensorEntityDescription):
-        super().__init__(coordinator)
+    # serials announced since the last flush
+    pending: set[str] = set()
+
+    @callback
+    def _async_flush_pending() -> None:
+        serials = list(pending)
+        pending.clear()
+        _async_add_sensors(serials)
+
+    @callback
+    def _async_add_serial(serial: str) -> None:
+        # inverters announced in the same loop iteration (e.g. a fleet
+        # reconnecting after a restart) are added in one batch
+        if not pending:
+            hass.loop.call_soon(_async_flush_pending)
+        pending.add(serial)
+
+    if coordinator.data:
+        _async_add_sensors(list(coordinator.data))
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, coordinator.signal_new_inverter, _async_add_serial)
+    )
+    entry.async_on_unload(async_dispatcher_connect(hass, coordinator.signal_new_keys, _async_add_serial))
+
+
+class SolisCoordinatorSensor(SensorEntity):
+    # not a CoordinatorEntity: state is written per changed key through
+    # async_add_key_listener, never for the whole coordinator
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: SolisDataUpdateCoordinator,
+        entry: ConfigEntry,
+        serial: str,
+        description: SolisSensorEntityDescription,
+    ):
+        self.coordinator = coordinator
         self.entity_description = description
         self._entry = entry
+        self._serial = serial
         # friendly name: use description name only (e.g. "Current power")
         self._attr_name = description.name
-        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        if serial == entry.unique_id:
+            # inverter that owned this entry before the listener served a fleet;
+            # keep its unique ids so existing entities and history are reused
+            self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        else:
+            self._attr_unique_id = f"{entry.entry_id}_{serial}_{description.key}"
 
-        # Device info is provided via the `device_info` property so it can
-        # reflect the parsed `serialno` from the coordinator when available.
+        # the coordinator registers the device once per serial; entities only
+        # reference it, so adding them does not write the device registry
+        self._attr_device_info = DeviceInfo(identifiers={(DOMAIN, serial)})
+        # plain fields are read by index, bound once here
+        self._index = field_index(description.data_keys[0]) if description.value_fn is None else None
 
         # expose device info from the description so HA picks up unit, device class and icon
         if description.device_class:
@@ -184,90 +537,75 @@ class SolisCoordinatorSensor(CoordinatorEntity, SensorEntity):
             self._attr_native_unit_of_measurement = description.native_unit_of_measurement
         if description.icon:
             self._attr_icon = description.icon
-        # internal flag to avoid re-registering device multiple times
-        self._device_registered = False
-        self._unsub_listener = None
+
+    @property
+    def _sample(self) -> Sample | dict:
+        return (self.coordinator.data or {}).get(self._serial) or {}
+
+    @property
+    def available(self) -> bool:
+        # unavailable while the inverter is overdue (see staleness.py)
+        return self.coordinator.is_online(self._serial)
 
     async def async_added_to_hass(self) -> None:
         await super().async_added_to_hass()
-        # listen for coordinator updates so we can register real device when serial arrives
-        self._unsub_listener = self.coordinator.async_add_listener(self._handle_coord_update)
-        # try immediately in case serial already present
-        await self._maybe_register_device()
-
-    async def async_will_remove_from_hass(self) -> None:
-        if self._unsub_listener:
-            self._unsub_listener()
-            self._unsub_listener = None
-        await super().async_will_remove_from_hass()
-
-    async def _handle_coord_update(self) -> None:
-        await self._maybe_register_device()
-
-    async def _maybe_register_device(self) -> None:
-        if self._device_registered:
-            return
-        data = self.coordinator.data or {}
-        serial = data.get("serialno")
-        if not serial:
-            return
-
-        # create device in device registry with the real serial
-        from homeassistant.helpers import device_registry as dr, entity_registry as er
-
-        dev_reg = dr.async_get(self.hass)
-        device = dev_reg.async_get_or_create(
-            config_entry_id=self._entry.entry_id,
-            identifiers={(DOMAIN, str(serial))},
-            name=data.get("device_name") or data.get("name") or f"Solis {serial}",
-            manufacturer="Solis",
-            model=data.get("model"),
+        # only write state when a key this entity reads actually changed
+        self.async_on_remove(
+            self.coordinator.async_add_key_listener(
+                self._serial, self.entity_description.data_keys, self._handle_sample_update
+            )
         )
 
-        # move this entity to the new device (if it was created under a different one)
-        ent_reg = er.async_get(self.hass)
-        ent = ent_reg.async_get(self.entity_id)
-        if ent and ent.device_id != device.id:
-            ent_reg.async_update_entity(ent.entity_id, new_device_id=device.id)
-
-        # optionally update config entry unique_id to serial so entry shows serial
-        try:
-            self.hass.config_entries.async_update_entry(self._entry, unique_id=str(serial))
-        except Exception:
-            pass
-
-        self._device_registered = True
-        # no longer need the listener
-        if self._unsub_listener:
-            self._unsub_listener()
-            self._unsub_listener = None
+    @callback
+    def _handle_sample_update(self) -> None:
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> Any:
-        data = self.coordinator.data or {}
-        return self.entity_description.value_fn(data)
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return a DeviceInfo that uses parsed `serialno` when available."""
-        data = self.coordinator.data or {}
-        serial = data.get("serialno") or getattr(self._entry, "unique_id", None) or self._entry.entry_id
-        name = data.get("device_name") or data.get("name") or getattr(self._entry, "title", None) or f"Solis {serial}"
-        model = data.get("model")
-        return DeviceInfo(
-            identifiers={(DOMAIN, str(serial))},
-            name=name,
-            manufacturer="Solis",
-            model=model,
-        )
+        if self._index is None:
+            return self.entity_description.value_fn(self._sample)
+        sample = (self.coordinator.data or {}).get(self._serial)
+        return sample.value(self._index) if sample is not None else None
 
     @property
     def extra_state_attributes(self) -> dict:
-        data = self.coordinator.data or {}
+        data = self._sample
         # let the description decide which attributes to expose for this entity
         try:
             return dict(self.entity_description.attributes_fn(data) or {})
         except Exception:
             _LOGGER = __import__("logging").getLogger(__name__)
             _LOGGER.exception("attributes_fn failed")
-            return {}
\ No newline at end of file
+            return {}
+
+
+class SolisListenerSensor(SensorEntity):
+    """Diagnostic sensor describing the TCP listener itself."""
+
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: SolisDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: SolisListenerSensorEntityDescription,
+    ):
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_should_poll = description.polled
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Solis listener",
+            manufacturer="Solis",
+            entry_type=DeviceEntryType.SERVICE,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        if not self.entity_description.polled:
+            self.async_on_remove(self.coordinator.async_add_diagnostics_listener(self.async_write_ha_state))
+
+    @property
+    def native_value(self) -> Any:
+        return self.entity_description.value_fn(self.coordinator)
@@ -0,0 +1,244 @@
+"""Services of the Solis Client integration."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import logging
+from typing import TYPE_CHECKING, Optional
+
+import voluptuous as vol
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticMetaData
+from homeassistant.components.recorder.statistics import (
+    async_import_statistics,
+    statistic_during_period,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfEnergy, UnitOfPower
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .const import ARCHIVE_DIR, DOMAIN
+
+if TYPE_CHECKING:
+    from homeassistant.config_entries import ConfigEntry
+
+    from .backfill import HourlyStatistics
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_BACKFILL_STATISTICS = "backfill_statistics"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_PATH = "path"
+ATTR_SERIAL = "serial"
+ATTR_START = "start"
+ATTR_END = "end"
+
+# sensors whose long-term statistics are backfilled
+ENERGY_KEY = "csolis_client_umulative_production_active"
+POWER_KEY = "solis_client_current_power"
+# rows handed to the recorder per import call
+IMPORT_BATCH_SIZE = 1000
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_PATH): cv.string,
+        vol.Optional(ATTR_SERIAL): cv.string,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration's services once."""
+    if hass.services.has_service(DOMAIN, SERVICE_BACKFILL_STATISTICS):
+        return
+
+    async def _async_backfill(call: ServiceCall) -> None:
+        await _async_backfill_statistics(hass, call)
+
+    hass.services.async_register(DOMAIN, SERVICE_BACKFILL_STATISTICS, _async_backfill, schema=BACKFILL_SCHEMA)
+
+
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the integration's services once no entry is left."""
+    hass.services.async_remove(DOMAIN, SERVICE_BACKFILL_STATISTICS)
+
+
+def _entry_for(hass: HomeAssistant, entry_id: Optional[str]) -> ConfigEntry:
+    entries = {data["entry"].entry_id: data["entry"] for data in hass.data.get(DOMAIN, {}).values()}
+    if entry_id is not None:
+        if entry_id not in entries:
+            raise HomeAssistantError(f"Config entry {entry_id} is not loaded")
+        return entries[entry_id]
+    if len(entries) != 1:
+        raise HomeAssistantError("Select the config entry to backfill")
+    return next(iter(entries.values()))
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    return dt_util.as_utc(dt_util.as_local(value) if value.tzinfo is None else value).timestamp()
+
+
+async def _async_backfill_statistics(hass: HomeAssistant, call: ServiceCall) -> None:
+    entry = _entry_for(hass, call.data.get(ATTR_CONFIG_ENTRY_ID))
+    if ATTR_PATH in call.data:
+        path = hass.config.path(call.data[ATTR_PATH])
+        if not hass.config.is_allowed_path(path):
+            raise HomeAssistantError(f"Access to {path} is not allowed")
+    else:
+        path = hass.config.path(ARCHIVE_DIR, entry.entry_id)
+
+    # numpy is only needed here, so the module is imported on demand
+    from .backfill import load_hourly_statistics
+
+    try:
+        hourly = await hass.async_add_executor_job(
+            load_hourly_statistics,
+            path,
+            call.data.get(ATTR_SERIAL),
+            _timestamp(call.data.get(ATTR_START)),
+            _timestamp(call.data.get(ATTR_END)),
+        )
+    except OSError as err:
+        raise HomeAssistantError(f"Cannot read {path}: {err}") from err
+
+    registry = er.async_get(hass)
+    for statistics in hourly:
+        await _async_import(hass, registry, entry, statistics)
+
+
+def _entity_id(registry: er.EntityRegistry, entry: ConfigEntry, serial: str, key: str) -> Optional[str]:
+    # the first inverter keeps the unique ids from before multi-inverter support
+    if serial == entry.unique_id:
+        unique_id = f"{entry.entry_id}_{key}"
+    else:
+        unique_id = f"{entry.entry_id}_{serial}_{key}"
+    return registry.async_get_entity_id("sensor", DOMAIN, unique_id)
+
+
+async def _async_import(
+    hass: HomeAssistant, registry: er.EntityRegistry, entry: ConfigEntry, statistics: HourlyStatistics
+) -> None:
+    if not len(statistics.start):
+        return
+    starts = [dt_util.utc_from_timestamp(float(start)) for start in statistics.start]
+
+    energy_id = _entity_id(registry, entry, statistics.serial, ENERGY_KEY)
+    if energy_id is None:
+        _LOGGER.warning("No energy sensor for inverter %s; skipping its statistics", statistics.serial)
+    else:
+        # start -> (state, energy produced in the hour)
+        imported: dict[datetime, tuple[float, float]] = {}
+        previous = 0.0
+        for start, state, total in zip(starts, statistics.energy_state, statistics.energy_sum):
+            imported[start] = (float(state), float(total) - previous)
+            previous = float(total)
+        # continue the sum of whatever the recorder has before the backfilled range
+        offset = await _async_sum_before(hass, energy_id, starts[0])
+        rows = await _async_merge_recorded(hass, energy_id, imported, offset)
+        _async_import_batches(
+            hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=None,
+                source="recorder",
+                statistic_id=energy_id,
+                unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            ),
+            rows,
+        )
+
+    power_id = _entity_id(registry, entry, statistics.serial, POWER_KEY)
+    if power_id is not None:
+        rows = [
+            {"start": start, "mean": float(mean), "min": float(low), "max": float(high)}
+            for start, mean, low, high in zip(
+                starts, statistics.power_mean, statistics.power_min, statistics.power_max
+            )
+        ]
+        _async_import_batches(
+            hass,
+            StatisticMetaData(
+                has_mean=True,
+                has_sum=False,
+                name=None,
+                source="recorder",
+                statistic_id=power_id,
+                unit_of_measurement=UnitOfPower.WATT,
+            ),
+            rows,
+        )
+    _LOGGER.info("Backfilled %d hours of statistics for inverter %s", len(starts), statistics.serial)
+
+
+async def _async_sum_before(hass: HomeAssistant, statistic_id: str, start: datetime) -> float:
+    """Return the recorded sum at ``start``, or 0."""
+    # the change since the first statistics is the last sum; the recorder
+    # looks it up without loading the rows in between
+    before = await get_instance(hass).async_add_executor_job(
+        statistic_during_period, hass, None, start, statistic_id, {"change"}, None
+    )
+    return float(before.get("change") or 0.0)
+
+
+async def _async_merge_recorded(
+    hass: HomeAssistant, statistic_id: str, imported: dict[datetime, tuple[float, float]], offset: float
+) -> list[dict]:
+    """Merge the imported hours into the statistics recorded from the first one on.
+
+    Imported hours replace recorded ones. Recorded hours in between and
+    after keep their own increase, but every sum is carried on from the
+    imported ones, so hours after the range are not left with their old
+    sums. A recorded hour right after imported ones counts from the last
+    imported state, as its recorded increase already covers what the import
+    now counts (e.g. an outage of Home Assistant).
+    """
+    recorded = await get_instance(hass).async_add_executor_job(
+        statistics_during_period,
+        hass,
+        min(imported),
+        None,
+        {statistic_id},
+        "hour",
+        None,
+        {"state", "sum"},
+    )
+    existing = {dt_util.utc_from_timestamp(row["start"]): row for row in recorded.get(statistic_id, ())}
+
+    rows = []
+    total = recorded_sum = offset
+    # state of the previous hour, if it was imported
+    last_state: Optional[float] = None
+    for start in sorted(imported.keys() | existing.keys()):
+        increase = 0.0
+        row = existing.get(start)
+        if row is not None and row.get("sum") is not None:
+            increase = row["sum"] - recorded_sum
+            recorded_sum = row["sum"]
+        if start in imported:
+            state, increase = imported[start]
+            last_state = state
+        else:
+            state = row.get("state")
+            if last_state is not None and state is not None and state >= last_state:
+                increase = state - last_state
+            last_state = None
+        total += increase
+        rows.append({"start": start, "state": state, "sum": total})
+    return rows
+
+
+def _async_import_batches(hass: HomeAssistant, metadata: StatisticMetaData, rows: list[dict]) -> None:
+    # the recorder queues each call as one task; bounded batches keep a
+    # months long import from becoming one huge transaction
+    for index in range(0, len(rows), IMPORT_BATCH_SIZE):
+        async_import_statistics(hass, metadata, rows[index : index + IMPORT_BATCH_SIZE])
@@ -0,0 +1,133 @@
+"""Learned report intervals and overdue deadlines of every inverter, on one heap."""
+
+from __future__ import annotations
+
+from heapq import heappop, heappush
+from math import inf
+from typing import Optional
+
+DEFAULT_FACTOR = 3.0
+# seconds; loggers push every 5 minutes, assumed until an interval is learned
+DEFAULT_INTERVAL = 300.0
+MIN_TIMEOUT = 60.0
+# weight of the newest interval in the average
+ALPHA = 0.2
+# closer arrivals (e.g. two frame types of one report) are not an interval
+MIN_INTERVAL = 1.0
+
+
+class _Serial:
+    __slots__ = ("last", "interval", "deadline", "scheduled", "online")
+
+    def __init__(self, last: float, interval: Optional[float]):
+        self.last = last
+        # None until two samples arrived
+        self.interval = interval
+        self.deadline = inf
+        # deadline of this serial's live heap entry, inf if it has none
+        self.scheduled = inf
+        self.online = True
+
+
+class StalenessTracker:
+    """Learned report intervals and overdue deadlines of every serial."""
+
+    def __init__(
+        self,
+        factor: float = DEFAULT_FACTOR,
+        default_interval: float = DEFAULT_INTERVAL,
+        min_timeout: float = MIN_TIMEOUT,
+    ):
+        self.factor = factor
+        self.default_interval = default_interval
+        self.min_timeout = min_timeout
+        self._serials: dict[str, _Serial] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._serials)
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """Earliest time ``expire`` may have something to report."""
+        return self._heap[0][0] if self._heap else None
+
+    def seen(self, serial: str, now: float) -> bool:
+        """Record a sample of ``serial``; return True if it was overdue."""
+        state = self._serials.get(serial)
+        if state is None:
+            state = self._serials[serial] = _Serial(now, None)
+            self._schedule(serial, state, now)
+            return False
+        returned = not state.online
+        if returned:
+            # the gap is an outage, not a report interval
+            state.online = True
+        else:
+            interval = now - state.last
+            if interval >= MIN_INTERVAL:
+                if state.interval is None:
+                    state.interval = interval
+                else:
+                    state.interval += ALPHA * (interval - state.interval)
+        self._schedule(serial, state, now)
+        return returned
+
+    def restore(self, serial: str, now: float, interval: Optional[float]) -> None:
+        """Track ``serial`` as if it reported at ``now``, with a stored interval."""
+        if serial in self._serials:
+            return
+        state = self._serials[serial] = _Serial(now, interval)
+        self._schedule(serial, state, now)
+
+    def expire(self, now: float) -> list[str]:
+        """Return the serials that became overdue by ``now``."""
+        heap = self._heap
+        serials = self._serials
+        expired = []
+        while heap and heap[0][0] <= now:
+            scheduled, serial = heappop(heap)
+            state = serials.get(serial)
+            if state is None or state.scheduled != scheduled:
+                # superseded by an earlier entry
+                continue
+            if state.deadline > now:
+                state.scheduled = state.deadline
+                heappush(heap, (state.deadline, serial))
+                continue
+            state.scheduled = inf
+            state.online = False
+            expired.append(serial)
+        return expired
+
+    def online(self, serial: str) -> bool:
+        state = self._serials.get(serial)
+        return state is None or state.online
+
+    def interval(self, serial: str) -> Optional[float]:
+        """The learned report interval of ``serial``, if any."""
+        state = self._serials.get(serial)
+        return state.interval if state is not None else None
+
+    def timeout(self, interval: Optional[float]) -> float:
+        if interval is None:
+            interval = self.default_interval
+        return max(self.factor * interval, self.min_timeout)
+
+    def _schedule(self, serial: str, state: _Serial, now: float) -> None:
+        state.last = now
+        state.deadline = now + self.timeout(state.interval)
+        # a later deadline is picked up when the current entry comes due
+        if state.deadline < state.scheduled:
+            state.scheduled = state.deadline
+            heappush(self._heap, (state.deadline, serial))
+
+    def as_dict(self, now: float) -> dict:
+        return {
+            serial: {
+                "interval": round(state.interval, 1) if state.interval is not None else None,
+                "online": state.online,
+                "overdue_in": round(state.deadline - now, 1) if state.online else None,
+            }
+            for serial, state in self._serials.items()
+        }
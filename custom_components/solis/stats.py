@@ -0,0 +1,108 @@
+"""Cheap always-on counters and histograms for the listener."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+
+class Histogram:
+    """Histogram of nanosecond durations in power-of-two buckets."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    BUCKETS = 40  # 2**39 ns is roughly nine minutes
+
+    def __init__(self) -> None:
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        self.counts[min(value.bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, pct: float) -> int:
+        """Upper bound (ns) of the bucket holding the ``pct`` percentile."""
+        if not self.count:
+            return 0
+        threshold = self.count * pct / 100
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= threshold:
+                return min(1 << bucket, self.max)
+        return self.max
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total / self.count / 1000, 2) if self.count else 0,
+            "p50_us": round(self.percentile(50) / 1000, 2),
+            "p95_us": round(self.percentile(95) / 1000, 2),
+            "p99_us": round(self.percentile(99) / 1000, 2),
+            "max_us": round(self.max / 1000, 2),
+        }
+
+
+class ListenerStats:
+    """Counters shared by every connection of one listener."""
+
+    __slots__ = (
+        "frames",
+        "bytes",
+        "samples",
+        "rejected",
+        "duplicates",
+        "coalesced",
+        "parse_failures",
+        "unexpected_sizes",
+        "decode_ns",
+        "ingest_ns",
+        "coalesce_ns",
+    )
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.bytes = 0
+        self.samples = 0
+        # frames dropped for a bad checksum
+        self.rejected = 0
+        # retransmitted frames acknowledged but not decoded
+        self.duplicates = 0
+        # samples replaced by a newer one of the same serial before being applied
+        self.coalesced = 0
+        # reason -> count
+        self.parse_failures: Counter[str] = Counter()
+        # frame size -> count, for frames no layout matched
+        self.unexpected_sizes: Counter[int] = Counter()
+        # time spent decoding one frame
+        self.decode_ns = Histogram()
+        # frame arrival to entity state write
+        self.ingest_ns = Histogram()
+        # time a sample waited for its coalescing window to close
+        self.coalesce_ns = Histogram()
+
+    @property
+    def parse_failure_count(self) -> int:
+        return sum(self.parse_failures.values())
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "bytes": self.bytes,
+            "samples": self.samples,
+            "rejected": self.rejected,
+            "duplicates": self.duplicates,
+            "coalesced": self.coalesced,
+            "parse_failures": dict(self.parse_failures),
+            "unexpected_sizes": {str(size): count for size, count in self.unexpected_sizes.items()},
+            "decode_time": self.decode_ns.as_dict(),
+            "ingest_latency": self.ingest_ns.as_dict(),
+            "coalesce_delay": self.coalesce_ns.as_dict(),
+        }
@@ -0,0 +1,107 @@
+"""Sampled packet tracing, formatted and written off the receive path."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import deque
+from pathlib import Path
+from typing import Awaitable, Callable, Iterable, Mapping, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+# records kept while the writer catches up; older ones are dropped first
+DEFAULT_QUEUE_SIZE = 1000
+# the trace file is rotated to ``<name>.1`` past this size
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+
+class PacketTracer:
+    """Bounded, sampled trace of received frames written to a file."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        executor: Callable[..., Awaitable],
+        sample_rate: float = 1.0,
+        serials: Optional[Iterable[str]] = None,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+    ):
+        self.path = Path(path)
+        self._executor = executor
+        self.sample_rate = sample_rate
+        self.serials = frozenset(serials) if serials else None
+        self.max_file_size = max_file_size
+        self._queue: deque = deque(maxlen=queue_size)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def wants(self, serial: Optional[str]) -> bool:
+        """Return True if a frame from ``serial`` should be traced."""
+        if self.serials is not None and serial not in self.serials:
+            return False
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def record(self, peer: Optional[str], serial: Optional[str], frame: bytes, sample: Optional[Mapping]) -> None:
+        """Queue a frame; rendering is deferred to the writer."""
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+        self._queue.append((time.time(), peer, serial, frame, sample))
+        self._wakeup.set()
+
+    def start(self, create_task: Callable[[Awaitable], asyncio.Task]) -> None:
+        self._task = create_task(self._run())
+
+    async def async_stop(self) -> None:
+        """Stop the writer after flushing what is queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._drain()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._drain()
+
+    async def _drain(self) -> None:
+        if not self._queue:
+            return
+        batch = list(self._queue)
+        self._queue.clear()
+        try:
+            await self._executor(self._write, batch)
+        except Exception:
+            _LOGGER.exception("Failed to write %d trace records", len(batch))
+
+    def _write(self, batch: list) -> None:
+        lines = []
+        for timestamp, peer, serial, frame, sample in batch:
+            lines.append(
+                json.dumps(
+                    {
+                        "time": timestamp,
+                        "peer": peer,
+                        "serial": serial,
+                        "frame": frame.hex(),
+                        "sample": dict(sample) if sample is not None else None,
+                    },
+                    default=str,
+                )
+            )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size > self.max_file_size:
+            self.path.replace(self.path.with_name(self.path.name + ".1"))
+        with open(self.path, "a", encoding="utf-8") as trace_file:
+            trace_file.write("\n".join(lines) + "\n")
@@ -0,0 +1,58 @@
+"""Frames for the tests, built the way loggers send them."""
+
+from __future__ import annotations
+
+import struct
+
+from custom_components.solis.frame import (
+    END_BYTE,
+    LEGACY_END_BYTE,
+    LEGACY_START_BYTE,
+    START_BYTE,
+    V5_HEADER,
+    checksum,
+)
+from custom_components.solis.layouts import GINLONG_103
+
+LOGGER_SERIAL = 1234567890
+INVERTER_SERIAL = "110F000022000000"
+
+
+def legacy_frame(power: float = 1500.0, energy: float = 10000.0, serial: str = INVERTER_SERIAL) -> bytes:
+    """A 103-byte inverter sample."""
+    values = {
+        "serialno": serial,
+        "inv_t0": 35.0,
+        "dv1": 320.0,
+        "dv2": 310.0,
+        "av1": 230.0,
+        "a_fo1": 50.0,
+        "current_power_apo_t1_W": power,
+        "et_ge0": energy,
+        "hr_ege_t1": 5000.0,
+        "inverter_status": 1,
+    }
+    buf = bytearray(GINLONG_103.size)
+    buf[0] = LEGACY_START_BYTE
+    buf[1] = GINLONG_103.size - 14
+    struct.pack_into(">H", buf, 2, 0x51B1)
+    for fld in GINLONG_103.fields:
+        value = values[fld.name]
+        if fld.text:
+            value = value.encode("ascii").ljust(fld.size, b"\x00")
+        elif fld.divisor is not None:
+            value = round(value * fld.divisor)
+        struct.pack_into(">" + fld.code, buf, fld.offset, value)
+    buf[-2] = checksum(buf[1:-2])
+    buf[-1] = LEGACY_END_BYTE
+    return bytes(buf)
+
+
+def v5_frame(control: int, sequence: int, payload: bytes = b"\x00", logger: int = LOGGER_SERIAL) -> bytes:
+    """A Solarman V5 frame, e.g. a hello or heartbeat."""
+    frame = bytearray(V5_HEADER.size + len(payload) + 2)
+    V5_HEADER.pack_into(frame, 0, START_BYTE, len(payload), control, sequence, 0, logger)
+    frame[V5_HEADER.size : -2] = payload
+    frame[-2] = checksum(frame[1:-2])
+    frame[-1] = END_BYTE
+    return bytes(frame)
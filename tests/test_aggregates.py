@@ -0,0 +1,108 @@
+"""Energy aggregates: counter resets, glitches and period rollover."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from custom_components.solis.aggregates import (
+    ENERGY_MONTH,
+    ENERGY_TODAY,
+    ENERGY_YEAR,
+    INTERVAL_ENERGY,
+    MAX_PRODUCTION_GAP,
+    PEAK_POWER_TODAY,
+    PRODUCTION_TIME_TODAY,
+    EnergyAggregate,
+)
+
+DAY = date(2026, 6, 15)
+
+
+def feed(aggregate: EnergyAggregate, totals, day: date = DAY, start: float = 0.0, step: float = 60.0) -> None:
+    for n, total in enumerate(totals):
+        aggregate.update(day, start + n * step, total, 1000.0)
+
+
+def test_energy_is_the_sum_of_increases():
+    aggregate = EnergyAggregate()
+    feed(aggregate, [100.0, 100.5, 101.25])
+    values = aggregate.values()
+    assert values[ENERGY_TODAY] == pytest.approx(1.25)
+    assert values[ENERGY_MONTH] == pytest.approx(1.25)
+    assert values[ENERGY_YEAR] == pytest.approx(1.25)
+    assert values[INTERVAL_ENERGY] == pytest.approx(0.75)
+
+
+def test_single_low_reading_is_ignored():
+    aggregate = EnergyAggregate()
+    feed(aggregate, [100.0, 0.0, 100.5])
+    assert aggregate.values()[ENERGY_TODAY] == pytest.approx(0.5)
+    assert aggregate.low_total is None
+
+
+def test_reset_is_counted_once_confirmed():
+    aggregate = EnergyAggregate()
+    feed(aggregate, [100.0, 0.5])
+    # unconfirmed: nothing counted yet
+    assert aggregate.values()[ENERGY_TODAY] == 0.0
+    assert aggregate.low_total == 0.5
+    aggregate.update(DAY, 120.0, 1.0, 1000.0)
+    assert aggregate.values()[ENERGY_TODAY] == pytest.approx(0.5)
+    assert aggregate.last_total == 1.0
+    aggregate.update(DAY, 180.0, 1.5, 1000.0)
+    assert aggregate.values()[ENERGY_TODAY] == pytest.approx(1.0)
+
+
+def test_missing_total_keeps_the_last_one():
+    aggregate = EnergyAggregate()
+    feed(aggregate, [100.0, None, 100.5])
+    assert aggregate.values()[ENERGY_TODAY] == pytest.approx(0.5)
+
+
+def test_midnight_resets_the_day_only():
+    aggregate = EnergyAggregate()
+    feed(aggregate, [100.0, 101.0])
+    aggregate.update(date(2026, 6, 16), 120.0, 101.5, 200.0)
+    values = aggregate.values()
+    assert values[ENERGY_TODAY] == pytest.approx(0.5)
+    assert values[ENERGY_MONTH] == pytest.approx(1.5)
+    assert values[ENERGY_YEAR] == pytest.approx(1.5)
+    assert values[PEAK_POWER_TODAY] == 200.0
+
+
+def test_month_and_year_rollover():
+    aggregate = EnergyAggregate()
+    feed(aggregate, [100.0, 101.0], day=date(2026, 11, 30))
+    aggregate.update(date(2026, 12, 1), 120.0, 102.0, 0.0)
+    assert aggregate.values()[ENERGY_MONTH] == pytest.approx(1.0)
+    assert aggregate.values()[ENERGY_YEAR] == pytest.approx(2.0)
+    aggregate.update(date(2027, 1, 1), 180.0, 103.0, 0.0)
+    assert aggregate.values()[ENERGY_MONTH] == pytest.approx(1.0)
+    assert aggregate.values()[ENERGY_YEAR] == pytest.approx(1.0)
+
+
+def test_rollover_reports_whether_anything_was_reset():
+    aggregate = EnergyAggregate()
+    assert not aggregate.rollover(DAY)
+    assert not aggregate.rollover(DAY)
+    assert aggregate.rollover(date(2026, 6, 16))
+
+
+def test_production_time_skips_long_gaps_and_zero_power():
+    aggregate = EnergyAggregate()
+    aggregate.update(DAY, 0.0, 100.0, 500.0)
+    aggregate.update(DAY, 1800.0, 100.5, 500.0)
+    aggregate.update(DAY, 3600.0, 101.0, 0.0)
+    assert aggregate.production_seconds_today == MAX_PRODUCTION_GAP
+    assert aggregate.values()[PRODUCTION_TIME_TODAY] == round(MAX_PRODUCTION_GAP / 3600, 2)
+
+
+def test_round_trip_keeps_a_pending_reset():
+    aggregate = EnergyAggregate()
+    feed(aggregate, [100.0, 100.5, 0.5])
+    restored = EnergyAggregate.from_dict(aggregate.as_dict())
+    assert restored.as_dict() == aggregate.as_dict()
+    restored.update(DAY, 300.0, 1.0, 1000.0)
+    assert restored.values()[ENERGY_TODAY] == pytest.approx(1.0)
@@ -0,0 +1,65 @@
+"""Hourly statistics decoded in bulk from archived frames."""
+
+from __future__ import annotations
+
+import pytest
+from helpers import legacy_frame
+
+from custom_components.solis.backfill import (
+    energy_increase,
+    hourly_statistics,
+    load_samples,
+)
+
+# backfill imports numpy only where it is used
+np = pytest.importorskip("numpy")
+
+HOUR = 1_700_000_000 // 3600 * 3600
+
+
+def samples(totals, serial: bytes = b"S1", step: float = 600.0) -> dict:
+    count = len(totals)
+    return {
+        "time": HOUR + np.arange(count) * step,
+        "serialno": np.full(count, serial, dtype="S16"),
+        "et_ge0": np.asarray(totals, dtype=np.float64),
+        "current_power_apo_t1_W": np.full(count, 1000.0),
+    }
+
+
+def test_increase_ignores_a_single_low_reading():
+    increase = energy_increase(np.array([100.0, 100.5, 0.0, 101.0]))
+    assert increase.tolist() == [0.0, 0.5, 0.0, 0.5]
+
+
+def test_increase_counts_a_confirmed_reset_from_the_first_low_reading():
+    increase = energy_increase(np.array([100.0, 0.5, 1.0, 1.5]))
+    assert increase.tolist() == [0.0, 0.0, 0.5, 0.5]
+
+
+def test_increase_keeps_waiting_while_readings_keep_dropping():
+    increase = energy_increase(np.array([100.0, 50.0, 20.0, 20.5, 21.0]))
+    assert increase.tolist() == [0.0, 0.0, 0.0, 0.5, 0.5]
+
+
+def test_first_hour_keeps_its_energy():
+    # six samples per hour, two hours
+    (rows,) = hourly_statistics(samples([10.0, 10.1, 10.2, 10.3, 10.4, 10.5, 10.6, 10.7, 10.8, 10.9, 11.0, 11.1]))
+    assert rows.serial == "S1"
+    assert rows.start.tolist() == [HOUR, HOUR + 3600]
+    assert rows.energy_state.tolist() == [10.5, 11.1]
+    assert rows.energy_sum == pytest.approx([0.5, 1.1])
+
+
+def test_glitch_in_an_hour_does_not_add_the_lifetime_total():
+    (rows,) = hourly_statistics(samples([10.0, 10.1, 0.0, 10.3, 10.4, 10.5, 10.6]))
+    assert rows.energy_sum == pytest.approx([0.5, 0.6])
+
+
+def test_frames_are_decoded_per_serial():
+    frames = [(HOUR + n * 300.0, legacy_frame(energy=1000.0 + n)) for n in range(4)]
+    frames.append((HOUR, legacy_frame(energy=5.0, serial="110F000099000000")))
+    decoded = load_samples(iter(frames))
+    first, second = sorted(hourly_statistics(decoded), key=lambda rows: rows.serial)
+    assert first.energy_sum.tolist() == [3.0]
+    assert second.energy_state.tolist() == [5.0]
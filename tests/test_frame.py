@@ -0,0 +1,90 @@
+"""Frame reassembly, resynchronisation, checksums and acks."""
+
+from __future__ import annotations
+
+import random
+
+from helpers import LOGGER_SERIAL, legacy_frame, v5_frame
+
+from custom_components.solis.frame import (
+    CONTROL_HEARTBEAT,
+    CONTROL_HELLO,
+    V5_HEADER,
+    build_ack,
+    control_code,
+    frame_valid,
+    split_frames,
+)
+
+
+def reassemble(chunks) -> list[bytes]:
+    """Feed ``chunks`` through a buffer the way the listener does."""
+    buffer = bytearray()
+    frames = []
+    for chunk in chunks:
+        buffer += chunk
+        found, consumed = split_frames(buffer)
+        frames.extend(bytes(buffer[offset : offset + size]) for offset, size in found)
+        del buffer[:consumed]
+    return frames
+
+
+def stream() -> list[bytes]:
+    return [
+        v5_frame(CONTROL_HELLO, 1, bytes(60)),
+        legacy_frame(power=1200.0),
+        v5_frame(CONTROL_HEARTBEAT, 2),
+        legacy_frame(power=1300.0, energy=10000.1),
+    ]
+
+
+def test_frames_split_at_any_point_are_reassembled():
+    frames = stream()
+    data = b"".join(frames)
+    rnd = random.Random(0)
+    for _ in range(50):
+        cuts = sorted(rnd.sample(range(1, len(data)), 8))
+        chunks = [data[a:b] for a, b in zip([0, *cuts], [*cuts, len(data)])]
+        assert reassemble(chunks) == frames
+
+
+def test_one_byte_reads_are_reassembled():
+    frames = stream()
+    data = b"".join(frames)
+    assert reassemble(data[i : i + 1] for i in range(len(data))) == frames
+
+
+def test_garbage_between_frames_is_skipped():
+    frames = stream()
+    data = b"\x00\xff" + frames[0] + b"junk" + frames[1] + b"\x16\x15" + frames[2] + frames[3]
+    assert reassemble([data]) == frames
+
+
+def test_start_byte_with_huge_length_does_not_stall_the_stream():
+    frames = stream()
+    assert reassemble([b"\xa5\xff\xff", *frames]) == frames
+
+
+def test_partial_frame_is_kept_for_the_next_read():
+    frame = legacy_frame()
+    buffer = bytearray(frame[:50])
+    assert split_frames(buffer) == ([], 0)
+    buffer += frame[50:]
+    assert split_frames(buffer) == ([(0, len(frame))], len(frame))
+
+
+def test_checksum():
+    frame = bytearray(legacy_frame())
+    assert frame_valid(frame, 0, len(frame))
+    frame[40] ^= 0x01
+    assert not frame_valid(frame, 0, len(frame))
+
+
+def test_ack_echoes_sequence_and_serial():
+    frame = v5_frame(CONTROL_HEARTBEAT, 7)
+    ack = build_ack(frame, 0, now=1_700_000_000)
+    assert frame_valid(ack, 0, len(ack))
+    assert control_code(ack, 0) == CONTROL_HEARTBEAT - 0x3000
+    _, _, _, sequence, _, serial = V5_HEADER.unpack_from(ack)
+    assert (sequence, serial) == (7, LOGGER_SERIAL)
+    assert build_ack(legacy_frame(), 0) is None
@@ -0,0 +1,104 @@
+"""Option changes on a loaded entry, with Home Assistant's test harness."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import pytest
+from helpers import INVERTER_SERIAL, legacy_frame
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PORT
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.solis.const import (
+    CONF_BIND_ADDRESS,
+    CONF_COALESCE_WINDOW,
+    DOMAIN,
+)
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations, socket_enabled):
+    yield
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+async def test_options_change_with_entities_loaded(hass):
+    port, new_port = free_port(), free_port()
+    options = {CONF_PORT: port, CONF_BIND_ADDRESS: "127.0.0.1", CONF_COALESCE_WINDOW: 0}
+    entry = MockConfigEntry(domain=DOMAIN, data={}, options=options)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(legacy_frame(power=1200.0))
+    await writer.drain()
+    await wait_for(lambda: INVERTER_SERIAL in (coordinator.data or {}))
+    await hass.async_block_till_done()
+    assert hass.states.async_entity_ids("sensor")
+    # an entity listening on the coordinator as a whole, as CoordinatorEntity does
+    updates = []
+    remove = coordinator.async_add_listener(lambda: updates.append(None))
+
+    # a new port and coalescing window are applied in place
+    hass.config_entries.async_update_entry(
+        entry, options={**options, CONF_PORT: new_port, CONF_COALESCE_WINDOW: 1.0}
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][entry.entry_id]["coordinator"] is coordinator
+    assert coordinator.addresses == [("127.0.0.1", new_port)]
+    assert coordinator.port == new_port
+    coordinator.async_update_listeners()
+    assert updates == [None]
+    remove()
+
+    # the old connection keeps delivering while its listener drains
+    writer.write(legacy_frame(power=1300.0, energy=10000.1))
+    await writer.drain()
+    await wait_for(lambda: coordinator.data[INVERTER_SERIAL]["current_power_apo_t1_W"] == 1300.0)
+    writer.close()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.NOT_LOADED
+    assert coordinator.addresses == []
+    assert not hass.services.has_service(DOMAIN, "backfill_statistics")
+
+
+async def test_option_not_applied_when_its_listener_cannot_bind(hass):
+    port = free_port()
+    options = {CONF_PORT: port, CONF_BIND_ADDRESS: "127.0.0.1"}
+    entry = MockConfigEntry(domain=DOMAIN, data={}, options=options)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    with socket.socket() as busy:
+        busy.bind(("127.0.0.1", 0))
+        busy.listen()
+        assert not await coordinator.async_apply_options({**options, CONF_PORT: busy.getsockname()[1]})
+    # nothing was half applied
+    assert coordinator.port == port
+    assert coordinator.addresses == [("127.0.0.1", port)]
+    assert await coordinator.async_apply_options(options)
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,29 @@
+"""Decoding of the polled input registers."""
+
+from __future__ import annotations
+
+import struct
+
+import pytest
+
+from custom_components.solis.layouts import SOLIS_INPUT_REGISTERS
+
+
+def registers(status: int, power: int = 1500) -> bytes:
+    data = bytearray(SOLIS_INPUT_REGISTERS.size)
+    struct.pack_into(">I", data, 0, power)
+    struct.pack_into(">HH", data, 34, 3200, 25)
+    struct.pack_into(">H", data, 78, status)
+    return bytes(data)
+
+
+@pytest.mark.parametrize(("code", "status"), [(0, 1), (3, 1), (0x1010, 0x1010)])
+def test_status_code_is_translated_to_the_pushed_status(code, status):
+    sample = SOLIS_INPUT_REGISTERS.decode(registers(code))
+    assert sample["inverter_status_code"] == code
+    assert sample["inverter_status"] == status
+
+
+def test_string_power_is_derived():
+    sample = SOLIS_INPUT_REGISTERS.decode(registers(3))
+    assert sample["dp1_power"] == 800.0
@@ -0,0 +1,127 @@
+"""Checksum rejection and duplicate suppression in the logger protocol."""
+
+from __future__ import annotations
+
+import asyncio
+
+from helpers import legacy_frame, v5_frame
+
+from custom_components.solis.duplicates import DuplicateFilter
+from custom_components.solis.frame import CONTROL_HEARTBEAT
+from custom_components.solis.listener import SolisTCPProtocol
+from custom_components.solis.stats import ListenerStats
+
+
+class Owner:
+    """The parts of the coordinator the listener uses, keeping every sample."""
+
+    def __init__(self, duplicates: DuplicateFilter | None = None):
+        self.stats = ListenerStats()
+        self.archive = None
+        self.tracer = None
+        self.relay = None
+        self.duplicates = duplicates
+        self.max_buffer = 8192
+        self.samples = []
+
+    def async_register_connection(self, protocol) -> bool:
+        return True
+
+    def async_unregister_connection(self, protocol) -> None:
+        pass
+
+    def async_handle_sample(self, sample, received_ns) -> None:
+        self.samples.append(sample)
+
+
+class Transport:
+    def __init__(self):
+        self.written = []
+        self.aborted = False
+
+    def get_extra_info(self, name):
+        return ("127.0.0.1", 50000) if name == "peername" else None
+
+    def write(self, data: bytes) -> None:
+        self.written.append(data)
+
+    def abort(self) -> None:
+        self.aborted = True
+
+    def is_closing(self) -> bool:
+        return self.aborted
+
+
+def receive(owner: Owner, *chunks: bytes) -> Transport:
+    async def scenario():
+        transport = Transport()
+        protocol = SolisTCPProtocol(owner)
+        protocol.connection_made(transport)
+        for chunk in chunks:
+            protocol.data_received(chunk)
+        return transport
+
+    return asyncio.run(scenario())
+
+
+def corrupt(frame: bytes) -> bytes:
+    damaged = bytearray(frame)
+    damaged[20] ^= 0xFF
+    return bytes(damaged)
+
+
+def test_bad_checksum_is_neither_acked_nor_decoded():
+    owner = Owner()
+    transport = receive(owner, corrupt(v5_frame(CONTROL_HEARTBEAT, 1, bytes(10))), corrupt(legacy_frame()))
+    assert owner.stats.frames == 2
+    assert owner.stats.rejected == 2
+    assert transport.written == []
+    assert owner.samples == []
+
+
+def test_good_frames_after_a_bad_one_still_count():
+    owner = Owner()
+    transport = receive(owner, corrupt(legacy_frame()), v5_frame(CONTROL_HEARTBEAT, 1), legacy_frame())
+    assert owner.stats.rejected == 1
+    assert len(transport.written) == 1
+    assert [sample["serialno"] for sample in owner.samples] == ["110F000022000000"]
+
+
+def test_retransmission_is_acked_but_not_decoded():
+    owner = Owner(DuplicateFilter())
+    heartbeat = v5_frame(CONTROL_HEARTBEAT, 1)
+    transport = receive(owner, heartbeat, heartbeat, legacy_frame(), legacy_frame(), legacy_frame(power=10.0))
+    assert len(transport.written) == 2
+    assert owner.stats.duplicates == 2
+    assert len(owner.samples) == 2
+
+
+def test_same_contents_with_a_new_sequence_is_not_a_duplicate():
+    duplicates = DuplicateFilter()
+    first, second = v5_frame(CONTROL_HEARTBEAT, 1), v5_frame(CONTROL_HEARTBEAT, 2)
+    assert not duplicates.seen(first, 0, len(first), 0.0)
+    assert not duplicates.seen(second, 0, len(second), 1.0)
+    assert duplicates.seen(first, 0, len(first), 2.0)
+
+
+def test_repeats_outside_the_window_are_decoded_again():
+    duplicates = DuplicateFilter(window=60.0)
+    frame = legacy_frame()
+    assert not duplicates.seen(frame, 0, len(frame), 0.0)
+    assert duplicates.seen(frame, 0, len(frame), 59.0)
+    # the window counts from the latest sighting
+    assert duplicates.seen(frame, 0, len(frame), 118.0)
+    assert not duplicates.seen(frame, 0, len(frame), 200.0)
+
+
+def test_least_recently_seen_frame_is_evicted():
+    duplicates = DuplicateFilter(size=2)
+    first, second, third = (legacy_frame(power=power) for power in (1.0, 2.0, 3.0))
+    duplicates.seen(first, 0, len(first), 0.0)
+    duplicates.seen(second, 0, len(second), 1.0)
+    # seeing the first again makes the second the oldest
+    assert duplicates.seen(first, 0, len(first), 2.0)
+    duplicates.seen(third, 0, len(third), 3.0)
+    assert len(duplicates) == 2
+    assert not duplicates.seen(second, 0, len(second), 4.0)
+    assert duplicates.seen(third, 0, len(third), 5.0)
@@ -0,0 +1,141 @@
+"""Relay tests against the stand-in cloud in ``benchmarks/sim_cloud.py``."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+
+import sim_cloud
+from helpers import v5_frame
+
+from custom_components.solis import relay as relay_module
+from custom_components.solis.frame import CONTROL_HEARTBEAT, CONTROL_HELLO, split_frames
+from custom_components.solis.listener import SolisTCPProtocol
+from custom_components.solis.relay import UpstreamRelay
+from custom_components.solis.stats import ListenerStats
+
+
+class Owner:
+    """The parts of the coordinator the listener uses."""
+
+    def __init__(self, relay: UpstreamRelay):
+        self.stats = ListenerStats()
+        self.archive = None
+        self.tracer = None
+        self.relay = relay
+        self.duplicates = None
+        self.max_buffer = 8192
+
+    def async_register_connection(self, protocol) -> bool:
+        return True
+
+    def async_unregister_connection(self, protocol) -> None:
+        pass
+
+    def async_handle_sample(self, sample, received_ns) -> None:
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+class Logger:
+    """A logger connected to the listener, counting the replies it gets."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.writer = writer
+        self.replies = 0
+        self._buffer = bytearray()
+        self._task = asyncio.get_running_loop().create_task(self._read(reader))
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        while data := await reader.read(4096):
+            self._buffer += data
+            frames, consumed = split_frames(self._buffer)
+            self.replies += len(frames)
+            del self._buffer[:consumed]
+
+    async def send(self, frame: bytes) -> None:
+        self.writer.write(frame)
+        await self.writer.drain()
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self._task
+
+
+async def start_listener(relay: UpstreamRelay) -> tuple[asyncio.AbstractServer, Logger]:
+    loop = asyncio.get_running_loop()
+    owner = Owner(relay)
+    server = await loop.create_server(lambda: SolisTCPProtocol(owner), "127.0.0.1", 0)
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+    return server, Logger(reader, writer)
+
+
+def test_frames_sent_while_connecting_are_acked_once():
+    async def scenario():
+        cloud, stats = await sim_cloud.start("127.0.0.1", 0)
+        relay = UpstreamRelay("127.0.0.1", cloud.sockets[0].getsockname()[1])
+        server, logger = await start_listener(relay)
+
+        # the upstream connection opens with the first frame, so the hello
+        # is acked locally and the cloud's reply to it must not follow
+        await logger.send(v5_frame(CONTROL_HELLO, 1))
+        await wait_for(lambda: stats.replies == 1)
+        await wait_for(lambda: relay.stats.suppressed == 1)
+        # once connected, the cloud answers
+        for sequence in range(2, 5):
+            await logger.send(v5_frame(CONTROL_HEARTBEAT, sequence))
+        await wait_for(lambda: logger.replies == 4)
+        await asyncio.sleep(0.1)
+
+        assert logger.replies == 4
+        assert stats.frames == 4
+        await logger.close()
+        relay.close()
+        server.close()
+        cloud.close()
+
+    asyncio.run(scenario())
+
+
+def test_frames_queued_while_cloud_is_down_are_acked_once(monkeypatch):
+    monkeypatch.setattr(relay_module, "RETRY_DELAY", 0.05)
+
+    async def scenario():
+        port = free_port()
+        relay = UpstreamRelay("127.0.0.1", port)
+        server, logger = await start_listener(relay)
+
+        for sequence in range(1, 6):
+            await logger.send(v5_frame(CONTROL_HEARTBEAT, sequence))
+        await wait_for(lambda: logger.replies == 5)
+        assert relay.stats.connect_failures >= 1
+
+        # the cloud comes up: the queued frames reach it and its replies,
+        # already given locally, are dropped
+        cloud, stats = await sim_cloud.start("127.0.0.1", port)
+        await wait_for(lambda: stats.replies == 5)
+        await wait_for(lambda: relay.stats.suppressed == 5)
+        await logger.send(v5_frame(CONTROL_HEARTBEAT, 6))
+        await wait_for(lambda: logger.replies == 6)
+        await asyncio.sleep(0.1)
+
+        assert logger.replies == 6
+        assert stats.frames == 6
+        await logger.close()
+        relay.close()
+        server.close()
+        cloud.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,82 @@
+"""Coalescing of samples per serial."""
+
+from __future__ import annotations
+
+import asyncio
+
+from custom_components.solis.record import Sample
+from custom_components.solis.scheduler import IngestScheduler
+from custom_components.solis.stats import ListenerStats
+
+
+def sample(serial: str, power: float) -> Sample:
+    return Sample.from_mapping({"serialno": serial, "current_power_apo_t1_W": power})
+
+
+def run(scenario):
+    async def main():
+        applied = []
+        stats = ListenerStats()
+        scheduler = IngestScheduler(
+            asyncio.get_running_loop(),
+            0.2,
+            lambda serial, sample, received_ns: applied.append((serial, sample["current_power_apo_t1_W"], received_ns)),
+            stats,
+        )
+        await scenario(scheduler, applied)
+        return stats
+
+    return asyncio.run(main())
+
+
+def test_last_sample_per_serial_wins():
+    async def scenario(scheduler, applied):
+        scheduler.submit("S1", sample("S1", 100.0), 1)
+        scheduler.submit("S2", sample("S2", 200.0), 2)
+        scheduler.submit("S1", sample("S1", 110.0), 3)
+        assert len(scheduler) == 2
+        assert scheduler.get("S1")["current_power_apo_t1_W"] == 110.0
+        assert scheduler.get("S3") is None
+        await asyncio.sleep(0.3)
+        assert applied == [("S1", 110.0, 3), ("S2", 200.0, 2)]
+
+    stats = run(scenario)
+    assert stats.coalesced == 1
+    assert stats.coalesce_ns.count == 2
+
+
+def test_nothing_is_applied_before_the_window_closes():
+    async def scenario(scheduler, applied):
+        scheduler.submit("S1", sample("S1", 100.0), None)
+        await asyncio.sleep(0.01)
+        assert applied == []
+        await asyncio.sleep(0.3)
+        assert applied == [("S1", 100.0, None)]
+        assert len(scheduler) == 0
+
+    run(scenario)
+
+
+def test_a_new_window_opens_after_a_flush():
+    async def scenario(scheduler, applied):
+        scheduler.submit("S1", sample("S1", 100.0), None)
+        await asyncio.sleep(0.3)
+        scheduler.submit("S1", sample("S1", 120.0), None)
+        await asyncio.sleep(0.3)
+        assert [power for _, power, _ in applied] == [100.0, 120.0]
+
+    stats = run(scenario)
+    assert stats.coalesced == 0
+
+
+def test_flush_applies_at_once_and_cancels_the_timer():
+    async def scenario(scheduler, applied):
+        scheduler.submit("S1", sample("S1", 100.0), None)
+        scheduler.flush()
+        assert applied == [("S1", 100.0, None)]
+        await asyncio.sleep(0.3)
+        assert len(applied) == 1
+        # flushing nothing is harmless
+        scheduler.flush()
+
+    run(scenario)
@@ -0,0 +1,94 @@
+"""Learned report intervals and overdue inverters."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.solis.staleness import ALPHA, StalenessTracker
+
+
+def test_unknown_serial_is_online():
+    tracker = StalenessTracker()
+    assert tracker.online("S1")
+    assert tracker.next_deadline is None
+
+
+def test_default_interval_until_one_is_learned():
+    tracker = StalenessTracker(factor=3.0, default_interval=300.0)
+    tracker.seen("S1", 0.0)
+    assert tracker.interval("S1") is None
+    assert tracker.next_deadline == 900.0
+    assert tracker.expire(899.0) == []
+    assert tracker.expire(900.0) == ["S1"]
+    assert not tracker.online("S1")
+
+
+def test_interval_is_learned_as_a_moving_average():
+    tracker = StalenessTracker(min_timeout=0.0)
+    for now in (0.0, 60.0, 120.0):
+        tracker.seen("S1", now)
+    assert tracker.interval("S1") == 60.0
+    tracker.seen("S1", 240.0)
+    assert tracker.interval("S1") == pytest.approx(60.0 + ALPHA * 60.0)
+
+
+def test_close_arrivals_are_not_an_interval():
+    tracker = StalenessTracker()
+    tracker.seen("S1", 0.0)
+    tracker.seen("S1", 0.5)
+    assert tracker.interval("S1") is None
+
+
+def test_timeout_has_a_floor():
+    tracker = StalenessTracker(factor=3.0, min_timeout=60.0)
+    for now in (0.0, 5.0, 10.0):
+        tracker.seen("S1", now)
+    assert tracker.expire(69.0) == []
+    assert tracker.expire(70.0) == ["S1"]
+
+
+def test_later_samples_push_the_deadline_back():
+    tracker = StalenessTracker(min_timeout=0.0)
+    tracker.seen("S1", 0.0)
+    tracker.seen("S1", 10.0)
+    tracker.seen("S1", 20.0)
+    # the entry scheduled at 40 is stale; it is re-queued, not expired
+    assert tracker.next_deadline == 40.0
+    assert tracker.expire(40.0) == []
+    assert tracker.next_deadline == 50.0
+    assert tracker.expire(50.0) == ["S1"]
+
+
+def test_overdue_serial_comes_back_online():
+    tracker = StalenessTracker(min_timeout=0.0)
+    tracker.seen("S1", 0.0)
+    tracker.seen("S1", 10.0)
+    assert tracker.expire(40.0) == ["S1"]
+    # reported once, not on every expire
+    assert tracker.expire(100.0) == []
+    assert tracker.seen("S1", 500.0)
+    assert tracker.online("S1")
+    # the outage is not learned as an interval
+    assert tracker.interval("S1") == 10.0
+    assert not tracker.seen("S1", 510.0)
+
+
+def test_serials_expire_independently():
+    tracker = StalenessTracker(min_timeout=0.0)
+    for now in (0.0, 10.0):
+        tracker.seen("fast", now)
+    for now in (0.0, 100.0):
+        tracker.seen("slow", now)
+    assert tracker.expire(50.0) == ["fast"]
+    assert tracker.online("slow")
+    assert tracker.expire(400.0) == ["slow"]
+
+
+def test_restore_keeps_a_stored_interval():
+    tracker = StalenessTracker(min_timeout=0.0)
+    tracker.restore("S1", 0.0, 20.0)
+    assert tracker.interval("S1") == 20.0
+    assert tracker.next_deadline == 60.0
+    # a serial already tracked is not reset
+    tracker.restore("S1", 30.0, 100.0)
+    assert tracker.interval("S1") == 20.0